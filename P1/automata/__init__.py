@@ -0,0 +1,3 @@
+"""Finite automata: regex parsing, determinization, minimization and evaluation."""
+
+__version__ = "1.0.0"
@@ -0,0 +1,197 @@
+"""Incremental construction of minimal acyclic automata from word lists."""
+from automata.automaton import FiniteAutomaton, State, Transitions
+
+
+class _Node():
+    """
+    State of the automaton being built.
+
+    Args:
+        final: Whether a word ends in the state. Type: bool
+
+    """
+
+    __slots__ = ("final", "edges")
+
+    def __init__(self, final=False):
+        self.final = final
+        self.edges = {}
+
+    def key(self):
+        """Signature of the state: equal signatures mean equivalent states."""
+        # Los hijos ya estan registrados, asi que se comparan por identidad
+        return (self.final, tuple(sorted(self.edges.items(), key=lambda edge: edge[0])))
+
+
+class AcyclicDFABuilder():
+    """
+    Incremental builder of the minimal DFA of a finite set of words.
+
+    Words must be added in increasing order (Daciuk et al.). Only the path
+    of the last word is not minimized yet: when a new word arrives, the
+    states of the previous word beyond their common prefix can no longer
+    change, so each of them is merged with an equivalent registered state
+    or registered itself. Memory stays proportional to the minimal
+    automaton and no intermediate NFA is built.
+
+    Attributes:
+        n_words: Number of distinct words added. Type: int
+
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        # Camino de la ultima palabra: path[i] es el estado tras i simbolos
+        self._path = [self._root]
+        self._previous = None
+        self._register = {}
+        self._symbols = set()
+        self.n_words = 0
+
+    def _minimize(self, depth):
+        """Merge or register the states of the last word below a depth."""
+        path = self._path
+        register = self._register
+        for i in range(len(path) - 1, depth, -1):
+            node = path[i]
+            key = node.key()
+            registered = register.get(key)
+            if registered is None:
+                register[key] = node
+            else:
+                path[i - 1].edges[self._previous[i - 1]] = registered
+        del path[depth + 1:]
+
+    def add(self, word):
+        """
+        Add a word.
+
+        Args:
+            word: Word to add. It must not be smaller than the previous
+                word. Type: str
+
+        Raises:
+            ValueError: If the words are not sorted.
+
+        """
+        previous = self._previous
+        if previous is not None:
+            if word == previous:
+                return
+            if word < previous:
+                raise ValueError(f"Words must be added in sorted order: {word!r} after {previous!r}")
+
+        # Prefijo comun con la palabra anterior
+        prefix = 0
+        if previous is not None:
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                prefix += 1
+            self._minimize(prefix)
+
+        node = self._path[prefix]
+        for symbol in word[prefix:]:
+            child = _Node()
+            node.edges[symbol] = child
+            self._path.append(child)
+            node = child
+        node.final = True
+
+        self._symbols.update(word[prefix:])
+        self._previous = word
+        self.n_words += 1
+
+    def add_all(self, words):
+        """Add the words of a sorted iterable (e.g. a generator)."""
+        for word in words:
+            self.add(word)
+
+    def finish(self, complete=False):
+        """
+        Return the minimal DFA of the words added.
+
+        States are named ``q0``, ``q1``... in breadth-first order, ``q0``
+        being the initial state.
+
+        Args:
+            complete: Whether to add the ``empty`` sink (and the transitions
+                to it) to get a complete DFA, as ``to_deterministic`` does.
+                Otherwise missing transitions reject. Type: bool
+
+        Returns:
+            The minimal automaton. Type: FiniteAutomaton
+
+        """
+        if self._previous is not None:
+            self._minimize(0)
+
+        symbols = sorted(self._symbols)
+        names = {self._root: State("q0", self._root.final)}
+        order = [self._root]
+        transitions = Transitions()
+
+        # La lista de estados hace de cola (BFS)
+        i = 0
+        while i < len(order):
+            node = order[i]
+            state_transitions = {}
+            for symbol, child in sorted(node.edges.items(), key=lambda edge: edge[0]):
+                if child not in names:
+                    names[child] = State(f"q{len(order)}", child.final)
+                    order.append(child)
+                state_transitions[symbol] = {names[child]}
+            if state_transitions:
+                transitions[names[node]] = state_transitions
+            i += 1
+
+        states = [names[node] for node in order]
+        if complete:
+            empty_state = State("empty", False)
+            for state in states:
+                state_transitions = transitions.setdefault(state, {})
+                for symbol in symbols:
+                    state_transitions.setdefault(symbol, {empty_state})
+            transitions[empty_state] = {symbol: {empty_state} for symbol in symbols}
+            states.append(empty_state)
+
+        return FiniteAutomaton(states[0], states, symbols, transitions)
+
+
+def from_sorted_words(words, complete=False):
+    """
+    Build the minimal DFA of a sorted iterable of words.
+
+    Args:
+        words: Words in increasing order. Type: Iterable[str]
+        complete: Whether to add the ``empty`` sink. Type: bool
+
+    Returns:
+        The minimal automaton. Type: FiniteAutomaton
+
+    """
+    builder = AcyclicDFABuilder()
+    builder.add_all(words)
+    return builder.finish(complete)
+
+
+def from_word_file(path, encoding="utf-8", complete=False):
+    """
+    Build the minimal DFA of a sorted word list, one word per line.
+
+    The file is streamed, so only the automaton is kept in memory. Blank
+    lines are skipped, so the empty word cannot be read from a file.
+
+    Args:
+        path: Path of the file. Type: str
+        encoding: Encoding of the file. Type: str
+        complete: Whether to add the ``empty`` sink. Type: bool
+
+    Returns:
+        The minimal automaton. Type: FiniteAutomaton
+
+    """
+    with open(path, encoding=encoding) as f:
+        # Las lineas en blanco (p. ej. al final del fichero) se ignoran
+        words = (line.rstrip("\r\n") for line in f)
+        return from_sorted_words((word for word in words if word), complete)
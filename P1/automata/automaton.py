@@ -1,4 +1,5 @@
 """Automaton implementation."""
+from collections import Counter
 
 class State():
     """
@@ -27,6 +28,99 @@ class State():
         return hash(self.name)
 
 
+class DerivedState(State):
+    """
+    State of an automaton derived from another one (e.g. a DFA state).
+
+    It carries its integer id in the derived automaton and the set of
+    original states it comes from. Its name is only built (by ``namer``)
+    the first time it is read, e.g. by ``write_dot``, so deriving an
+    automaton does no string work. Derived states are compared and hashed
+    by provenance, and are never equal to a plain ``State``.
+
+    Args:
+        id: Index of the state in the derived automaton. Type: int
+        provenance: Original states it represents. Type: Iterable[State]
+        is_final: Whether the state is a final state or not.
+        namer: Function returning the name of the state (e.g. a
+            ``StateNames``). Defaults to ``q<id>``. Type: Callable
+
+    """
+
+    def __init__(self, id, provenance, is_final=False, namer=None):
+        self.id = id
+        self.provenance = frozenset(provenance)
+        self._namer = namer
+        super().__init__(None, is_final)
+
+    @property
+    def name(self):
+        if self._name is None:
+            self._name = self._namer(self) if self._namer else f"q{self.id}"
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+
+    def __eq__(self, other):
+        if isinstance(other, DerivedState):
+            return self.provenance == other.provenance and self.is_final == other.is_final
+        # Un estado derivado nunca es igual a un estado normal (su hash es otro)
+        if isinstance(other, State):
+            return False
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.provenance)
+
+
+class StateNames():
+    """
+    Names of the states of a derived automaton, built all at once.
+
+    The first time a name is needed, every state registered gets the name
+    that ``name_of`` gives to its provenance. States whose name would be
+    empty or repeated are named ``q<id>`` instead, so the names are always
+    unique.
+
+    Args:
+        name_of: Function building a name from a provenance. Type: Callable
+
+    """
+
+    def __init__(self, name_of):
+        self.name_of = name_of
+        self.states = []
+        self._names = None
+
+    def add(self, state):
+        """Register a state and return it."""
+        self.states.append(state)
+        self._names = None
+        return state
+
+    def _compute_names(self):
+        names = [self.name_of(state.provenance) for state in self.states]
+        counts = Counter(names)
+        taken = {name for name in names if name and counts[name] == 1}
+
+        result = {}
+        for state, name in zip(self.states, names):
+            if not name or counts[name] > 1:
+                name = f"q{state.id}"
+                while name in taken:
+                    name += "'"
+                taken.add(name)
+            result[state.id] = name
+        return result
+
+    def __call__(self, state):
+        if self._names is None:
+            self._names = self._compute_names()
+        return self._names[state.id]
+
+
 class Transitions(dict):
     """
     Definition of all transitions in an automaton.
@@ -272,9 +366,29 @@ class FiniteAutomaton():
     def get_all_transitions(self):
         return self.transitions.get_all_transitions()
         
-    def to_deterministic(self):
+    def to_deterministic(self, complete=True):
+        from automata.dfa import DeterministicFiniteAutomaton
+        return DeterministicFiniteAutomaton.to_deterministic(self, complete)
+
+    def minimize(self, method="auto"):
         from automata.dfa import DeterministicFiniteAutomaton
-        return DeterministicFiniteAutomaton.to_deterministic(self)
+        return DeterministicFiniteAutomaton.minimize(self, method)
+
+    def intersect(self, other):
+        from automata.product import intersect
+        return intersect(self, other)
+
+    def difference(self, other):
+        from automata.product import difference
+        return difference(self, other)
+
+    def symmetric_difference(self, other):
+        from automata.product import symmetric_difference
+        return symmetric_difference(self, other)
+
+    def complement(self, symbols=None):
+        from automata.product import complement
+        return complement(self, symbols)
     
     def get_initial_state(self):
         return self.initial_state 
@@ -1,6 +1,22 @@
 """Evaluation of automata."""
 from automata.automaton import FiniteAutomaton, State, Transitions
+from automata.bitset import BitsetAutomaton
+from automata.compiled import CompiledAutomaton
+from automata.dfa import subset_construction
+from automata.lazy_dfa import LazyDFA
+from automata.metrics import DEFAULT_HOOKS, get_hooks
+from automata.parallel import accepts_chunked, accepts_parallel
+from automata.search import Searcher
 from collections import defaultdict, deque
+from itertools import chain
+import mmap
+import os
+from time import perf_counter
+
+# Simbolo de cada byte (Latin-1), para dar los bytes de un fichero al motor sin decodificarlos
+_BYTE_SYMBOLS = [chr(byte) for byte in range(256)]
+# Bytes comprobados de una vez contra el alfabeto
+_CHECK_WINDOW = 1 << 20
 
 class FiniteAutomatonEvaluator():
     """
@@ -8,6 +24,18 @@ class FiniteAutomatonEvaluator():
 
     Args:
         automaton: Automaton to evaluate.
+        mode: How the automaton is simulated. ``"nfa"`` steps sets of
+            states through the compiled transition table; ``"lazy"``
+            determinizes the automaton on the fly as the input reaches new
+            states (see ``LazyDFA``); ``"bitset"`` keeps the set of states
+            as an integer bitmask (see ``BitsetAutomaton``).
+        max_dfa_states: Maximum number of cached states in ``"lazy"`` mode,
+            and of states of the DFAs that other modes build for whole
+            inputs (``accepts_file``, ``accepts_chunked``).
+        hooks: Instrumentation hooks (see ``automata.metrics``). Defaults to
+            the hooks set with ``set_hooks`` when the evaluator is created;
+            with ``None`` this evaluator is not instrumented at all, even if
+            global hooks are set.
 
     Attributes:
         current_states: Set of current states of the automaton.
@@ -17,17 +45,39 @@ class FiniteAutomatonEvaluator():
     # automaton: FiniteAutomaton
     # current_states: Set[State]
 
-    def __init__(self, automaton):
+    def __init__(self, automaton, mode="nfa", max_dfa_states=10000, hooks=DEFAULT_HOOKS):
         self.automaton = automaton
-        
-        current_states = {self.automaton.initial_state}
-        #---------------------------------------------------------------------
-        # TO DO: 
-        # add usefull code if necessary
-        #---------------------------------------------------------------------
-        
-        self.current_states = self._complete_lambdas(current_states)
-        
+        self.mode = mode
+        self.max_dfa_states = max_dfa_states
+        self.hooks = get_hooks() if hooks is DEFAULT_HOOKS else hooks
+        self.compiled = CompiledAutomaton(automaton)
+
+        if mode == "nfa":
+            self._engine = self.compiled
+        elif mode == "lazy":
+            self._engine = LazyDFA(self.compiled, max_states=max_dfa_states)
+        elif mode == "bitset":
+            self._engine = BitsetAutomaton(self.compiled)
+        else:
+            raise ValueError(f"Unknown evaluation mode {mode!r}")
+
+        # Los estados actuales se guardan en la representacion del motor
+        self._current = self._engine.initial
+
+        # AFDs (subconjuntos y tabla) y matrices NumPy, por estado de partida
+        self._dfas = {}
+        self._batch_tables = {}
+        # Buscador de coincidencias, construido la primera vez que se usa
+        self._searcher = None
+
+    @property
+    def current_states(self):
+        """Set of current states of the automaton."""
+        return self._engine.decode(self._current)
+
+    @current_states.setter
+    def current_states(self, states):
+        self._current = self._engine.encode(states)
 
     def process_symbol(self, symbol):
         """
@@ -35,18 +85,11 @@ class FiniteAutomatonEvaluator():
         Args:
             symbol: Symbol to consume. Type: str
         """
+        if self.hooks is not None:
+            self._current = self._run_instrumented("process_symbol", self._current, (symbol,))
+            return
+        self._current = self._engine.step(self._current, symbol)
 
-        if symbol not in self.automaton.symbols:
-            raise ValueError("The symbol is not in the alphabet of the automaton")
-        
-        transitions = set()
-
-        for i in self.current_states:
-            transitions.update(self.automaton.get_transition(i, symbol))
-        
-        self.current_states = self._complete_lambdas(transitions)
-
-        
     def _complete_lambdas(self, set_to_complete, visited=None):
         """
         Add states reachable with lambda transitions to the set.
@@ -55,20 +98,10 @@ class FiniteAutomatonEvaluator():
             set_to_complete: Current set of states to be completed.
             visited: Set of states that have already been checked for lambda transitions.
         """
+        compiled = self.compiled
 
-        final_set = set()
-        final_set.update(set_to_complete)
+        return compiled.decode(compiled.closure(compiled.encode(set_to_complete)))
 
-        for state in set_to_complete:
-            new_states = self.automaton.get_transition(state, None)
-            if new_states is None:
-                final_set.add(state)
-            else:
-                final_set.update(self._complete_lambdas(set(new_states)))
-        
-        return final_set
-
-        
     def process_string(self, string):
         """
         Process a full string of symbols.
@@ -77,34 +110,496 @@ class FiniteAutomatonEvaluator():
             string: String to process.
 
         """
-        for symbol in string:
-            self.process_symbol(symbol)
+        if self.hooks is not None:
+            self._current = self._run_instrumented("process_string", self._current, string)
+            return
+        self._current = self._engine.run(self._current, string)
 
 
     def is_accepting(self):
         """Check if the current state is an accepting one."""
-        
-        for state in self.current_states: 
-            if state.is_final: 
-                return True 
-        
-        return False 
+        return self._engine.is_accepting(self._current)
     
         
     def accepts(self, string):
         """
         Return if a string is accepted without changing state.
 
-        Note: This function is NOT thread-safe.
+        The evaluation keeps its states in local variables and only reads
+        the compiled automaton, so this function is thread-safe (as long as
+        no other thread changes the current states at the same time).
+
+        It stops as soon as every current state is dead (the string is
+        rejected) or some is universal (accepted); the rest of the string
+        is then only checked against the alphabet.
 
         """
-        old_transitions = self.current_states
-        
+        engine = self._engine
+        if self.hooks is not None:
+            return engine.is_accepting(self._run_instrumented("accepts", self._current, string))
+
+        return engine.is_accepting(engine.run(self._current, string, stop_when_decided=True))
+
+    def _run_instrumented(self, operation, current, string):
+        """
+        Consume a string symbol by symbol, reporting metrics to the hooks.
+
+        It reports the symbols processed, the size of the set of active
+        states after every symbol, the hits and misses of the lambda closure
+        cache and the latency of the call (which includes the cost of the
+        hooks themselves).
+
+        Args:
+            operation: Name of the public method being measured. Type: str
+            current: States to start from, in the engine representation.
+            string: String to consume. Type: str
+
+        Returns:
+            States after consuming the string, in the engine representation.
+
+        """
+        hooks = self.hooks
+        engine = self._engine
+        compiled = self.compiled
+        hits = compiled.closure_hits
+        misses = compiled.closure_misses
+
+        n_symbols = 0
+        start = perf_counter()
         try:
-            self.process_string(string)
-            accepted = self.is_accepting()
+            for symbol in string:
+                current = engine.step(current, symbol)
+                hooks.observe("evaluator.active_states", engine.size(current))
+                n_symbols += 1
         finally:
-            self.current_states = old_transitions
-        
+            seconds = perf_counter() - start
+            hits = compiled.closure_hits - hits
+            misses = compiled.closure_misses - misses
+            hooks.count("evaluator.symbols", n_symbols)
+            hooks.count("evaluator.closure_cache.hits", hits)
+            hooks.count("evaluator.closure_cache.misses", misses)
+            hooks.observe(f"evaluator.{operation}.seconds", seconds)
+            hooks.trace(
+                f"evaluator.{operation}", mode=self.mode, symbols=n_symbols,
+                seconds=seconds, closure_hits=hits, closure_misses=misses,
+            )
+
+        return current
+
+    def _prefix_ends(self, string):
+        """
+        Yield the lengths of the prefixes of a string that are accepted.
+
+        The string is consumed from the current states, without changing
+        them, and only until no final state is reachable or a symbol is not
+        in the alphabet (such a symbol cannot be part of an accepted
+        prefix, so no ``ValueError`` is raised).
+        """
+        engine = self._engine
+        symbol_ids = self.compiled.symbol_ids
+        current = self._current
+
+        if engine.is_accepting(current):
+            yield 0
+        for length, symbol in enumerate(string, 1):
+            if symbol not in symbol_ids or engine.is_dead(current):
+                return
+            current = engine.step(current, symbol)
+            if engine.is_accepting(current):
+                yield length
+
+    def matching_prefix_lengths(self, string):
+        """
+        Return the lengths of all the accepted prefixes of a string.
+
+        It is computed in a single pass, instead of calling ``accepts`` on
+        every prefix.
+
+        Args:
+            string: String to check. Type: str
+
+        Returns:
+            Increasing lengths ``i`` such that ``string[:i]`` is accepted.
+            Type: List[int]
+
+        """
+        return list(self._prefix_ends(string))
+
+    def longest_match_prefix(self, string):
+        """
+        Return the length of the longest accepted prefix of a string.
+
+        Args:
+            string: String to check. Type: str
+
+        Returns:
+            Largest ``i`` such that ``string[:i]`` is accepted, or -1 if no
+            prefix (not even the empty one) is accepted. Type: int
+
+        """
+        longest = -1
+        for longest in self._prefix_ends(string):
+            pass
+        return longest
+
+    def accepts_parallel(self, strings, workers=None, executor="thread", batch_size=1024):
+        """
+        Return which strings are accepted, evaluating them in a pool.
+
+        Args:
+            strings: Strings to check. Type: Iterable[str]
+            workers: Number of workers. Defaults to the number of CPUs. Type: int
+            executor: ``"thread"`` or ``"process"``. Type: str
+            batch_size: Number of strings per task. Type: int
+
+        Returns:
+            Whether each string is accepted, in input order. Type: List[bool]
+
+        """
+        return accepts_parallel(
+            self, strings, workers=workers, executor=executor, batch_size=batch_size,
+        )
+
+    def accepts_chunked(self, string, workers=None, chunk_size=None):
+        """
+        Return if one huge string is accepted, processing chunks in parallel.
+
+        Args:
+            string: String to check. Type: str
+            workers: Number of worker processes. Type: int
+            chunk_size: Symbols per chunk. Type: int
+
+        """
+        return accepts_chunked(self, string, workers=workers, chunk_size=chunk_size)
+
+    def reset(self):
+        """Go back to the initial states of the automaton."""
+        self._current = self._engine.initial
+
+    def feed(self, chunk):
+        """
+        Process the next chunk of a stream of symbols.
+
+        Only the current states are kept between chunks, so a stream can be
+        validated piece by piece (lines of a file, blocks of a socket...).
+
+        Args:
+            chunk: Next symbols of the stream. Type: str
+
+        """
+        if self.hooks is not None:
+            self._current = self._run_instrumented("feed", self._current, chunk)
+            return
+        self._current = self._engine.run(self._current, chunk)
+
+    def finish(self):
+        """
+        End the current stream.
+
+        Returns:
+            Whether the whole stream is accepted. The evaluator goes back to
+            the initial states, ready for the next stream. Type: bool
+
+        """
+        accepted = self.is_accepting()
+        self.reset()
         return accepted
 
+    def snapshot(self):
+        """
+        Return an opaque, immutable copy of the current states.
+
+        It can be passed to ``restore`` to resume the stream from this point.
+        """
+        return self._current
+
+    def restore(self, snapshot):
+        """
+        Resume from a value returned by ``snapshot``.
+
+        Args:
+            snapshot: Value returned by ``snapshot`` on this evaluator.
+
+        """
+        self._current = snapshot
+
+    def accepts_stream(self, chunks):
+        """
+        Return if a stream of chunks is accepted without changing state.
+
+        The chunks are consumed lazily, so the whole stream is never held
+        in memory.
+
+        Args:
+            chunks: Chunks of symbols, e.g. an open file or a generator.
+                Type: Iterable[str]
+
+        """
+        engine = self._engine
+        if self.hooks is not None:
+            return engine.is_accepting(
+                self._run_instrumented("accepts_stream", self._current, chain.from_iterable(chunks))
+            )
+
+        return engine.is_accepting(
+            engine.run(self._current, chain.from_iterable(chunks), stop_when_decided=True)
+        )
+
+    @property
+    def searcher(self):
+        """Searcher of matches of the automaton inside texts."""
+        if self._searcher is None:
+            self._searcher = Searcher(self.automaton)
+        return self._searcher
+
+    def search(self, text):
+        """
+        Find the leftmost-longest match of the automaton inside a text.
+
+        The text is only read until the match is decided, not to its end.
+
+        Args:
+            text: Text to search. Type: str
+
+        Returns:
+            ``(start, end)`` of the first match, or ``None``. Type: tuple
+
+        """
+        return next(self.searcher.finditer(text), None)
+
+    def finditer(self, text):
+        """
+        Iterate over the non-overlapping leftmost-longest matches in a text.
+
+        Args:
+            text: Text to search. Type: str
+
+        Yields:
+            ``(start, end)`` of every match. Type: tuple
+
+        """
+        return self.searcher.finditer(text)
+
+    def count_matches(self, text):
+        """Return the number of non-overlapping matches inside a text."""
+        return sum(1 for _ in self.searcher.finditer(text))
+
+    def _dfa(self, max_states=None):
+        """
+        DFA derived from the current states with ``subset_construction``.
+
+        Args:
+            max_states: Give up if the DFA has more states. Type: int
+
+        Returns:
+            Tuple ``(subsets, table)``; DFA state 0 is the current set of
+            states. ``None`` if ``max_states`` is exceeded. Type: tuple
+
+        """
+        current = self.compiled.encode(self.current_states)
+        dfa = self._dfas.get(current)
+        if dfa is None:
+            dfa = subset_construction(self.compiled, current, max_states=max_states)
+            if dfa is None:
+                return None
+            self._dfas[current] = dfa
+        elif max_states is not None and len(dfa[0]) > max_states:
+            return None
+        return dfa
+
+    def _byte_translation(self):
+        """256-entry table with the symbol id of every byte (-1 if none)."""
+        translation = [-1] * 256
+        for symbol, symbol_id in self.compiled.symbol_ids.items():
+            if isinstance(symbol, str) and len(symbol) == 1 and ord(symbol) < 256:
+                translation[ord(symbol)] = symbol_id
+        return translation
+
+    def _check_bytes(self, data, start, translation):
+        """
+        Check that the bytes from a position on are in the alphabet.
+
+        They are copied and checked a bounded window at a time.
+
+        Raises:
+            ValueError: If some byte is not in the alphabet.
+
+        """
+        valid = bytes(byte for byte in range(256) if translation[byte] >= 0)
+        for start in range(start, len(data), _CHECK_WINDOW):
+            with data[start:start + _CHECK_WINDOW] as window:
+                invalid = window.tobytes().translate(None, valid)
+            if invalid:
+                raise ValueError("The symbol is not in the alphabet of the automaton")
+
+    def _accepts_bytes(self, data):
+        """Return if a sequence of bytes is accepted, without changing state."""
+        dfa = None if self.mode == "lazy" else self._dfa(self.max_dfa_states)
+        if dfa is None:
+            # El motor del evaluador (AFD perezoso o AFN) consume los bytes como simbolos
+            engine = self._engine
+            symbols = map(_BYTE_SYMBOLS.__getitem__, data)
+            return engine.is_accepting(engine.run(self._current, symbols, stop_when_decided=True))
+
+        compiled = self.compiled
+        subsets, table = dfa
+        translation = self._byte_translation()
+        n_classes = compiled.n_classes
+        decided = bytearray(compiled.is_decided(subset) for subset in subsets)
+
+        state = 0
+        length = 0
+        if not decided[state]:
+            for length, byte in enumerate(data, 1):
+                symbol_id = translation[byte]
+                if symbol_id < 0:
+                    raise ValueError("The symbol is not in the alphabet of the automaton")
+                state = table[state * n_classes + symbol_id]
+                if decided[state]:
+                    break
+        # Decidida la aceptacion, el resto solo se comprueba contra el alfabeto
+        self._check_bytes(data, length, translation)
+
+        return compiled.is_accepting(subsets[state])
+
+    def accepts_file(self, path):
+        """
+        Return if the contents of a file are accepted, without changing state.
+
+        The file is memory-mapped and read byte by byte, without decoding or
+        copying it: every byte is the symbol with the same code point
+        (Latin-1). The DFA of the current states runs over the bytes through
+        a 256-entry translation table; in ``"lazy"`` mode, or if that DFA has
+        more than ``max_dfa_states`` states, the bytes go through the
+        evaluation engine instead, as in ``accepts``. Either way, once the
+        acceptance is decided (see ``CompiledAutomaton.is_decided``) the rest
+        of the file is only checked against the alphabet.
+
+        Args:
+            path: Path of the file. Type: str
+
+        """
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return self.is_accepting()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as data:
+                return self._accepts_bytes(data)
+
+    def finditer_file(self, path):
+        """
+        Iterate over the leftmost-longest matches inside a file.
+
+        The file is memory-mapped and searched byte by byte, as in
+        ``accepts_file``, and only read forwards as far as the matches
+        require (see ``Searcher.finditer``): the extra memory does not grow
+        with the size of the file. Bytes outside the alphabet cannot be part
+        of a match.
+
+        Args:
+            path: Path of the file. Type: str
+
+        Yields:
+            ``(start, end)`` byte offsets of every match. Type: tuple
+
+        """
+        other = self.compiled.n_classes
+        translation = {
+            byte: other if symbol_id < 0 else symbol_id
+            for byte, symbol_id in enumerate(self._byte_translation())
+        }
+
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                yield from self.searcher.finditer(b"", symbol_ids=translation)
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as data:
+                yield from self.searcher.finditer(data, symbol_ids=translation)
+
+    def search_file(self, path):
+        """
+        Find the leftmost-longest match inside a file.
+
+        The file is only read until the match is decided.
+
+        Args:
+            path: Path of the file. Type: str
+
+        Returns:
+            ``(start, end)`` byte offsets of the first match, or ``None``.
+            Type: tuple
+
+        """
+        return next(self.finditer_file(path), None)
+
+    def _batch_table(self, np):
+        """
+        Transition matrix and final mask of the DFA derived from the current states.
+
+        The matrix has one row per DFA state and one column per symbol, plus
+        a last padding column that leaves every state unchanged.
+        """
+        current = self.compiled.encode(self.current_states)
+        batch_table = self._batch_tables.get(current)
+        if batch_table is not None:
+            return batch_table
+
+        compiled = self.compiled
+        subsets, table = self._dfa()
+        n_classes = compiled.n_classes
+
+        matrix = np.empty((len(subsets), n_classes + 1), dtype=np.intp)
+        matrix[:, :n_classes] = np.asarray(table, dtype=np.intp).reshape(len(subsets), n_classes)
+        matrix[:, n_classes] = np.arange(len(subsets))
+        finals = np.array([compiled.is_accepting(subset) for subset in subsets], dtype=bool)
+
+        # Tabla de traduccion: punto de codigo -> id de simbolo (-1 si no pertenece)
+        char_symbols = [symbol for symbol in compiled.symbols if isinstance(symbol, str) and len(symbol) == 1]
+        lookup = np.full(max(map(ord, char_symbols), default=-1) + 1, -1, dtype=np.intp)
+        for symbol in char_symbols:
+            lookup[ord(symbol)] = compiled.symbol_ids[symbol]
+
+        batch_table = self._batch_tables[current] = (matrix, finals, lookup)
+        return batch_table
+
+    def accepts_many(self, strings):
+        """
+        Return which strings of a batch are accepted, without changing state.
+
+        The batch is encoded as a padded matrix of symbol ids and a vector
+        with the DFA state of every string is stepped through a NumPy
+        transition matrix, one column of the batch at a time.
+
+        Args:
+            strings: Strings to check. Type: Iterable[str]
+
+        Returns:
+            Whether each string is accepted. Type: numpy.ndarray (bool)
+
+        """
+        import numpy as np
+
+        matrix, finals, lookup = self._batch_table(np)
+        strings = list(strings)
+        if not strings:
+            return np.zeros(0, dtype=bool)
+
+        lengths = np.fromiter(map(len, strings), dtype=np.intp, count=len(strings))
+        codes = np.frombuffer("".join(strings).encode("utf-32-le"), dtype="<u4")
+
+        valid = codes < len(lookup)
+        symbol_ids = np.full(len(codes), -1, dtype=np.intp)
+        symbol_ids[valid] = lookup[codes[valid]]
+        if (symbol_ids < 0).any():
+            raise ValueError("The symbol is not in the alphabet of the automaton")
+
+        # Matriz de ids rellenada con la columna de relleno (identidad)
+        padding = matrix.shape[1] - 1
+        max_length = int(lengths.max())
+        batch = np.full((len(strings), max_length), padding, dtype=np.intp)
+        batch[np.arange(max_length) < lengths[:, None]] = symbol_ids
+
+        states = np.zeros(len(strings), dtype=np.intp)
+        for column in batch.T:
+            states = matrix[states, column]
+
+        return finals[states]
@@ -0,0 +1,171 @@
+"""Bit-parallel simulation of automata using integer bitsets."""
+
+
+class BitsetAutomaton():
+    """
+    Compiled automaton whose sets of states are Python integers.
+
+    State ``i`` of the compiled automaton is bit ``i`` of the mask. For every
+    symbol the lambda-completed successors of each group of 8 states are
+    precomputed in a 256-entry table indexed by the byte of the mask for that
+    group, so consuming a symbol is one lookup and OR per non-empty byte.
+
+    Args:
+        compiled: Compiled automaton to simulate. Type: CompiledAutomaton
+
+    Attributes:
+        initial: Mask of the lambda closure of the initial state. Type: int
+        finals: Mask of the final states. Type: int
+        closures: Mask of the lambda closure of each state. Type: list
+        byte_tables: Successor masks, indexed by symbol id, byte position and
+            byte value. Type: list
+        dead: Mask of the states that cannot reach a final state. Type: int
+        universal: Mask of the states from which every string is accepted.
+            Type: int
+        sinks: Mask of the states that every symbol leads back to themselves.
+            Type: int
+
+    """
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.n_bytes = (compiled.n_states + 7) // 8
+
+        self.initial = self._to_mask(compiled.initial)
+        self.finals = self._to_mask(compiled.finals)
+        self.closures = [self._to_mask(closure) for closure in compiled.closures]
+        self.dead = self._to_mask(compiled.dead)
+        self.universal = self._to_mask(compiled.universal)
+        self.sinks = self._to_mask(compiled.sinks)
+        self.byte_tables = [
+            self._compute_byte_tables(symbol_id)
+            for symbol_id in range(compiled.n_classes)
+        ]
+
+    @staticmethod
+    def _to_mask(ids):
+        mask = 0
+        for i in ids:
+            mask |= 1 << i
+        return mask
+
+    def _compute_byte_tables(self, symbol_id):
+        """Successor masks of every byte of states for one symbol."""
+        compiled = self.compiled
+        n_classes = compiled.n_classes
+        successors = [
+            self._to_mask(compiled.table[i * n_classes + symbol_id])
+            for i in range(compiled.n_states)
+        ] + [0] * (8 * self.n_bytes - compiled.n_states)
+
+        byte_tables = []
+        for k in range(self.n_bytes):
+            # table[b] = table[b sin su bit mas bajo] | sucesores de ese bit
+            table = [0] * 256
+            for b in range(1, 256):
+                low_bit = (b & -b).bit_length() - 1
+                table[b] = table[b & (b - 1)] | successors[8 * k + low_bit]
+            byte_tables.append(table)
+
+        return byte_tables
+
+    def encode(self, states):
+        """Convert a collection of states into a mask."""
+        return self._to_mask(self.compiled.encode(states))
+
+    def decode(self, mask):
+        """Convert a mask into a set of states."""
+        states = self.compiled.states
+        decoded = set()
+        while mask:
+            low = mask & -mask
+            decoded.add(states[low.bit_length() - 1])
+            mask ^= low
+        return decoded
+
+    def is_accepting(self, mask):
+        """Check if a mask contains a final state."""
+        return bool(mask & self.finals)
+
+    def is_dead(self, mask):
+        """Check if no final state is reachable from a mask."""
+        return not mask & ~self.dead
+
+    def size(self, mask):
+        """Number of states in a mask."""
+        return mask.bit_count()
+
+    def closure(self, mask):
+        """Return the lambda closure of a mask."""
+        closures = self.closures
+        closure = 0
+        while mask:
+            low = mask & -mask
+            closure |= closures[low.bit_length() - 1]
+            mask ^= low
+        return closure
+
+    def step(self, mask, symbol):
+        """
+        Consume one symbol from a mask of states.
+
+        Args:
+            mask: Mask of the current states. Type: int
+            symbol: Symbol to consume. Type: str
+
+        Returns:
+            Mask of the states after consuming the symbol. Type: int
+
+        """
+        return self.run(mask, (symbol,))
+
+    def _exits(self, mask, stop_when_decided):
+        """Check if a mask allows to stop consuming symbols."""
+        if stop_when_decided:
+            return not mask & ~self.dead or bool(mask & self.universal)
+        return not mask or (mask & (mask - 1) == 0 and bool(mask & self.sinks))
+
+    def run(self, mask, string, stop_when_decided=False):
+        """
+        Consume a full string from a mask of states.
+
+        As in ``CompiledAutomaton.run``, the rest of the string is only
+        checked against the alphabet once the result cannot change (or its
+        acceptance cannot change, with ``stop_when_decided``).
+
+        Args:
+            mask: Mask of the current states. Type: int
+            string: String to consume. Type: str
+            stop_when_decided: Whether the caller only needs to know if the
+                string is accepted. Type: bool
+
+        Returns:
+            Mask of the states after consuming the string. Type: int
+
+        """
+        symbol_ids = self.compiled.symbol_ids
+        byte_tables = self.byte_tables
+        n_bytes = self.n_bytes
+        exits = self._exits
+        symbols = iter(string)
+
+        if exits(mask, stop_when_decided):
+            self.compiled.check_symbols(symbols)
+            return mask
+
+        for symbol in symbols:
+            try:
+                tables = byte_tables[symbol_ids[symbol]]
+            except KeyError:
+                raise ValueError("The symbol is not in the alphabet of the automaton") from None
+
+            next_mask = 0
+            for table, b in zip(tables, mask.to_bytes(n_bytes, "little")):
+                if b:
+                    next_mask |= table[b]
+            mask = next_mask
+            if exits(mask, stop_when_decided):
+                self.compiled.check_symbols(symbols)
+                break
+
+        return mask
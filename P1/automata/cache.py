@@ -0,0 +1,237 @@
+"""Two-tier (memory and disk) cache of automata compiled from regexes."""
+from array import array
+from collections import OrderedDict
+from hashlib import sha256
+import os
+import threading
+
+import automata
+from automata.automaton import FiniteAutomaton, State, Transitions
+from automata.compiled import CompiledAutomaton
+from automata.metrics import get_hooks
+from automata.re_parser import REParser
+from automata.utils import default_cache_dir, load_marshalled, store_marshalled
+
+
+def to_compact(dfa):
+    """
+    Encode a deterministic automaton in a compact, marshallable form.
+
+    Symbols are grouped in classes (as in ``CompiledAutomaton``) and the
+    transitions are stored as the bytes of a flat table with one successor
+    id (or -1 for a missing transition) per (state, class) pair.
+
+    Args:
+        dfa: Deterministic automaton, complete or partial. Type: FiniteAutomaton
+
+    Returns:
+        Tuple ``(symbols, classes, n_states, initial, finals, table)``.
+        Type: tuple
+
+    Raises:
+        ValueError: If the automaton is not deterministic.
+
+    """
+    compiled = CompiledAutomaton(dfa)
+    if compiled.deterministic_table is None:
+        raise ValueError("The automaton is not deterministic")
+
+    return (
+        tuple(dfa.symbols),
+        compiled.classes,
+        compiled.n_states,
+        next(iter(compiled.initial)),
+        tuple(sorted(compiled.finals)),
+        compiled.deterministic_table.tobytes(),
+    )
+
+
+def from_compact(data):
+    """
+    Build the automaton encoded by ``to_compact``.
+
+    States are named ``q0``, ``q1``... by id and the first dead state of a
+    complete DFA, if any, is ``empty``.
+
+    Args:
+        data: Compact form of the automaton. Type: tuple
+
+    Returns:
+        The automaton. Type: FiniteAutomaton
+
+    """
+    symbols, classes, n_states, initial, finals, table_bytes = data
+    table = array("i")
+    table.frombytes(table_bytes)
+    n_classes = len(classes)
+    finals = set(finals)
+
+    states = []
+    empty_named = False
+    for i in range(n_states):
+        row = table[i * n_classes:(i + 1) * n_classes]
+        is_dead = i != initial and i not in finals and n_classes > 0 and all(j == i for j in row)
+        if is_dead and not empty_named:
+            states.append(State("empty", False))
+            empty_named = True
+        else:
+            states.append(State(f"q{i}", i in finals))
+
+    transitions = Transitions()
+    for i, state in enumerate(states):
+        for class_id, class_symbols in enumerate(classes):
+            j = table[i * n_classes + class_id]
+            if j >= 0:
+                for symbol in class_symbols:
+                    transitions.add_transition(state, symbol, states[j])
+
+    return FiniteAutomaton(states[initial], states, list(symbols), transitions)
+
+
+def _size(data):
+    """Size of a compact automaton for the memory tier: its table entries."""
+    return len(data[5]) // array("i").itemsize + 1
+
+
+class CompileCache():
+    """
+    Cache of the minimal DFAs of regexes.
+
+    Entries are keyed by the regex, the minimization method and the version
+    of the library. The memory tier is an LRU bounded by the total size of
+    the transition tables it holds; the disk tier keeps every automaton in
+    its compact form (``to_compact``) so a new process skips parsing,
+    determinization and minimization entirely.
+
+    The automata returned are shared between calls and must not be
+    modified.
+
+    Args:
+        max_size: Maximum number of (state, class) table entries kept in
+            memory. Type: int
+        cache_dir: Directory of the disk cache. Defaults to
+            ``default_cache_dir()``. Type: str
+        use_disk_cache: Whether to read and write the disk cache. Type: bool
+
+    Attributes:
+        hits: Automata served from memory. Type: int
+        disk_hits: Automata loaded from disk. Type: int
+        misses: Automata built from the regex. Type: int
+
+    """
+
+    def __init__(self, max_size=1 << 20, cache_dir=None, use_disk_cache=True):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.use_disk_cache = use_disk_cache
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(pattern, method="auto"):
+        """Key of a regex and its pipeline options."""
+        description = repr((pattern, method, automata.__version__))
+        return sha256(description.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir or default_cache_dir(), "compile", f"{key}.bin")
+
+    def _remember(self, key, automaton, size):
+        """Add an entry to the memory tier, evicting the least recently used."""
+        with self._lock:
+            if key in self._entries or size > self.max_size:
+                return
+            self._entries[key] = (automaton, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def get(self, pattern, method="auto"):
+        """
+        Return the DFA of a regex, building it only if it is not cached.
+
+        Args:
+            pattern: Regular expression in Kleene notation. Type: str
+            method: Minimization method (see ``FiniteAutomaton.minimize``),
+                or ``None`` to only determinize. Type: str
+
+        Returns:
+            The deterministic automaton. Type: FiniteAutomaton
+
+        """
+        key = self.key(pattern, method)
+        hooks = get_hooks()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            if hooks is not None:
+                hooks.count("cache.hits")
+            return entry[0]
+
+        data = None
+        path = self._path(key)
+        if self.use_disk_cache:
+            data = load_marshalled(path)
+        if data is not None:
+            with self._lock:
+                self.disk_hits += 1
+            if hooks is not None:
+                hooks.count("cache.disk_hits")
+        else:
+            with self._lock:
+                self.misses += 1
+            if hooks is not None:
+                hooks.count("cache.misses")
+            automaton = REParser().create_automaton(pattern)
+            if method is None:
+                dfa = automaton.to_deterministic()
+            else:
+                dfa = automaton.minimize(method)
+            data = to_compact(dfa)
+            if self.use_disk_cache:
+                store_marshalled(path, data)
+
+        # Se devuelve siempre el automata decodificado: mismos nombres en frio y en caliente
+        automaton = from_compact(data)
+        self._remember(key, automaton, _size(data))
+        return automaton
+
+    def clear(self):
+        """Empty the memory tier (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# Cache por defecto del proceso (se crea al usarla)
+_default_cache = None
+
+
+def compile_regex(pattern, method="auto"):
+    """
+    Return the DFA of a regex from the default ``CompileCache``.
+
+    Args:
+        pattern: Regular expression in Kleene notation. Type: str
+        method: Minimization method, or ``None`` to only determinize. Type: str
+
+    Returns:
+        The deterministic automaton. Type: FiniteAutomaton
+
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CompileCache()
+    return _default_cache.get(pattern, method)
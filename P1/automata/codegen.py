@@ -0,0 +1,135 @@
+"""Generation of specialized Python code for deterministic automata."""
+from collections import OrderedDict
+from hashlib import sha256
+from importlib.util import MAGIC_NUMBER
+import os
+
+import automata
+from automata.compiled import CompiledAutomaton
+from automata.dfa import subset_construction
+from automata.utils import default_cache_dir, load_marshalled, store_marshalled
+
+# Funciones ya compiladas en este proceso, por huella del automata (LRU acotada)
+_functions = OrderedDict()
+MAX_FUNCTIONS = 256
+
+_TEMPLATE = '''\
+# Generated from a deterministic finite automaton. Do not edit.
+_TRANSITIONS = (
+{rows}
+)
+_FINALS = frozenset({finals!r})
+
+
+def accepts(string):
+    transitions = _TRANSITIONS
+    state = 0
+    try:
+        for symbol in string:
+            state = transitions[state][symbol]
+    except KeyError:
+        raise ValueError("The symbol is not in the alphabet of the automaton") from None
+    return state in _FINALS
+'''
+
+
+def generate_source(automaton):
+    """
+    Generate the source of an ``accepts(string)`` function for an automaton.
+
+    The automaton is determinized with ``subset_construction`` (a DFA is
+    just renumbered) and emitted as a tuple with one dict per state, mapping
+    each symbol to the next state, so the generated loop is a single index
+    and dict lookup per symbol.
+
+    Args:
+        automaton: Automaton to translate. Type: FiniteAutomaton
+
+    Returns:
+        Python source defining ``accepts``. Type: str
+
+    """
+    compiled = CompiledAutomaton(automaton)
+    subsets, table = subset_construction(compiled)
+    n_classes = compiled.n_classes
+
+    rows = []
+    for state in range(len(subsets)):
+        row = {
+            symbol: table[state * n_classes + class_id]
+            for symbol, class_id in compiled.symbol_ids.items()
+        }
+        rows.append(f"    {row!r},")
+
+    finals = {state for state, subset in enumerate(subsets) if compiled.is_accepting(subset)}
+
+    return _TEMPLATE.format(rows="\n".join(rows), finals=finals)
+
+
+def fingerprint(automaton):
+    """
+    Key of an automaton for the code caches.
+
+    It hashes a canonical description of the automaton (names, finals,
+    symbols and sorted transitions) together with the interpreter's
+    bytecode version, the version of the library and the code template, so
+    code generated by another version is never reused.
+    """
+    description = repr((
+        automaton.initial_state.name,
+        sorted((state.name, state.is_final) for state in automaton.states),
+        sorted(map(repr, automaton.symbols)),
+        sorted(
+            (start.name, repr(symbol), end.name)
+            for (start, symbol, end) in automaton.get_all_transitions()
+        ),
+        automata.__version__,
+        _TEMPLATE,
+    ))
+    return sha256(MAGIC_NUMBER + description.encode("utf-8")).hexdigest()
+
+
+def compile_accepts(automaton, cache_dir=None, use_disk_cache=True):
+    """
+    Return a specialized ``accepts(string)`` function for an automaton.
+
+    The generated code is compiled once and cached, keyed by the
+    fingerprint of the automaton: in memory for this process (the
+    ``MAX_FUNCTIONS`` most recently used functions) and, as a marshalled
+    code object, on disk for the next ones. A cache hit skips both
+    determinization and code generation.
+
+    Args:
+        automaton: Automaton to translate. Type: FiniteAutomaton
+        cache_dir: Directory of the disk cache. Defaults to
+            ``default_cache_dir()``. Type: str
+        use_disk_cache: Whether to read and write the disk cache. Type: bool
+
+    Returns:
+        Function returning if a string is accepted. It raises
+        ``ValueError`` for symbols outside the alphabet. Type: Callable
+
+    """
+    key = fingerprint(automaton)
+
+    function = _functions.get(key)
+    if function is not None:
+        _functions.move_to_end(key)
+        return function
+
+    code = None
+    path = os.path.join(cache_dir or default_cache_dir(), "codegen", f"{key}.bin")
+    if use_disk_cache:
+        code = load_marshalled(path)
+    if code is None:
+        code = compile(generate_source(automaton), f"<automaton {key[:12]}>", "exec")
+        if use_disk_cache:
+            store_marshalled(path, code)
+
+    namespace = {}
+    exec(code, namespace)
+    function = _functions[key] = namespace["accepts"]
+    if len(_functions) > MAX_FUNCTIONS:
+        _functions.popitem(last=False)
+
+    return function
@@ -0,0 +1,471 @@
+"""Compilation of automata into integer-indexed transition tables."""
+from array import array
+from collections import OrderedDict
+
+
+class CompiledAutomaton():
+    """
+    Integer-indexed representation of a finite automaton.
+
+    States are numbered following ``automaton.states``. The alphabet
+    (lambda, ``None``, excluded) is partitioned into classes of symbols with
+    exactly the same transitions from every state, and each class is a
+    single column of the tables. The successors of every (state, class)
+    pair, already completed with lambda transitions, are stored in a dense
+    table indexed by ``state_id * n_classes + class_id``.
+
+    Args:
+        automaton: Automaton to compile. Type: FiniteAutomaton
+        closure_cache_size: Maximum number of state sets whose lambda closure
+            is memoized. Type: int
+
+    Attributes:
+        states: States indexed by their id. Type: tuple
+        state_ids: Id of each state. Type: dict
+        symbols: Symbols of the alphabet. Type: tuple
+        classes: Symbols of each class, indexed by class id. Type: tuple
+        symbol_ids: Class id of each symbol. Type: dict
+        closures: Lambda closure (frozenset of ids) of each state. Type: tuple
+        moves: Direct successor ids of each (state, class) pair. Type: tuple
+        table: Lambda-completed successor ids of each pair. Type: tuple
+        finals: Ids of the final states. Type: frozenset
+        initial: Ids of the lambda closure of the initial state. Type: frozenset
+        deterministic_table: Only successor id (or -1) of each pair, when no
+            pair has more than one successor. ``None`` otherwise. Type: array
+        dead: Ids of the states from which no final state is reachable.
+            Type: frozenset
+        universal: Ids of the final states from which every string is
+            accepted (e.g. a final state looping on every symbol). Type: frozenset
+        sinks: Ids of the states that every symbol leads back to themselves
+            (and only to themselves). Type: frozenset
+        closure_hits: Closures served from the cache. Type: int
+        closure_misses: Closures computed and added to the cache. Type: int
+
+    """
+
+    def __init__(self, automaton, closure_cache_size=4096):
+        # Numeramos los estados, incluidos los que solo aparecen en transiciones
+        states = list(automaton.states)
+        state_ids = {state: i for i, state in enumerate(states)}
+        for (start_state, _, end_state) in automaton.get_all_transitions():
+            for state in (start_state, end_state):
+                if state not in state_ids:
+                    state_ids[state] = len(states)
+                    states.append(state)
+
+        symbols = tuple(symbol for symbol in automaton.symbols if symbol is not None)
+
+        self.states = tuple(states)
+        self.state_ids = state_ids
+        self.symbols = symbols
+        self.n_states = len(states)
+        self.finals = frozenset(i for i, state in enumerate(states) if state.is_final)
+
+        self.closures = self._compute_closures(automaton)
+        self.initial = self.closures[state_ids[automaton.initial_state]]
+        self.moves = self._compute_moves(automaton)
+        self.table = self._compute_table()
+        self.deterministic_table = self._compute_deterministic_table()
+        self.dead = self._compute_dead()
+        self.universal = self._compute_universal()
+        self.sinks = frozenset(
+            i for i in range(self.n_states)
+            if self.closures[i] == {i}
+            and all(self.table[i * self.n_classes + c] == {i} for c in range(self.n_classes))
+        )
+        # Por estado del AFD: 1 si es sumidero, 2 si la aceptacion ya esta decidida
+        self._exits = self._compute_exits()
+
+        self.closure_cache_size = closure_cache_size
+        self._closure_cache = OrderedDict()
+        self.closure_hits = 0
+        self.closure_misses = 0
+
+    def _compute_closures(self, automaton):
+        """
+        Lambda closure of every state, as a tuple of frozensets of ids.
+
+        Lambda cycles are collapsed into strongly connected components
+        (Tarjan), so every component is closed only once and the closure of a
+        component is reused by all its members and predecessors.
+        """
+        state_ids = self.state_ids
+        lambda_moves = [
+            [state_ids[s] for s in automaton.get_transition(state, None)]
+            for state in self.states
+        ]
+        self.has_lambdas = any(lambda_moves)
+
+        closures = [None] * self.n_states
+        index = [None] * self.n_states
+        lowlink = [0] * self.n_states
+        on_stack = [False] * self.n_states
+        stack = []
+        counter = 0
+
+        for root in range(self.n_states):
+            if index[root] is not None:
+                continue
+
+            # Tarjan iterativo: pila de (estado, siguiente sucesor a visitar)
+            work = [(root, 0)]
+            while work:
+                i, k = work.pop()
+                if k == 0:
+                    index[i] = lowlink[i] = counter
+                    counter += 1
+                    stack.append(i)
+                    on_stack[i] = True
+                elif k <= len(lambda_moves[i]):
+                    lowlink[i] = min(lowlink[i], lowlink[lambda_moves[i][k - 1]])
+
+                while k < len(lambda_moves[i]):
+                    j = lambda_moves[i][k]
+                    k += 1
+                    if index[j] is None:
+                        work.append((i, k))
+                        work.append((j, 0))
+                        break
+                    if on_stack[j]:
+                        lowlink[i] = min(lowlink[i], index[j])
+                else:
+                    if lowlink[i] == index[i]:
+                        # Las componentes salen en orden topologico inverso:
+                        # los sucesores fuera de la componente ya estan cerrados
+                        component = []
+                        while True:
+                            j = stack.pop()
+                            on_stack[j] = False
+                            component.append(j)
+                            if j == i:
+                                break
+                        closure = set(component)
+                        for j in component:
+                            for successor in lambda_moves[j]:
+                                if closures[successor] is not None:
+                                    closure.update(closures[successor])
+                        closure = frozenset(closure)
+                        for j in component:
+                            closures[j] = closure
+
+        return tuple(closures)
+
+    def _compute_moves(self, automaton):
+        """
+        Dense table of direct successors, without lambda completion.
+
+        Symbols whose column (successors from every state) is identical are
+        merged into one class, so the table has one column per class.
+        """
+        state_ids = self.state_ids
+        empty = frozenset()
+
+        # Columna de cada simbolo -> clase de equivalencia
+        class_ids = {}
+        columns = []
+        classes = []
+        symbol_ids = {}
+        for symbol in self.symbols:
+            column = tuple(
+                frozenset(state_ids[s] for s in automaton.get_transition(state, symbol)) or empty
+                for state in self.states
+            )
+            class_id = class_ids.get(column)
+            if class_id is None:
+                class_id = class_ids[column] = len(columns)
+                columns.append(column)
+                classes.append([])
+            classes[class_id].append(symbol)
+            symbol_ids[symbol] = class_id
+
+        self.classes = tuple(tuple(symbols) for symbols in classes)
+        self.symbol_ids = symbol_ids
+        self.n_classes = len(columns)
+
+        return tuple(
+            column[i] for i in range(self.n_states) for column in columns
+        )
+
+    def _compute_table(self):
+        """Dense table of lambda-completed successors."""
+        closures = self.closures
+        return tuple(
+            frozenset().union(*[closures[i] for i in successors])
+            for successors in self.moves
+        )
+
+    def _compute_deterministic_table(self):
+        """Flat ``array`` of successor ids if the table is deterministic."""
+        if len(self.initial) != 1:
+            return None
+
+        deterministic_table = array("i")
+        for successors in self.table:
+            if len(successors) > 1:
+                return None
+            deterministic_table.append(next(iter(successors), -1))
+
+        return deterministic_table
+
+    def _successors(self, i):
+        """Lambda-completed successors of a state for every class, plus its closure."""
+        n_classes = self.n_classes
+        return self.closures[i].union(*self.table[i * n_classes:(i + 1) * n_classes])
+
+    def _compute_dead(self):
+        """Ids of the states that cannot reach a final state."""
+        predecessors = [[] for _ in range(self.n_states)]
+        for i in range(self.n_states):
+            for j in self._successors(i):
+                predecessors[j].append(i)
+
+        alive = set(self.finals)
+        pending = list(self.finals)
+        while pending:
+            for i in predecessors[pending.pop()]:
+                if i not in alive:
+                    alive.add(i)
+                    pending.append(i)
+
+        return frozenset(range(self.n_states)) - alive
+
+    def _compute_universal(self):
+        """
+        Ids of the final states from which every string is accepted.
+
+        It is the largest set ``U`` of final states such that every state of
+        ``U`` has, for every class, a successor in ``U``. States are removed
+        from the final states with a worklist, counting for each (state,
+        class) pair how many of its successors are still candidates.
+        """
+        n_classes = self.n_classes
+        table = self.table
+        universal = set(self.finals)
+
+        counts = [0] * len(table)
+        predecessors = [[] for _ in range(self.n_states)]
+        for pair, successors in enumerate(table):
+            for j in successors:
+                predecessors[j].append(pair)
+            counts[pair] = len(successors & universal)
+
+        pending = [
+            i for i in universal
+            if any(counts[i * n_classes + c] == 0 for c in range(n_classes))
+        ]
+        universal.difference_update(pending)
+        while pending:
+            for pair in predecessors[pending.pop()]:
+                counts[pair] -= 1
+                i = pair // n_classes
+                if counts[pair] == 0 and i in universal:
+                    universal.remove(i)
+                    pending.append(i)
+
+        return frozenset(universal)
+
+    def _compute_exits(self):
+        """Early exit flags of each state of the deterministic table (-1 last)."""
+        if self.deterministic_table is None:
+            return None
+
+        exits = bytearray(self.n_states + 1)
+        exits[-1] = 3
+        for i in range(self.n_states):
+            if i in self.sinks:
+                exits[i] |= 1
+            if i in self.dead or i in self.universal:
+                exits[i] |= 2
+
+        return exits
+
+    def is_decided(self, current):
+        """
+        Check if the acceptance of a set of state ids is already decided.
+
+        It is when every state is dead (rejected whatever comes next) or some
+        state is universal (accepted whatever comes next).
+        """
+        return current <= self.dead or not self.universal.isdisjoint(current)
+
+    def is_dead(self, current):
+        """Check if no final state is reachable from a set of state ids."""
+        return current <= self.dead
+
+    def is_sink(self, current):
+        """Check if every symbol leads a set of state ids back to itself."""
+        return not current or (len(current) == 1 and current <= self.sinks)
+
+    def check_symbols(self, symbols):
+        """
+        Consume the rest of an input, only checking its symbols.
+
+        Raises:
+            ValueError: If some symbol is not in the alphabet.
+
+        """
+        try:
+            valid = self.symbol_ids.keys() >= set(symbols)
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError("The symbol is not in the alphabet of the automaton")
+
+    def symbol_id(self, symbol):
+        """
+        Return the id of a symbol.
+
+        Raises:
+            ValueError: If the symbol is not in the alphabet.
+
+        """
+        try:
+            return self.symbol_ids[symbol]
+        except (KeyError, TypeError):
+            raise ValueError("The symbol is not in the alphabet of the automaton") from None
+
+    def encode(self, states):
+        """Convert a collection of states into a frozenset of ids."""
+        try:
+            return frozenset(self.state_ids[state] for state in states)
+        except KeyError as e:
+            raise ValueError(f"State {e.args[0]!r} is not in the automaton") from None
+
+    def decode(self, ids):
+        """Convert a collection of ids into a set of states."""
+        return {self.states[i] for i in ids}
+
+    def closure(self, ids):
+        """
+        Return the lambda closure of a set of state ids.
+
+        Results are memoized in a bounded LRU cache keyed by the set. The
+        cache is shared between threads: a race between two threads only
+        costs recomputing a closure (or losing an update of the hit and miss
+        counters).
+
+        Args:
+            ids: Ids of the states to complete. Type: frozenset
+
+        Returns:
+            Ids of the states reachable with lambda transitions. Type: frozenset
+
+        """
+        if not self.has_lambdas:
+            return frozenset(ids)
+
+        ids = frozenset(ids)
+        cache = self._closure_cache
+        closure = cache.get(ids)
+        if closure is not None:
+            self.closure_hits += 1
+            try:
+                cache.move_to_end(ids)
+            except KeyError:
+                pass
+            return closure
+
+        self.closure_misses += 1
+        closures = self.closures
+        closure = frozenset().union(*[closures[i] for i in ids])
+        cache[ids] = closure
+        if len(cache) > self.closure_cache_size:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                pass
+
+        return closure
+
+    def move(self, current, symbol_id):
+        """Direct successors (without lambda completion) of a set of ids."""
+        moves = self.moves
+        n_classes = self.n_classes
+
+        return frozenset().union(*[moves[i * n_classes + symbol_id] for i in current])
+
+    def is_accepting(self, current):
+        """Check if a set of state ids contains a final state."""
+        return not self.finals.isdisjoint(current)
+
+    def size(self, current):
+        """Number of states in a set of state ids."""
+        return len(current)
+
+    def step(self, current, symbol):
+        """
+        Consume one symbol from a set of state ids.
+
+        Args:
+            current: Ids of the current states. Type: frozenset
+            symbol: Symbol to consume. Type: str
+
+        Returns:
+            Ids of the states after consuming the symbol. Type: frozenset
+
+        """
+        return self.closure(self.move(current, self.symbol_id(symbol)))
+
+    def run(self, current, string, stop_when_decided=False):
+        """
+        Consume a full string from a set of state ids.
+
+        The rest of the string is only checked against the alphabet as soon
+        as the states are a sink (the result cannot change) or, with
+        ``stop_when_decided``, as soon as its acceptance is decided (see
+        ``is_decided``).
+
+        Args:
+            current: Ids of the current states. Type: frozenset
+            string: String to consume. Type: str
+            stop_when_decided: Whether the caller only needs to know if the
+                string is accepted. The returned states are then only
+                guaranteed to have the same acceptance. Type: bool
+
+        Returns:
+            Ids of the states after consuming the string. Type: frozenset
+
+        """
+        symbol_ids = self.symbol_ids
+        n_classes = self.n_classes
+        symbols = iter(string)
+
+        if self.deterministic_table is not None and len(current) <= 1:
+            table = self.deterministic_table
+            exits = self._exits
+            exit_flags = 3 if stop_when_decided else 1
+            state = next(iter(current), -1)
+            if not exits[state] & exit_flags:
+                for symbol in symbols:
+                    try:
+                        state = table[state * n_classes + symbol_ids[symbol]]
+                    except KeyError:
+                        raise ValueError("The symbol is not in the alphabet of the automaton") from None
+                    if exits[state] & exit_flags:
+                        break
+            self.check_symbols(symbols)
+
+            return frozenset() if state == -1 else frozenset((state,))
+
+        moves = self.moves
+        closure = self.closure
+        dead = self.dead
+        universal = self.universal
+        sinks = self.sinks
+        if not (self.is_sink(current) or stop_when_decided and self.is_decided(current)):
+            for symbol in symbols:
+                try:
+                    symbol_id = symbol_ids[symbol]
+                except KeyError:
+                    raise ValueError("The symbol is not in the alphabet of the automaton") from None
+                current = closure(
+                    frozenset().union(*[moves[i * n_classes + symbol_id] for i in current])
+                )
+                if stop_when_decided:
+                    if current <= dead or not universal.isdisjoint(current):
+                        break
+                elif not current or len(current) == 1 and current <= sinks:
+                    break
+        self.check_symbols(symbols)
+
+        return current
@@ -0,0 +1,102 @@
+"""On-demand determinization of a pair of automata."""
+from automata.compiled import CompiledAutomaton
+
+
+class DeterminizedPair():
+    """
+    Determinization on demand of a pair of automata.
+
+    Each state is a pair of bitmasks of state ids, one for each automaton,
+    both closed under lambda transitions and without dead states (which
+    cannot change the acceptance of any string), so a side is 0 once it
+    can no longer accept. Symbols are grouped in the classes of the common
+    alphabet and, as in ``subset_construction``, the successors of each
+    byte of a mask are memoized per class.
+
+    Args:
+        automaton1: First automaton. Type: FiniteAutomaton
+        automaton2: Second automaton. Type: FiniteAutomaton
+
+    Attributes:
+        classes: ``((class1, class2), symbol)`` for each class of the common
+            alphabet, ``symbol`` being its smallest symbol and ``class1`` /
+            ``class2`` its class in each automaton (-1 if the automaton does
+            not have it). Type: list
+        class_symbols: Symbols of each ``(class1, class2)``. Type: dict
+
+    """
+
+    def __init__(self, automaton1, automaton2):
+        self.compiled = (CompiledAutomaton(automaton1), CompiledAutomaton(automaton2))
+
+        # Clase conjunta de cada simbolo: (clase en el 1, clase en el 2), -1 si no esta
+        self.class_symbols = {}
+        for symbol in sorted(set(self.compiled[0].symbols) | set(self.compiled[1].symbols), key=repr):
+            key = tuple(compiled.symbol_ids.get(symbol, -1) for compiled in self.compiled)
+            self.class_symbols.setdefault(key, []).append(symbol)
+        self.classes = [(key, symbols[0]) for key, symbols in self.class_symbols.items()]
+
+        def mask(ids):
+            result = 0
+            for i in ids:
+                result |= 1 << i
+            return result
+
+        # Sucesores (sin estados muertos) de cada estado y clase, como mascaras
+        self._live = []
+        self._finals = []
+        self._moves = []
+        for compiled in self.compiled:
+            live = ~mask(compiled.dead)
+            self._live.append(live)
+            self._finals.append(mask(compiled.finals))
+            self._moves.append([mask(successors) & live for successors in compiled.table])
+        # _byte_successors[lado][c][(k << 8) | b]: sucesores del byte b en la posicion k
+        self._byte_successors = [
+            [{} for _ in range(compiled.n_classes)] for compiled in self.compiled
+        ]
+        self._n_bytes = [(compiled.n_states + 7) // 8 for compiled in self.compiled]
+
+    def initial(self, side):
+        """Pair of the initial state of one automaton alone."""
+        pair = [0, 0]
+        compiled = self.compiled[side]
+        pair[side] = sum(1 << i for i in compiled.initial) & self._live[side]
+        return tuple(pair)
+
+    def initial_pair(self):
+        """Pair of the initial states of both automata."""
+        return (self.initial(0)[0], self.initial(1)[1])
+
+    def accepts(self, pair):
+        """Whether each side of a pair is accepting. Type: tuple"""
+        return (bool(pair[0] & self._finals[0]), bool(pair[1] & self._finals[1]))
+
+    def is_accepting(self, pair):
+        """Whether a pair of the union of both automata is accepting."""
+        return bool(pair[0] & self._finals[0] or pair[1] & self._finals[1])
+
+    def step(self, pair, key):
+        """Successor of a pair for the class ``(class1, class2)``."""
+        return (self.successor(0, pair[0], key[0]), self.successor(1, pair[1], key[1]))
+
+    def successor(self, side, ids, class_id):
+        """Successor of a bitmask of ids of one automaton."""
+        if class_id < 0 or not ids:
+            return 0
+        cache = self._byte_successors[side][class_id]
+        successor = 0
+        for k, b in enumerate(ids.to_bytes(self._n_bytes[side], "little")):
+            if b:
+                part = (k << 8) | b
+                part_successors = cache.get(part)
+                if part_successors is None:
+                    moves = self._moves[side]
+                    n_classes = self.compiled[side].n_classes
+                    part_successors = 0
+                    for bit in range(8):
+                        if b & (1 << bit):
+                            part_successors |= moves[((k << 3) + bit) * n_classes + class_id]
+                    cache[part] = part_successors
+                successor |= part_successors
+        return successor
@@ -1,5 +1,7 @@
-from automata.automaton import State, Transitions, FiniteAutomaton
+from automata.automaton import DerivedState, State, StateNames, Transitions, FiniteAutomaton
+from automata.metrics import get_hooks
 from automata.utils import is_deterministic, write_dot
+from array import array
 from functools import cmp_to_key
 import re
 
@@ -58,6 +60,14 @@ def state_create(set_states):
 
     return State(name, final) 
 
+# Nombre de un bloque de estados equivalentes (nombrado perezoso de to_minimized)
+def block_name(states):
+    return state_create(states).name
+
+# Nombre de un subconjunto de estados (nombrado perezoso de to_deterministic)
+def subset_name(states):
+    return order_states(states) if states else "empty"
+
 # Funcion para sacar el nombre de un conjunto de estados ordenado 
 def order_states (states):
     # Averiguo el nombre del conjunto
@@ -86,219 +96,677 @@ def is_deterministic(finiteAutomaton):
             
     return True
 
+# Mascara (entero) de un conjunto de ids
+def _to_mask(ids):
+    mask = 0
+    for i in ids:
+        mask |= 1 << i
+    return mask
+
+# Conjunto de ids de una mascara
+def _from_mask(mask):
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return frozenset(ids)
+
+# Construccion de subconjuntos sobre los ids de un automata compilado
+def subset_construction(compiled, initial=None, unanchored=False, max_states=None):
+    """
+    Subset construction over the integer ids of a compiled automaton.
+
+    Subsets are interned as integer bitmasks (bit ``i`` is state ``i``).
+    The lambda-completed successors of every state are precomputed as
+    masks and the successors of each group of 8 states (a byte of the
+    mask) are memoized per class, so a subset step is one lookup and OR
+    per non-empty byte. Subsets are converted to frozensets only at the end.
+
+    Args:
+        compiled: Compiled automaton (any object with ``closures``,
+            ``moves``, ``n_classes`` and ``initial``). Type: CompiledAutomaton
+        initial: Ids of the initial subset. Defaults to the lambda closure of
+            the initial state. Type: frozenset
+        unanchored: Add an implicit ``Σ*`` prefix, i.e. the initial subset is
+            added again after every symbol, so the DFA accepts every string
+            with a suffix in the language. Type: bool
+        max_states: Give up if the DFA has more states. Type: int
+
+    Returns:
+        Tuple ``(subsets, table)``. ``subsets`` lists the reachable subsets
+        indexed by DFA state id (0 is the initial one, the empty subset acts
+        as sink) and ``table`` is the flat transition table, indexed by
+        ``state_id * n_classes + symbol_id``. ``None`` if ``max_states`` is
+        exceeded. Type: tuple
+
+    """
+    if initial is None:
+        initial = compiled.initial
+
+    n_classes = compiled.n_classes
+    n_states = len(compiled.closures)
+    moves = compiled.moves
+
+    # Sucesores (con clausura lambda) de cada estado y clase, como mascaras
+    closures = [_to_mask(closure) for closure in compiled.closures]
+    successors = []
+    for symbol_id in range(n_classes):
+        class_successors = []
+        for i in range(n_states):
+            mask = 0
+            for j in moves[i * n_classes + symbol_id]:
+                mask |= closures[j]
+            class_successors.append(mask)
+        successors.append(class_successors)
+
+    # byte_successors[c][(k << 8) | b]: sucesores del byte b en la posicion k
+    byte_successors = [{} for _ in range(n_classes)]
+    n_bytes = (n_states + 7) // 8
+
+    root = _to_mask(initial)
+    masks = [root]
+    mask_ids = {root: 0}
+    table = array("i")
+
+    # La lista de mascaras hace de cola (BFS)
+    i = 0
+    while i < len(masks):
+        data = masks[i].to_bytes(n_bytes, "little")
+        parts = [(k << 8) | b for k, b in enumerate(data) if b]
+        for symbol_id in range(n_classes):
+            cache = byte_successors[symbol_id]
+            new_mask = root if unanchored else 0
+            for part in parts:
+                part_successors = cache.get(part)
+                if part_successors is None:
+                    class_successors = successors[symbol_id]
+                    offset = (part >> 8) << 3
+                    part_successors = 0
+                    for bit in range(8):
+                        if part & (1 << bit):
+                            part_successors |= class_successors[offset + bit]
+                    cache[part] = part_successors
+                new_mask |= part_successors
+            new_id = mask_ids.get(new_mask)
+            if new_id is None:
+                new_id = mask_ids[new_mask] = len(masks)
+                masks.append(new_mask)
+                if max_states is not None and len(masks) > max_states:
+                    return None
+            table.append(new_id)
+        i += 1
+
+    return [_from_mask(mask) for mask in masks], table
+
+# Minimizacion (Hopcroft) sobre la tabla de ids de un AFD completo
+def minimize_table(table, n_classes, blocks):
+    """
+    Merge the equivalent states of a complete DFA given as a flat table.
+
+    Hopcroft's partition refinement: a reverse transition index gives the
+    predecessors of every block, and a worklist of ``(block, class)``
+    splitters only ever adds the smaller half of a split block, for
+    O(n·k·log n) time.
+
+    Args:
+        table: Flat transition table, indexed by
+            ``state_id * n_classes + symbol_id``. Type: array
+        n_classes: Number of columns of the table. Type: int
+        blocks: Initial partition, as a hashable label of every state (e.g.
+            whether it is final). States with different labels are never
+            merged. Type: list
+
+    Returns:
+        Tuple ``(block_ids, minimized_table)``. ``block_ids[s]`` is the
+        state of the minimal DFA that contains state ``s``, the block of
+        state 0 being 0. Type: tuple
+
+    """
+    n_states = len(blocks)
+
+    # Particion inicial segun las etiquetas
+    labels = {}
+    block_of = [labels.setdefault(label, len(labels)) for label in blocks]
+    members = [[] for _ in labels]
+    for state, block in enumerate(block_of):
+        members[block].append(state)
+    members = [set(block) for block in members]
+
+    # Indice inverso: predecessors[t * n_classes + c] = estados que van a t con c
+    predecessors = [[] for _ in range(n_states * n_classes)]
+    for pair, target in enumerate(table):
+        predecessors[target * n_classes + pair % n_classes].append(pair // n_classes)
+
+    # Lista de separadores (bloque, clase): todos los bloques salvo el mayor
+    largest = max(range(len(members)), key=lambda block: len(members[block]), default=0)
+    waiting = [
+        (block, symbol_id)
+        for block in range(len(members)) if block != largest
+        for symbol_id in range(n_classes)
+    ]
+    in_waiting = set(waiting)
+    n_splitters = 0
+
+    while waiting:
+        splitter = waiting.pop()
+        in_waiting.discard(splitter)
+        block, symbol_id = splitter
+        n_splitters += 1
+
+        # Estados que llegan al bloque con la clase, agrupados por su bloque
+        touched = {}
+        for target in members[block]:
+            for state in predecessors[target * n_classes + symbol_id]:
+                touched.setdefault(block_of[state], []).append(state)
+
+        for split_block, states in touched.items():
+            if len(states) == len(members[split_block]):
+                continue
+
+            new_block = len(members)
+            moved = set(states)
+            members[split_block] -= moved
+            members.append(moved)
+            for state in states:
+                block_of[state] = new_block
+
+            smaller = new_block if len(moved) <= len(members[split_block]) else split_block
+            for c in range(n_classes):
+                if (split_block, c) in in_waiting:
+                    pair = (new_block, c)
+                else:
+                    pair = (smaller, c)
+                in_waiting.add(pair)
+                waiting.append(pair)
+
+    hooks = get_hooks()
+    if hooks is not None:
+        hooks.observe("dfa.minimize.splitters", n_splitters)
+
+    # Numeracion por orden de aparicion (el bloque del estado 0 es el 0)
+    renumber = {}
+    block_ids = [renumber.setdefault(block, len(renumber)) for block in block_of]
+    n_blocks = len(renumber)
+
+    minimized_table = array("i", [0] * (n_blocks * n_classes))
+    for state in range(n_states):
+        block = block_ids[state]
+        for symbol_id in range(n_classes):
+            minimized_table[block * n_classes + symbol_id] = block_ids[table[state * n_classes + symbol_id]]
+
+    return block_ids, minimized_table
+
+# Automata sin transiciones lambda dado por sus sucesores, invertido
+class _Reversal():
+    """
+    Reverse of a lambda-free automaton given by its successor ids.
+
+    It offers the interface that ``subset_construction`` needs.
+
+    Args:
+        n_states: Number of states. Type: int
+        n_classes: Number of symbol classes. Type: int
+        successors: Successor ids of every (state, class) pair, indexed by
+            ``state_id * n_classes + symbol_id``. Type: Sequence
+        initial: Ids of the initial states of the reverse (the final states
+            of the original automaton). Type: Iterable[int]
+
+    """
+
+    def __init__(self, n_states, n_classes, successors, initial):
+        moves = [[] for _ in range(n_states * n_classes)]
+        for pair, targets in enumerate(successors):
+            source, symbol_id = divmod(pair, n_classes)
+            for target in targets:
+                moves[target * n_classes + symbol_id].append(source)
+
+        self.n_classes = n_classes
+        self.moves = [frozenset(sources) for sources in moves]
+        self.closures = [frozenset((i,)) for i in range(n_states)]
+        self.initial = frozenset(initial)
+
+# Minimizacion de Brzozowski sobre los ids de un automata compilado
+def brzozowski_table(compiled, max_states=None, reverse_dfa=None):
+    """
+    Minimal DFA of a compiled automaton by double reversal.
+
+    The lambda-completed table of the automaton is reversed and
+    determinized, and the result is reversed and determinized again
+    (Brzozowski). The NFA is never determinized in the forward direction.
+
+    Args:
+        compiled: Compiled automaton. Type: CompiledAutomaton
+        max_states: Give up if an intermediate DFA has more states. Type: int
+        reverse_dfa: ``(subsets, table)`` of the DFA of the reverse, if it
+            is already built (see ``choose_minimization``). Type: tuple
+
+    Returns:
+        Tuple ``(table, finals)`` of the minimal complete DFA, whose initial
+        state is 0, or ``None`` if ``max_states`` is exceeded. Type: tuple
+
+    """
+    n_classes = compiled.n_classes
+
+    dfa = reverse_dfa
+    if dfa is None:
+        reverse = _Reversal(compiled.n_states, n_classes, compiled.table, compiled.finals)
+        dfa = subset_construction(reverse, max_states=max_states)
+        if dfa is None:
+            return None
+    subsets, table = dfa
+    finals = [i for i, subset in enumerate(subsets) if not subset.isdisjoint(compiled.initial)]
+
+    reverse = _Reversal(len(subsets), n_classes, [(j,) for j in table], finals)
+    dfa = subset_construction(reverse, max_states=max_states)
+    if dfa is None:
+        return None
+    subsets, table = dfa
+
+    return table, [0 in subset for subset in subsets]
+
+# Eleccion del algoritmo de minimizacion segun la forma del automata
+def choose_minimization(compiled, max_blowup=8):
+    """
+    Choose between Hopcroft and Brzozowski minimization.
+
+    A DFA is always minimized with Hopcroft. For an NFA the subset blowup
+    is estimated with bounded determinizations: if the forward DFA has at
+    most ``max_blowup`` states per NFA state (and symbol class) it is
+    minimized with Hopcroft; otherwise, Brzozowski is chosen if the DFA of
+    the reverse stays within that bound. The DFA built by the successful
+    probe is returned, so that it is not determinized again.
+
+    Args:
+        compiled: Compiled automaton. Type: CompiledAutomaton
+        max_blowup: Maximum size of the DFA, relative to the NFA, accepted
+            for determinization. Type: int
+
+    Returns:
+        Tuple ``(method, dfa)``. ``method`` is ``"hopcroft"`` or
+        ``"brzozowski"`` and ``dfa`` the ``(subsets, table)`` of the forward
+        DFA (for Hopcroft) or of the DFA of the reverse (for Brzozowski), or
+        ``None`` if no probe was run or completed. Type: tuple
+
+    """
+    if compiled.deterministic_table is not None:
+        return "hopcroft", None
+
+    # Presupuesto de celdas de la tabla: crece con el NFA, no con el alfabeto
+    max_states = max_blowup * compiled.n_states // max(1, compiled.n_classes) + 1
+    dfa = subset_construction(compiled, max_states=max_states)
+    if dfa is not None:
+        return "hopcroft", dfa
+
+    reverse = _Reversal(compiled.n_states, compiled.n_classes, compiled.table, compiled.finals)
+    dfa = subset_construction(reverse, max_states=max_states)
+    if dfa is not None:
+        return "brzozowski", dfa
+    return "hopcroft", None
+
+# Automata determinista sin sumideros (estados no finales que solo vuelven a si mismos)
+def _drop_sinks(dfa):
+    """
+    Remove the sinks of a complete DFA, making it partial.
+
+    A sink is a non-final state whose transitions all go back to itself,
+    such as ``empty``. The initial state is always kept, without its
+    transitions if it is a sink.
+
+    Args:
+        dfa: Complete deterministic automaton.
+
+    Returns:
+        Equivalent partial DFA (``dfa`` itself if it has no sinks).
+    """
+    sinks = {
+        state for state in dfa.states
+        if not state.is_final and all(
+            dfa.get_transition(state, symbol) == {state} for symbol in dfa.symbols
+        )
+    }
+    if not sinks:
+        return dfa
+
+    transitions = Transitions()
+    for (start_state, symbol, end_state) in dfa.get_all_transitions():
+        if end_state not in sinks:
+            transitions.add_transition(start_state, symbol, end_state)
+    states = [state for state in dfa.states if state not in sinks or state is dfa.initial_state]
+
+    return FiniteAutomaton(dfa.initial_state, states, dfa.symbols, transitions)
+
+# Automata determinista a partir de los subconjuntos y la tabla de subset_construction
+def _deterministic_automaton(finiteAutomaton, compiled, subsets, table, complete=True):
+    """
+    Build the DFA given by the result of ``subset_construction``.
+
+    Args:
+        finiteAutomaton: Automaton that was determinized.
+        compiled: Its compiled automaton. Type: CompiledAutomaton
+        subsets: Subset of every DFA state. Type: list
+        table: Flat transition table of the DFA. Type: array
+        complete: Whether to keep the ``empty`` sink (see
+            ``to_deterministic``). Type: bool
+
+    Returns:
+        Equivalent deterministic automaton.
+    """
+    n_classes = compiled.n_classes
+
+    # Simbolos para el automata determinista
+    dfa_symbols = list()
+    for symbol in finiteAutomaton.symbols: 
+        if symbol != 'λ' and symbol is not None: dfa_symbols.append(symbol)
+
+    # Los estados solo se nombran (con order_states) cuando se lee un nombre
+    names = StateNames(subset_name)
+    # Estado sumidero: el subconjunto vacio
+    empty_state = DerivedState(len(subsets), (), False, namer=names)
+    transitions = Transitions()
+    dfa_states = []
+    for i, subset in enumerate(subsets):
+        if subset:
+            dfa_states.append(names.add(DerivedState(
+                i, compiled.decode(subset), compiled.is_accepting(subset), namer=names,
+            )))
+        elif complete:
+            empty_state.id = i
+            dfa_states.append(names.add(empty_state))
+        else:
+            dfa_states.append(None)
+    # El sumidero siempre esta; si no se alcanza, solo tiene sus bucles
+    if complete and frozenset() not in subsets:
+        dfa_states.append(names.add(empty_state))
+        for symbol in dfa_symbols:
+            transitions.add_transition(empty_state, symbol, empty_state)
+
+    # Transiciones: una entrada de la tabla por clase de simbolos
+    for i, state in enumerate(dfa_states[:len(subsets)]):
+        if state is None:
+            continue
+        for class_id, class_symbols in enumerate(compiled.classes):
+            next_state = dfa_states[table[i * n_classes + class_id]]
+            if next_state is None:
+                continue
+            for symbol in class_symbols:
+                if symbol != 'λ':
+                    transitions.add_transition(state, symbol, next_state)
+
+    # Construir el nuevo automata determinista
+    dfa_states = [state for state in dfa_states if state is not None]
+    dfa = FiniteAutomaton(dfa_states[0], dfa_states, dfa_symbols, transitions)
+
+    hooks = get_hooks()
+    if hooks is not None:
+        hooks.count("dfa.to_deterministic.states", len(dfa_states))
+        hooks.trace("dfa.to_deterministic", nfa_states=len(finiteAutomaton.states), dfa_states=len(dfa_states))
+
+    return dfa
+
+# Automata minimo de Brzozowski de un automata compilado
+def _brzozowski_automaton(compiled, reverse_dfa=None):
+    """
+    Build the minimal DFA given by ``brzozowski_table``.
+
+    Args:
+        compiled: Compiled automaton. Type: CompiledAutomaton
+        reverse_dfa: DFA of the reverse, if it is already built. Type: tuple
+
+    Returns:
+        Equivalent minimal complete DFA.
+    """
+    table, finals = brzozowski_table(compiled, reverse_dfa=reverse_dfa)
+    n_classes = compiled.n_classes
+
+    # El estado muerto (si existe) es el unico no final sin salida
+    states = []
+    for i, is_final in enumerate(finals):
+        is_dead = not is_final and all(table[i * n_classes + c] == i for c in range(n_classes))
+        states.append(State("empty" if is_dead and i else f"q{i}", is_final))
+
+    transitions = Transitions()
+    for i, state in enumerate(states):
+        for class_id, class_symbols in enumerate(compiled.classes):
+            for symbol in class_symbols:
+                transitions.add_transition(state, symbol, states[table[i * n_classes + class_id]])
+
+    return FiniteAutomaton(states[0], states, list(compiled.symbols), transitions)
+
 class DeterministicFiniteAutomaton(FiniteAutomaton):
             
     @staticmethod
-    def to_deterministic(finiteAutomaton):
-        from automata.automaton_evaluator import FiniteAutomatonEvaluator
-        from queue import Queue
-
-        # Si el automata ya es determinista lo devolvemos
-        if is_deterministic(finiteAutomaton):
-            return finiteAutomaton
+    def to_deterministic(finiteAutomaton, complete=True):
+        """
+        Return an equivalent deterministic automaton.
 
-        evaluator = FiniteAutomatonEvaluator(finiteAutomaton)
-        # Estado inicial del automata determinista
-        initial_state = frozenset(evaluator.current_states)
-        init_state = State(order_states(evaluator.current_states), any(state.is_final for state in evaluator.current_states)) 
-        # Conjunto de transiciones del AFD
-        transitions = Transitions()
-        #import pdb; pdb.set_trace()
-        # Diccionario para guardar la tabla de transiciones
-        dfa_states = {
-            initial_state: State(order_states(evaluator.current_states), any(state.is_final for state in initial_state))
-        }
-        
-        # Simbolos para el automata determinista
-        dfa_symbols = list()
-        for symbol in finiteAutomaton.symbols: 
-            if symbol != 'λ': dfa_symbols.append(symbol)
-
-        # Estado sumidero
-        empty_state = State("empty", False)
-        dfa_states[frozenset()] = empty_state # Añadir el estado sumidero al diccionario de estados
-
-        # Cola para tratar los estados para procesar
-        states_to_check = Queue()
-        states_to_check.put(initial_state)
-        
-        # Mientras queden estados en la cola
-        while not states_to_check.empty():
-            # Obtengo el conjunto de estados actual
-            current_states_frozenset = states_to_check.get()
-
-            for symbol in dfa_symbols:
-                evaluator.current_states = set(current_states_frozenset)  # Estado actual
-                evaluator.process_symbol(symbol)  # Procesar el símbolo
-
-                # Crear un frozenset para los nuevos estados después de la transición
-                new_states_frozenset = frozenset(evaluator.current_states)
-
-                # Crear un nuevo State object para el nuevo estado
-                new_state = State(order_states(evaluator.current_states), any(state.is_final for state in evaluator.current_states))
-
-                # Añadir el nuevo estado al diccionario si no existe
-                if new_states_frozenset not in dfa_states and evaluator.current_states:
-                    dfa_states[new_states_frozenset] = new_state
-                    states_to_check.put(new_states_frozenset)
-                # Si el estado actual no tiene transición para el símbolo actual, añadir una transición al estado sumidero
-                if not evaluator.current_states:
-                    #transitions.add_transition(current_states_frozenset, symbol, empty_state)
-                    transitions.add_transition(dfa_states[current_states_frozenset], symbol, empty_state)
-                else: 
-                    # Añadir la transición al diccionario de transiciones
-                    #transitions.add_transition(current_states_frozenset, symbol, new_state)
-                    transitions.add_transition(dfa_states[current_states_frozenset], symbol, new_state)
-
-        # Añadir las transiciones del estado sumidero al estado sumidero
-        for symbol in finiteAutomaton.symbols:
-            if symbol != 'λ': transitions.add_transition(empty_state, symbol, empty_state)
+        Args:
+            finiteAutomaton: Automaton to determinize.
+            complete: Whether to add the ``empty`` sink so that every state
+                has a transition for every symbol. Otherwise the DFA is
+                partial: the empty set of states is not created and missing
+                transitions reject.
 
-        # Construir el nuevo automata determinista
-        dfa = FiniteAutomaton(init_state, dfa_states.values(), dfa_symbols, transitions)
+        Returns:
+            Equivalent deterministic automaton. A complete deterministic
+            input is returned as is, or without its sinks (see
+            ``_drop_sinks``) if ``complete`` is false.
+        """
+        from automata.compiled import CompiledAutomaton
 
-        return dfa
+        # Si el automata ya es determinista (y completo) lo devolvemos, sin sumideros si es parcial
+        if is_deterministic(finiteAutomaton):
+            dfa = finiteAutomaton if complete else _drop_sinks(finiteAutomaton)
+            hooks = get_hooks()
+            if hooks is not None:
+                n_states = len(dfa.states)
+                hooks.count("dfa.to_deterministic.states", n_states)
+                hooks.trace(
+                    "dfa.to_deterministic", nfa_states=len(finiteAutomaton.states), dfa_states=n_states,
+                )
+            return dfa
+
+        compiled = CompiledAutomaton(finiteAutomaton)
+        # Subconjuntos alcanzables (ids) y tabla de transiciones del AFD
+        subsets, table = subset_construction(compiled)
+        return _deterministic_automaton(finiteAutomaton, compiled, subsets, table, complete)
 
 
     @staticmethod
     def to_minimized(dfa):
         """
         Return a equivalent minimal automaton.
+
+        Unreachable states are removed and the rest are merged with
+        ``minimize_table`` (Hopcroft). Missing transitions go to an implicit
+        sink, which does not appear in the result unless it is merged with
+        a real state.
+
         Returns:
             Equivalent minimal automaton.
         """
-        from queue import Queue
-        from automata.automaton_evaluator import FiniteAutomatonEvaluator
-        evaluator = FiniteAutomatonEvaluator(dfa) # Conjunto de estados actual
-        previous = FiniteAutomatonEvaluator(dfa) # Estado del que vengo al llegar al actual 
-        
-        # Verifica que el automata sea determinista
-        # if not isinstance(dfa, DeterministicFiniteAutomaton):
-            # raise ValueError("El autómata no es determinista")
-
-        # Eliminacion estados inaccesibles usando BFS 
-        q = Queue()
-        q.put(evaluator.current_states)
-        accesible_states = set()
-        accesible_states.add(dfa.initial_state)
-        while not q.empty():
-            state = q.get()
-            for sym in dfa.symbols:
-                evaluator.current_states = state
-                evaluator.process_symbol(sym)
-                if len(evaluator.current_states) > 0:
-                    flag_addqueue=False
-                    for next_state in evaluator.current_states:
-                        if next_state not in accesible_states:
-                            if not flag_addqueue:
-                                q.put(evaluator.current_states)
-                                flag_addqueue=True
-                            accesible_states.add(next_state)
-        
-        accesible_states_list = sorted(list(accesible_states), key=cmp_to_key(comp))
-
-        ############################### CLASES DE EQUIVALENCIA #########################################
-        
-        # Usamos una matriz para guardar las clases de equivalencia: fila 0 -> estados, fila 1 -> clases de equivalencia (1º Iteración)
-        matrix = [list(state for state in accesible_states_list)]                      # Primera fila 
-        matrix.append([1 if state.is_final else 0 for state in accesible_states_list]) # Segunda fila 
-        # Recorremos la tabla de izqda a dcha y asignamos la clase 0 al primer estado sin clase de equivalencia 
-        matrix.append([None] * len(matrix[0])) # Añadimos una fila vacia para las iteraciones 
-        #import pdb; pdb.set_trace() 
-        while True:
-            counter_classes = 0
-            
-            for j in range(len(accesible_states_list)):  
-                # 1º Iteracion -> Asdignamos la clase 0 al primer estado sin clase de equivalencia
-                if matrix[2][j] == None: 
-                    matrix[2][j] = counter_classes
-                    counter_classes += 1
-
-                    # Comparamos las transiciones 
-                    for i in range(1, len(accesible_states_list)):
-                        same_class = True # Flag para saber si todos los estados de la clase son equivalentes
-                        # 1º Requisito -> El estado siguiente no puede tener clase de equivalencia asignada 
-                        if matrix[2][i] == None: 
-                            # 2º Requisito -> La clase de equivalencia en la iteracion anterior dene ser igual
-                            if matrix[1][i] == matrix[1][j]:
-                                for symbol in dfa.symbols: 
-                                    # 3º requisito -> Las transiciones deben ser equivalentes 
-                                    previous.current_states = {accesible_states_list[j]}
-                                    evaluator.current_states = {accesible_states_list[i]}
-                                    # Obtenemos transiciones 
-                                    previous.process_symbol(symbol)
-                                    evaluator.process_symbol(symbol)
-                                    # Obtenemos el estado (sin conjunto)
-                                    previous_state = previous.current_states.pop()
-                                    actual_state = evaluator.current_states.pop()
-                                    # Verificamos si las clases coniciden 
-                                    if matrix[1][accesible_states_list.index(previous_state)] != matrix[1][accesible_states_list.index(actual_state)]:
-                                        same_class = False
-                                        break
-                                    
-                                # Si cumple los 3 requisitos => son equivalentes => asignamos la misma clase de equivalencia
-                                if same_class:
-                                    matrix[2][i] = matrix[2][j]
-            
-            # CONDICION DE PARADA DEL ALGORITMO => si las filas son iguales, paramos
-            if matrix[1] == matrix[2]:
-                break
-            else: 
-                # Si no, la 3º fila se convierte en la segunda 
-                for i in range(len(accesible_states_list)):
-                    matrix[1][i] = matrix[2][i]
-                    matrix[2][i] = None
+        from automata.compiled import CompiledAutomaton
+
+        compiled = CompiledAutomaton(dfa)
+        if compiled.deterministic_table is None:
+            raise ValueError("The automaton is not deterministic")
+        deterministic_table = compiled.deterministic_table
+        n_classes = compiled.n_classes
+
+        # Estados accesibles (BFS sobre la tabla), el inicial es el 0
+        reachable = list(compiled.initial)
+        reachable_ids = {reachable[0]: 0}
+        i = 0
+        while i < len(reachable):
+            for next_state in deterministic_table[reachable[i] * n_classes:(reachable[i] + 1) * n_classes]:
+                if next_state not in reachable_ids:
+                    reachable_ids[next_state] = len(reachable)
+                    reachable.append(next_state)
+            i += 1
+
+        # Las transiciones que faltan (-1) van a un sumidero implicito
+        sink = reachable_ids.get(-1)
+        if sink is not None:
+            reachable[sink] = None
+        table = array("i", [
+            reachable_ids[next_state] if state is not None else sink
+            for state in reachable
+            for next_state in (
+                deterministic_table[state * n_classes:(state + 1) * n_classes]
+                if state is not None else [-1] * n_classes
+            )
+        ])
+        labels = [state is not None and state in compiled.finals for state in reachable]
+
+        block_ids, minimized_table = minimize_table(table, n_classes, labels)
 
         ############################# CONSTRUCCION DEL AUTOMATA MINIMIZADO ############################# 
-        # Estados 
-        first_row = [matrix[1][i] for i in range(len(matrix[0]))]
-        first_row.sort(reverse=True) # Ordenamos la primera lista de mayor a menor (decreciente)
-        new_states_tam = int(first_row[0]) + 1 # Numero de estados del automata minimizado
-
+        new_states_tam = max(block_ids) + 1
         new_minimized_states = [set() for i in range(new_states_tam)] 
-        for i in range(len(accesible_states_list)):
-            new_minimized_states[matrix[1][i]].add(accesible_states_list[i])
-        final_minimized_states = set() 
-
-        # Transiciones 
-        transitions_dict = dict()
-        for i in range(new_states_tam):
-            # Creamos el estado
-            state = state_create(new_minimized_states[i]) 
-            final_minimized_states.add(state)
-
-            transitions_dict[state] = dict()
-            for symbol in dfa.symbols: 
-                # Averiguamos todas las transiciones 
-                evaluator.current_states = new_minimized_states[i]
-                evaluator.process_symbol(symbol)
-                transitions_dict[state][symbol] = set()
-
-                # Si no esta en el set de estados 
-                if evaluator.current_states not in new_minimized_states:
-                    # Averiguamos el estado solo 
-                    current_state = evaluator.current_states.pop()
-                    evaluator.current_states = new_minimized_states[matrix[1][accesible_states_list.index(current_state)]]
-
-                # Añadimos el estado 
-                transitions_dict[state][symbol].add(state_create(evaluator.current_states)) 
-        
-        transitions = Transitions(transitions_dict)
+        for state, block in zip(reachable, block_ids):
+            if state is not None:
+                new_minimized_states[block].add(compiled.states[state])
+
+        # Un bloque vacio solo contiene el sumidero implicito: no se crea
+        names = StateNames(block_name)
+        minimized_states = [
+            names.add(DerivedState(block, states, any(state.is_final for state in states), namer=names))
+            if states else None
+            for block, states in enumerate(new_minimized_states)
+        ]
 
-        minimized_automaton = FiniteAutomaton(state_create(new_minimized_states[0]), 
-                                              final_minimized_states, 
+        transitions = Transitions()
+        for block, state in enumerate(minimized_states):
+            if state is None:
+                continue
+            for class_id, class_symbols in enumerate(compiled.classes):
+                next_state = minimized_states[minimized_table[block * n_classes + class_id]]
+                if next_state is None:
+                    continue
+                for symbol in class_symbols:
+                    transitions.add_transition(state, symbol, next_state)
+
+        minimized_automaton = FiniteAutomaton(minimized_states[0], 
+                                              [state for state in minimized_states if state is not None], 
                                               dfa.symbols, 
                                               transitions)
-        
-        return minimized_automaton 
-    
-        
 
+        hooks = get_hooks()
+        if hooks is not None:
+            hooks.trace("dfa.to_minimized", dfa_states=len(dfa.states), minimized_states=len(minimized_automaton.states))
         
+        return minimized_automaton
 
-           
-    
-        
+    @staticmethod
+    def to_minimized_partial(dfa):
+        """
+        Return the minimal partial DFA of a (partial or complete) DFA.
+
+        It uses ``minimize_partial`` (Valmari and Lehtinen), which only
+        works over the transitions that exist (no dense table is built).
+        Dead states, such as the ``empty`` sink, are removed: missing
+        transitions reject.
 
+        Returns:
+            Equivalent minimal partial automaton.
+        """
+        from automata.partial_dfa import minimize_partial
+
+        # Ids de los estados y transiciones existentes (sin tabla densa)
+        states = list(dfa.states)
+        state_ids = {state: i for i, state in enumerate(states)}
+        transitions = []
+        for (start_state, symbol, end_state) in dfa.get_all_transitions():
+            for state in (start_state, end_state):
+                if state not in state_ids:
+                    state_ids[state] = len(states)
+                    states.append(state)
+            transitions.append((state_ids[start_state], symbol, state_ids[end_state]))
+        if len({(start, symbol) for start, symbol, _ in transitions}) != len(transitions) or any(
+            symbol is None for _, symbol, _ in transitions
+        ):
+            raise ValueError("The automaton is not deterministic")
+
+        initial = state_ids[dfa.initial_state]
+        finals = [i for i, state in enumerate(states) if state.is_final]
+        block_ids, minimized_transitions = minimize_partial(len(states), transitions, finals, initial)
+
+        # Lenguaje vacio: solo el estado inicial, sin transiciones
+        if block_ids[initial] == -1:
+            state = State(dfa.initial_state.name, False)
+            return FiniteAutomaton(state, [state], dfa.symbols, Transitions())
+
+        new_minimized_states = [set() for _ in range(max(block_ids) + 1)]
+        for state, block in zip(states, block_ids):
+            if block != -1:
+                new_minimized_states[block].add(state)
+        names = StateNames(block_name)
+        minimized_states = [
+            names.add(DerivedState(
+                block, block_states, any(state.is_final for state in block_states), namer=names,
+            ))
+            for block, block_states in enumerate(new_minimized_states)
+        ]
+
+        transitions = Transitions()
+        for block, symbol, next_block in minimized_transitions:
+            transitions.add_transition(minimized_states[block], symbol, minimized_states[next_block])
 
-     
\ No newline at end of file
+        return FiniteAutomaton(minimized_states[0], minimized_states, dfa.symbols, transitions)
+
+    @staticmethod
+    def to_minimized_brzozowski(automaton):
+        """
+        Return the minimal DFA of any automaton, with Brzozowski's algorithm.
+
+        It works directly on NFAs (e.g. from ``REParser``), without the
+        ``to_deterministic`` + ``to_minimized`` round trip. States are named
+        ``q0``, ``q1``... in breadth-first order (``q0`` is the initial one)
+        and the dead state, if any, is ``empty``.
+
+        Returns:
+            Equivalent minimal complete DFA.
+        """
+        from automata.compiled import CompiledAutomaton
+
+        return _brzozowski_automaton(CompiledAutomaton(automaton))
+
+    @staticmethod
+    def minimize(automaton, method="auto"):
+        """
+        Return the minimal DFA of any automaton.
+
+        Args:
+            automaton: Automaton to minimize, deterministic or not.
+            method: ``"hopcroft"`` (``to_deterministic`` and then
+                ``to_minimized``), ``"brzozowski"`` (``to_minimized_brzozowski``),
+                ``"valmari"`` (a partial ``to_deterministic`` and then
+                ``to_minimized_partial``, giving a partial DFA) or ``"auto"``
+                to pick Hopcroft or Brzozowski with ``choose_minimization``
+                (the DFA built to choose is then reused).
+
+        Returns:
+            Equivalent minimal automaton.
+        """
+        from automata.compiled import CompiledAutomaton
+
+        compiled = None
+        probe = None
+        if method == "auto":
+            compiled = CompiledAutomaton(automaton)
+            method, probe = choose_minimization(compiled)
+
+        if method == "hopcroft":
+            if probe is None:
+                dfa = DeterministicFiniteAutomaton.to_deterministic(automaton)
+            else:
+                dfa = _deterministic_automaton(automaton, compiled, *probe)
+            return DeterministicFiniteAutomaton.to_minimized(dfa)
+        if method == "brzozowski":
+            if compiled is None:
+                compiled = CompiledAutomaton(automaton)
+            return _brzozowski_automaton(compiled, probe)
+        if method == "valmari":
+            dfa = DeterministicFiniteAutomaton.to_deterministic(automaton, complete=False)
+            return DeterministicFiniteAutomaton.to_minimized_partial(dfa)
+        raise ValueError(f"Unknown minimization method {method!r}")
\ No newline at end of file
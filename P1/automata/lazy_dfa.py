@@ -0,0 +1,220 @@
+"""On-the-fly determinization of automata (lazy DFA)."""
+from threading import Lock
+
+
+class _LazyState():
+    """
+    State of the lazy DFA.
+
+    Args:
+        subset: Ids of the NFA states it represents. Type: frozenset
+        n_classes: Number of symbol classes of the alphabet. Type: int
+        exit: Early exit flags: 1 if the state is a sink, 2 if its
+            acceptance is already decided. Type: int
+
+    """
+
+    __slots__ = ("subset", "next", "exit")
+
+    def __init__(self, subset, n_classes, exit=0):
+        self.subset = subset
+        self.next = [None] * n_classes
+        self.exit = exit
+
+
+class LazyDFA():
+    """
+    Deterministic automaton built only as the input reaches its states.
+
+    Every DFA state is a subset of states of the compiled automaton, obtained
+    with the same subset step used by ``to_deterministic`` (move + lambda
+    closure). States are cached together with the transitions already
+    computed. The cache never holds more than ``max_states`` states: when
+    it is full it is flushed. If the flushes come too often (fewer than
+    ``min_symbols_per_state`` symbols processed per cached state since the
+    previous flush) the cache is thrashing, and the call that caused the
+    flush finishes its input with plain NFA simulation. Later calls use the
+    DFA again, with a fresh budget, so one bad input does not slow down the
+    rest. Cache misses and the shared counters are serialized with a lock,
+    so several threads can run the same lazy DFA.
+
+    Args:
+        compiled: Compiled automaton to determinize. Type: CompiledAutomaton
+        max_states: Maximum number of DFA states kept in the cache. Type: int
+        min_symbols_per_state: Minimum symbols processed per cached state
+            between flushes before falling back to NFA simulation. Type: int
+
+    Attributes:
+        flushes: Number of times the cache has been flushed. Type: int
+        fallbacks: Number of calls that fell back to NFA simulation.
+            Type: int
+
+    """
+
+    def __init__(self, compiled, max_states=10000, min_symbols_per_state=10):
+        if max_states < 2:
+            raise ValueError("The lazy DFA needs room for at least 2 states")
+
+        self.compiled = compiled
+        self.initial = compiled.initial
+        self.max_states = max_states
+        self.min_symbols_per_state = min_symbols_per_state
+        self.flushes = 0
+        self.fallbacks = 0
+
+        self._cache = {}
+        self._symbols_since_flush = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def encode(self, states):
+        """Convert a collection of states into a frozenset of ids."""
+        return self.compiled.encode(states)
+
+    def decode(self, ids):
+        """Convert a collection of ids into a set of states."""
+        return self.compiled.decode(ids)
+
+    def is_accepting(self, current):
+        """Check if a set of state ids contains a final state."""
+        return self.compiled.is_accepting(current)
+
+    def is_dead(self, current):
+        """Check if no final state is reachable from a set of state ids."""
+        return self.compiled.is_dead(current)
+
+    def size(self, current):
+        """Number of states in a set of state ids."""
+        return len(current)
+
+    def _get_state(self, subset):
+        """
+        Return the cached DFA state of a subset, creating it if needed.
+
+        It must be called with the lock held. If the cache is full, it is
+        flushed before adding the new state.
+
+        Returns:
+            Tuple ``(state, thrashing)``; ``thrashing`` tells if a flush was
+            needed too soon after the previous one. Type: tuple
+
+        """
+        state = self._cache.get(subset)
+        thrashing = False
+        if state is None:
+            if len(self._cache) >= self.max_states:
+                thrashing = self._flush()
+            compiled = self.compiled
+            exit = (1 if compiled.is_sink(subset) else 0) | (2 if compiled.is_decided(subset) else 0)
+            state = _LazyState(subset, compiled.n_classes, exit)
+            self._cache[subset] = state
+        return state, thrashing
+
+    def _flush(self):
+        """Empty the cache, returning whether it is thrashing."""
+        # Se rompen los enlaces para liberar memoria; los hilos que aun usen
+        # un estado antiguo simplemente recalculan sus transiciones
+        n_classes = self.compiled.n_classes
+        for state in self._cache.values():
+            state.next = [None] * n_classes
+        self._cache.clear()
+        self.flushes += 1
+
+        thrashing = self._symbols_since_flush < self.min_symbols_per_state * self.max_states
+        self._symbols_since_flush = 0
+        return thrashing
+
+    def _transition(self, state, symbol_id, processed):
+        """
+        Compute (and cache) the transition of a DFA state.
+
+        Args:
+            state: DFA state. Type: _LazyState
+            symbol_id: Class of the symbol. Type: int
+            processed: Symbols processed by the caller since it last
+                reported them. Type: int
+
+        Returns:
+            Tuple ``(next_state, thrashing)`` (see ``_get_state``). Type: tuple
+
+        """
+        compiled = self.compiled
+        subset = compiled.closure(compiled.move(state.subset, symbol_id))
+
+        with self._lock:
+            self._symbols_since_flush += processed
+            next_state, thrashing = self._get_state(subset)
+            # Tras un vaciado el estado actual ya no esta en la cache: el enlace es inofensivo
+            state.next[symbol_id] = next_state
+
+        return next_state, thrashing
+
+    def step(self, current, symbol):
+        """
+        Consume one symbol from a set of state ids.
+
+        Args:
+            current: Ids of the current states. Type: frozenset
+            symbol: Symbol to consume. Type: str
+
+        Returns:
+            Ids of the states after consuming the symbol. Type: frozenset
+
+        """
+        return self.run(current, (symbol,))
+
+    def run(self, current, string, stop_when_decided=False):
+        """
+        Consume a full string from a set of state ids.
+
+        As in ``CompiledAutomaton.run``, the rest of the string is only
+        checked against the alphabet once the result cannot change (or its
+        acceptance cannot change, with ``stop_when_decided``).
+
+        Args:
+            current: Ids of the current states. Type: frozenset
+            string: String to consume. Type: str
+            stop_when_decided: Whether the caller only needs to know if the
+                string is accepted. Type: bool
+
+        Returns:
+            Ids of the states after consuming the string. Type: frozenset
+
+        """
+        symbol_ids = self.compiled.symbol_ids
+        exit_flags = 3 if stop_when_decided else 1
+        with self._lock:
+            state, _ = self._get_state(frozenset(current))
+        symbols = iter(string)
+        processed = 0
+
+        if state.exit & exit_flags:
+            self.compiled.check_symbols(symbols)
+            return state.subset
+
+        for symbol in symbols:
+            try:
+                symbol_id = symbol_ids[symbol]
+            except KeyError:
+                raise ValueError("The symbol is not in the alphabet of the automaton") from None
+
+            next_state = state.next[symbol_id]
+            if next_state is None:
+                next_state, thrashing = self._transition(state, symbol_id, processed)
+                processed = 0
+                if thrashing:
+                    # La cache no da abasto: esta llamada sigue simulando el AFN
+                    with self._lock:
+                        self.fallbacks += 1
+                    return self.compiled.run(next_state.subset, symbols, stop_when_decided)
+            state = next_state
+            processed += 1
+            if state.exit & exit_flags:
+                self.compiled.check_symbols(symbols)
+                break
+
+        with self._lock:
+            self._symbols_since_flush += processed
+        return state.subset
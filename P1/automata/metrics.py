@@ -0,0 +1,167 @@
+"""Opt-in instrumentation of evaluators and algorithms."""
+from collections import Counter, deque
+from contextlib import contextmanager
+import math
+
+# Hooks globales de los algoritmos (None: instrumentacion desactivada)
+_hooks = None
+
+# Valor por defecto de ``hooks`` en los evaluadores: usar los hooks globales
+DEFAULT_HOOKS = object()
+
+
+class Hooks():
+    """
+    Interface of the instrumentation hooks.
+
+    Every method does nothing; subclasses override the ones they need (e.g.
+    to forward the values to an external metrics system). Names are dotted
+    strings such as ``"evaluator.symbols"`` or ``"dfa.to_deterministic.states"``.
+
+    """
+
+    def count(self, name, value=1):
+        """
+        Add a value to a counter.
+
+        Args:
+            name: Name of the counter. Type: str
+            value: Amount to add. Type: int
+
+        """
+
+    def observe(self, name, value):
+        """
+        Record one observation of a histogram.
+
+        Args:
+            name: Name of the histogram. Type: str
+            value: Observed value (a size, a duration in seconds...). Type: float
+
+        """
+
+    def trace(self, event, **fields):
+        """
+        Report that an operation has finished.
+
+        Args:
+            event: Name of the operation. Type: str
+            fields: Details of the operation. Type: dict
+
+        """
+
+
+class Histogram():
+    """
+    Summary of the observations of a value.
+
+    Observations are grouped in power-of-two buckets: bucket ``b`` counts
+    the values in ``(b / 2, b]`` (bucket 0 counts the zeros).
+
+    Attributes:
+        count: Number of observations. Type: int
+        total: Sum of the observations. Type: float
+        min: Smallest observation. Type: float
+        max: Largest observation. Type: float
+        buckets: Number of observations in each bucket. Type: Counter
+
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = Counter()
+
+    def add(self, value):
+        """Record one observation."""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+        if value <= 0:
+            self.buckets[0] += 1
+        else:
+            mantissa, exponent = math.frexp(value)
+            # Las potencias exactas de 2 van a su propio cubo
+            self.buckets[2.0 ** (exponent - 1 if mantissa == 0.5 else exponent)] += 1
+
+    @property
+    def mean(self):
+        """Mean of the observations (``None`` if there are none)."""
+        return self.total / self.count if self.count else None
+
+
+class Metrics(Hooks):
+    """
+    Hooks that keep counters, histograms and recent events in memory.
+
+    Args:
+        max_events: Number of most recent events kept. Type: int
+
+    Attributes:
+        counters: Value of each counter. Type: Counter
+        histograms: Histogram of each name. Type: Dict[str, Histogram]
+        events: Most recent ``(event, fields)`` pairs. Type: deque
+
+    """
+
+    def __init__(self, max_events=1000):
+        self.counters = Counter()
+        self.histograms = {}
+        self.events = deque(maxlen=max_events)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def observe(self, name, value):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(value)
+
+    def trace(self, event, **fields):
+        self.events.append((event, fields))
+
+    @property
+    def closure_cache_hit_rate(self):
+        """Fraction of lambda closures served from the cache (``None`` if none)."""
+        hits = self.counters["evaluator.closure_cache.hits"]
+        total = hits + self.counters["evaluator.closure_cache.misses"]
+        return hits / total if total else None
+
+
+def get_hooks():
+    """Return the hooks of the algorithms, or ``None`` if disabled."""
+    return _hooks
+
+
+def set_hooks(hooks):
+    """
+    Set the hooks used by the algorithms and by new evaluators.
+
+    Args:
+        hooks: Hooks to call, or ``None`` to disable the instrumentation.
+            Type: Hooks
+
+    Returns:
+        The previous hooks. Type: Hooks
+
+    """
+    global _hooks
+    previous, _hooks = _hooks, hooks
+    return previous
+
+
+@contextmanager
+def use_hooks(hooks):
+    """Set the hooks inside a ``with`` block, restoring the previous ones."""
+    previous = set_hooks(hooks)
+    try:
+        yield hooks
+    finally:
+        set_hooks(previous)
@@ -0,0 +1,219 @@
+"""Parallel evaluation of automata over thread and process pools."""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+import os
+
+# Evaluador de cada proceso trabajador: se crea una sola vez por proceso
+_worker_evaluator = None
+# AFD (tabla, numero de simbolos, ids de simbolos) de cada proceso trabajador
+_worker_dfa = None
+
+
+def _init_worker(automaton, mode, current_states):
+    """Build the evaluator of a worker process."""
+    from automata.automaton_evaluator import FiniteAutomatonEvaluator
+    from automata.metrics import set_hooks
+
+    # Las metricas de un proceso hijo no llegan al padre: se desactivan
+    set_hooks(None)
+    global _worker_evaluator
+    _worker_evaluator = FiniteAutomatonEvaluator(automaton, mode=mode)
+    _worker_evaluator.current_states = current_states
+
+
+def _accepts_batch_worker(strings):
+    """Evaluate a batch of strings in a worker process."""
+    return [_worker_evaluator.accepts(string) for string in strings]
+
+
+def _init_dfa_worker(table, n_classes, symbol_ids):
+    """Store the DFA of a worker process."""
+    global _worker_dfa
+    _worker_dfa = (table, n_classes, symbol_ids)
+
+
+def chunk_mapping(table, n_classes, symbol_ids, chunk):
+    """
+    Compute the state-to-state mapping of a DFA over a chunk of input.
+
+    All the DFA states are simulated at once; states that reach the same
+    state are merged, so the work per symbol drops to one lookup as soon as
+    all of them converge.
+
+    Args:
+        table: Flat transition table of the DFA. Type: array
+        n_classes: Number of columns (symbol classes) of the table. Type: int
+        symbol_ids: Id of each symbol. Type: dict
+        chunk: Symbols to consume. Type: str
+
+    Returns:
+        ``mapping[s]`` is the state reached from ``s``. Type: List[int]
+
+    """
+    n_states = len(table) // n_classes if n_classes else 0
+    # active: estados distintos alcanzados; origin[s]: posicion en active
+    active = list(range(n_states))
+    origin = list(range(n_states))
+    symbols = iter(chunk)
+
+    for symbol in symbols:
+        if len(active) == 1:
+            break
+        try:
+            symbol_id = symbol_ids[symbol]
+        except KeyError:
+            raise ValueError("The symbol is not in the alphabet of the automaton") from None
+
+        next_active = [table[state * n_classes + symbol_id] for state in active]
+        if len(set(next_active)) == len(next_active):
+            active = next_active
+            continue
+
+        # Algunos estados convergen: se fusionan
+        positions = {}
+        active = []
+        remap = []
+        for state in next_active:
+            position = positions.get(state)
+            if position is None:
+                position = positions[state] = len(active)
+                active.append(state)
+            remap.append(position)
+        origin = [remap[position] for position in origin]
+    else:
+        return [active[position] for position in origin]
+
+    # Un unico estado activo: se sigue con un bucle simple
+    state = active[0]
+    for symbol in chain((symbol,), symbols):
+        try:
+            state = table[state * n_classes + symbol_ids[symbol]]
+        except KeyError:
+            raise ValueError("The symbol is not in the alphabet of the automaton") from None
+
+    return [state] * n_states
+
+
+def _chunk_mapping_worker(chunk):
+    """Compute the mapping of a chunk in a worker process."""
+    table, n_classes, symbol_ids = _worker_dfa
+    return chunk_mapping(table, n_classes, symbol_ids, chunk)
+
+
+def accepts_chunked(evaluator, string, workers=None, chunk_size=None):
+    """
+    Check if one huge string is accepted, splitting it across processes.
+
+    The automaton is determinized (from the current states of the
+    evaluator) and each worker computes the state-to-state mapping of its
+    chunk. The mappings are then composed in order, starting from the
+    initial DFA state, to obtain the final state. Chunks are sliced and
+    submitted as the results come back, with at most two per worker in
+    flight, so only a bounded part of the string is copied at a time.
+
+    Args:
+        evaluator: Evaluator whose current states are the starting point.
+            Type: FiniteAutomatonEvaluator
+        string: String to check. Type: str
+        workers: Number of worker processes. Defaults to the number of
+            CPUs. Type: int
+        chunk_size: Symbols per chunk. Defaults to an even split among the
+            workers. Type: int
+
+    Returns:
+        Whether the string is accepted. Type: bool
+
+    Raises:
+        ValueError: If the DFA has more than ``max_dfa_states`` states (see
+            ``FiniteAutomatonEvaluator``), or a symbol is not in the alphabet.
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(string) // workers))
+
+    compiled = evaluator.compiled
+    dfa = evaluator._dfa(evaluator.max_dfa_states)
+    if dfa is None:
+        raise ValueError(
+            f"The DFA of the automaton has more than {evaluator.max_dfa_states} states"
+        )
+    subsets, table = dfa
+    chunks = (string[i:i + chunk_size] for i in range(0, len(string), chunk_size))
+
+    state = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_dfa_worker,
+        initargs=(table, compiled.n_classes, compiled.symbol_ids),
+    ) as pool:
+        # Ventana de trozos en vuelo: se componen en orden segun se necesita sitio
+        in_flight = deque()
+        for chunk in chunks:
+            if len(in_flight) == 2 * workers:
+                state = in_flight.popleft().result()[state]
+            in_flight.append(pool.submit(_chunk_mapping_worker, chunk))
+        while in_flight:
+            state = in_flight.popleft().result()[state]
+
+    return compiled.is_accepting(subsets[state])
+
+
+def _batches(iterable, size):
+    """Split an iterable into lists of at most ``size`` elements."""
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def accepts_parallel(evaluator, strings, workers=None, executor="thread", batch_size=1024):
+    """
+    Check which strings are accepted, sharding them across a pool.
+
+    With ``executor="thread"`` every thread uses the re-entrant ``accepts``
+    of the same evaluator, which only reads its compiled automaton (this
+    scales on free-threaded Python builds). With ``executor="process"`` the
+    automaton is pickled once per worker process, not once per task.
+
+    Args:
+        evaluator: Evaluator whose current states are the starting point.
+            Type: FiniteAutomatonEvaluator
+        strings: Strings to check. Type: Iterable[str]
+        workers: Number of workers. Defaults to the number of CPUs. Type: int
+        executor: ``"thread"`` or ``"process"``. Type: str
+        batch_size: Number of strings per task. Type: int
+
+    Returns:
+        Whether each string is accepted, in input order. Type: List[bool]
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if executor == "thread":
+        accepts = evaluator.accepts
+
+        def accepts_batch(batch):
+            return [accepts(string) for string in batch]
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+    elif executor == "process":
+        accepts_batch = _accepts_batch_worker
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(evaluator.automaton, evaluator.mode, evaluator.current_states),
+        )
+    else:
+        raise ValueError(f"Unknown executor {executor!r}")
+
+    with pool:
+        results = []
+        for batch_results in pool.map(accepts_batch, _batches(strings, batch_size)):
+            results.extend(batch_results)
+
+    return results
@@ -0,0 +1,214 @@
+"""Minimization of partial DFAs over the transitions that exist."""
+
+
+class _RefinablePartition():
+    """
+    Partition of ``range(n)`` into sets that can only be split.
+
+    The elements of every set are contiguous in ``elements``, between
+    ``first[s]`` and ``past[s]``. Marked elements are moved to the front of
+    their set, and ``split`` turns the marked (or unmarked, whichever is
+    smaller) part of every touched set into a new set.
+
+    Args:
+        n: Number of elements. Type: int
+
+    """
+
+    def __init__(self, n):
+        self.n_sets = 1 if n else 0
+        self.elements = list(range(n))
+        self.location = list(range(n))
+        self.set_of = [0] * n
+        self.first = [0] * max(n, 1)
+        self.past = [0] * max(n, 1)
+        self.past[0] = n
+        self.marked = [0] * max(n, 1)
+        self.touched = []
+
+    def mark(self, e):
+        """Mark an element."""
+        elements = self.elements
+        location = self.location
+        s = self.set_of[e]
+        i = location[e]
+        j = self.first[s] + self.marked[s]
+        elements[i] = elements[j]
+        location[elements[i]] = i
+        elements[j] = e
+        location[e] = j
+        if not self.marked[s]:
+            self.touched.append(s)
+        self.marked[s] += 1
+
+    def split(self):
+        """Split every touched set into its marked and unmarked elements."""
+        first = self.first
+        past = self.past
+        marked = self.marked
+        while self.touched:
+            s = self.touched.pop()
+            j = first[s] + marked[s]
+            if j == past[s]:
+                marked[s] = 0
+                continue
+
+            # La parte mas pequeña pasa a ser un conjunto nuevo
+            z = self.n_sets
+            if marked[s] <= past[s] - j:
+                first[z] = first[s]
+                past[z] = first[s] = j
+            else:
+                past[z] = past[s]
+                first[z] = past[s] = j
+            for i in range(first[z], past[z]):
+                self.set_of[self.elements[i]] = z
+            marked[s] = marked[z] = 0
+            self.n_sets += 1
+
+
+def minimize_partial(n_states, transitions, finals, initial=0):
+    """
+    Minimize a partial DFA in O(m·log n) (Valmari and Lehtinen).
+
+    Missing transitions reject. The states that are not reachable from the
+    initial state, or from which no final state is reachable, are removed
+    (they would all be the implicit sink). Blocks of states and "cords" of
+    transitions with the same label are refined against each other, so the
+    work is proportional to the transitions that exist, not to
+    ``n_states * n_symbols``.
+
+    Args:
+        n_states: Number of states. Type: int
+        transitions: ``(source, label, target)`` of every transition, with
+            at most one target per source and label. Type: Iterable[tuple]
+        finals: Final states. Type: Iterable[int]
+        initial: Initial state. Type: int
+
+    Returns:
+        Tuple ``(block_ids, minimized_transitions)``. ``block_ids[s]`` is the
+        state of the minimal DFA that contains state ``s`` (-1 if it was
+        removed), the block of the initial state being 0, and
+        ``minimized_transitions`` lists the ``(source, label, target)``
+        transitions of the minimal DFA. Type: tuple
+
+    """
+    transitions = list(transitions)
+    tails = [t for t, _, _ in transitions]
+    labels = [label for _, label, _ in transitions]
+    heads = [h for _, _, h in transitions]
+
+    blocks = _RefinablePartition(n_states)
+    elements = blocks.elements
+    location = blocks.location
+    reached = 0
+
+    def reach(q):
+        nonlocal reached
+        i = location[q]
+        if i >= reached:
+            elements[i] = elements[reached]
+            location[elements[i]] = i
+            elements[reached] = q
+            location[q] = reached
+            reached += 1
+
+    def adjacency(keys):
+        """Transitions grouped by ``keys[t]``: those of ``q`` are ``order[start[q]:start[q + 1]]``."""
+        start = [0] * (n_states + 1)
+        for key in keys:
+            start[key] += 1
+        for q in range(n_states):
+            start[q + 1] += start[q]
+        order = [0] * len(keys)
+        for t in range(len(keys) - 1, -1, -1):
+            start[keys[t]] -= 1
+            order[start[keys[t]]] = t
+        return order, start
+
+    def remove_unreached(sources, targets):
+        """Keep the states reached from the marked ones, and their transitions."""
+        nonlocal reached, tails, labels, heads
+        order, start = adjacency(sources)
+        i = 0
+        while i < reached:
+            q = elements[i]
+            for j in range(start[q], start[q + 1]):
+                reach(targets[order[j]])
+            i += 1
+
+        kept = [t for t in range(len(tails)) if location[sources[t]] < reached]
+        tails = [tails[t] for t in kept]
+        labels = [labels[t] for t in kept]
+        heads = [heads[t] for t in kept]
+        blocks.past[0] = reached
+        reached = 0
+
+    # Estados accesibles desde el inicial
+    reach(initial)
+    remove_unreached(tails, heads)
+
+    # Estados desde los que se llega a un final (los finales quedan delante)
+    for q in set(finals):
+        if location[q] < blocks.past[0]:
+            reach(q)
+    n_finals = reached
+    remove_unreached(heads, tails)
+    n_kept = blocks.past[0]
+
+    if not n_kept or location[initial] >= n_kept:
+        return [-1] * n_states, []
+
+    # Particion inicial: finales y no finales
+    blocks.marked[0] = n_finals
+    blocks.touched.append(0)
+    blocks.split()
+
+    # Cuerdas: transiciones agrupadas por etiqueta
+    n_transitions = len(tails)
+    cords = _RefinablePartition(n_transitions)
+    if n_transitions:
+        cords.elements.sort(key=labels.__getitem__)
+        cords.n_sets = 0
+        label = labels[cords.elements[0]]
+        for i, t in enumerate(cords.elements):
+            if labels[t] != label:
+                label = labels[t]
+                cords.past[cords.n_sets] = i
+                cords.n_sets += 1
+                cords.first[cords.n_sets] = i
+            cords.set_of[t] = cords.n_sets
+            cords.location[t] = i
+        cords.past[cords.n_sets] = n_transitions
+        cords.n_sets += 1
+
+    # Refinamiento: cada cuerda separa bloques y cada bloque nuevo, cuerdas
+    order, start = adjacency(heads)
+    b = 1
+    c = 0
+    while c < cords.n_sets:
+        for i in range(cords.first[c], cords.past[c]):
+            blocks.mark(tails[cords.elements[i]])
+        blocks.split()
+        c += 1
+        while b < blocks.n_sets:
+            for i in range(blocks.first[b], blocks.past[b]):
+                q = elements[i]
+                for j in range(start[q], start[q + 1]):
+                    cords.mark(order[j])
+            cords.split()
+            b += 1
+
+    # Numeracion de los bloques: el del estado inicial es el 0
+    renumber = {blocks.set_of[initial]: 0}
+    block_ids = [-1] * n_states
+    for q in range(n_states):
+        if location[q] < n_kept:
+            block_ids[q] = renumber.setdefault(blocks.set_of[q], len(renumber))
+
+    minimized_transitions = sorted({
+        (block_ids[t], label, block_ids[h])
+        for t, label, h in zip(tails, labels, heads)
+    })
+
+    return block_ids, minimized_transitions
@@ -0,0 +1,158 @@
+"""Matching of many regular expressions in a single pass."""
+from automata.compiled import CompiledAutomaton
+from automata.dfa import minimize_table, subset_construction
+from automata.re_parser import REParser
+
+
+class _CompiledUnion():
+    """
+    Union of several compiled automata, with disjoint state ids.
+
+    The states of pattern ``p`` are shifted by ``offsets[p]``. The classes
+    of the union partition the symbols of all the patterns, so that two
+    symbols share a class only if they share a class in every pattern. It
+    offers the interface that ``subset_construction`` needs.
+
+    Args:
+        automata: Compiled automata to join. Type: List[CompiledAutomaton]
+
+    """
+
+    def __init__(self, automata):
+        self.offsets = []
+        self.owners = []
+        n_states = 0
+        for p, compiled in enumerate(automata):
+            self.offsets.append(n_states)
+            self.owners.extend([p] * compiled.n_states)
+            n_states += compiled.n_states
+
+        # Clase de la union: clase local en cada patron (None si no lo usa)
+        signatures = {}
+        self.symbol_ids = {}
+        for compiled in automata:
+            for symbol in compiled.symbols:
+                if symbol in self.symbol_ids:
+                    continue
+                signature = tuple(c.symbol_ids.get(symbol) for c in automata)
+                self.symbol_ids[symbol] = signatures.setdefault(signature, len(signatures))
+        self.n_classes = len(signatures)
+
+        empty = frozenset()
+        self.moves = [None] * (n_states * self.n_classes)
+        for signature, class_id in signatures.items():
+            for p, compiled in enumerate(automata):
+                offset = self.offsets[p]
+                local_class = signature[p]
+                for i in range(compiled.n_states):
+                    if local_class is None:
+                        moves = empty
+                    else:
+                        moves = frozenset(
+                            offset + j for j in compiled.moves[i * compiled.n_classes + local_class]
+                        )
+                    self.moves[(offset + i) * self.n_classes + class_id] = moves
+
+        self.closures = [
+            frozenset(self.offsets[p] + j for j in closure)
+            for p, compiled in enumerate(automata)
+            for closure in compiled.closures
+        ]
+        self.finals = frozenset(
+            self.offsets[p] + i
+            for p, compiled in enumerate(automata)
+            for i in compiled.finals
+        )
+        self.initial = frozenset().union(*[
+            frozenset(self.offsets[p] + i for i in compiled.initial)
+            for p, compiled in enumerate(automata)
+        ])
+
+    def closure(self, ids):
+        """Return the lambda closure of a set of ids."""
+        closures = self.closures
+        return frozenset().union(*[closures[i] for i in ids])
+
+    def move(self, current, symbol_id):
+        """Direct successors of a set of ids."""
+        moves = self.moves
+        n_classes = self.n_classes
+        return frozenset().union(*[moves[i * n_classes + symbol_id] for i in current])
+
+    def labels(self, subset):
+        """Ids of the patterns that have a final state in a subset."""
+        owners = self.owners
+        return frozenset(owners[i] for i in subset & self.finals)
+
+
+class PatternSet():
+    """
+    Set of regular expressions compiled into one labelled automaton.
+
+    The automata of all the patterns are joined into a single NFA, which is
+    determinized and minimized keeping, for every state, the set of
+    patterns it accepts (states with different sets are never merged). A
+    single pass over the input reports every matching pattern.
+
+    Args:
+        patterns: Regular expressions in Kleene notation. Type: List[str]
+
+    Attributes:
+        patterns: The regular expressions. Type: tuple
+        labels: Ids (positions in ``patterns``) of the patterns accepted in
+            each state of the minimal DFA. Type: tuple
+        table: Flat transition table of the minimal DFA. Type: array
+
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        union = _CompiledUnion([
+            CompiledAutomaton(REParser().create_automaton(pattern))
+            for pattern in self.patterns
+        ])
+        self.symbol_ids = union.symbol_ids
+        self.n_classes = union.n_classes
+
+        subsets, table = subset_construction(union)
+        subset_labels = [union.labels(subset) for subset in subsets]
+        block_ids, self.table = minimize_table(table, self.n_classes, subset_labels)
+
+        labels = [None] * (max(block_ids) + 1)
+        for block, label in zip(block_ids, subset_labels):
+            labels[block] = label
+        self.labels = tuple(labels)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def match(self, string):
+        """
+        Return the patterns that accept a whole string.
+
+        Symbols that no pattern uses make every pattern fail.
+
+        Args:
+            string: String to check. Type: str
+
+        Returns:
+            Ids (positions in ``patterns``) of the matching patterns.
+            Type: frozenset
+
+        """
+        symbol_ids = self.symbol_ids
+        n_classes = self.n_classes
+        table = self.table
+
+        state = 0
+        for symbol in string:
+            symbol_id = symbol_ids.get(symbol)
+            if symbol_id is None:
+                return frozenset()
+            state = table[state * n_classes + symbol_id]
+
+        return self.labels[state]
+
+    def matching_patterns(self, string):
+        """Return the regular expressions that accept a whole string."""
+        return [self.patterns[p] for p in sorted(self.match(string))]
@@ -0,0 +1,209 @@
+"""Lazy product constructions (intersection, difference...) of automata."""
+from collections import deque
+
+from automata.automaton import FiniteAutomaton, State, Transitions
+from automata.determinized_pair import DeterminizedPair
+from automata.metrics import get_hooks
+
+# Aceptacion de cada operacion segun la aceptacion de cada automata
+_OPERATIONS = {
+    "intersect": lambda accepts1, accepts2: accepts1 and accepts2,
+    "difference": lambda accepts1, accepts2: accepts1 and not accepts2,
+    "symmetric_difference": lambda accepts1, accepts2: accepts1 != accepts2,
+    "complement": lambda accepts1, accepts2: not accepts1,
+}
+
+
+class _Product():
+    """
+    Exploration of the pairs of states reachable from the initial pair.
+
+    A pair is dead when no string can make it accepting: since a side is 0
+    once it can no longer accept, that only depends on the operation and
+    on which sides are 0. All the dead pairs are merged into one sink.
+
+    Args:
+        automaton1: First automaton. Type: FiniteAutomaton
+        automaton2: Second automaton. Type: FiniteAutomaton
+        operation: Name of the operation (a key of ``_OPERATIONS``). Type: str
+
+    """
+
+    def __init__(self, automaton1, automaton2, operation):
+        try:
+            self.accept = _OPERATIONS[operation]
+        except KeyError:
+            raise ValueError(f"Unknown operation {operation!r}") from None
+        self.operation = operation
+        self.pairs = DeterminizedPair(automaton1, automaton2)
+
+    def is_accepting(self, pair):
+        return pair is not None and self.accept(*self.pairs.accepts(pair))
+
+    def normalize(self, pair):
+        """The pair itself, or ``None`` (the sink) if it is dead."""
+        outcomes1 = (False, True) if pair[0] else (False,)
+        outcomes2 = (False, True) if pair[1] else (False,)
+        if any(self.accept(a, b) for a in outcomes1 for b in outcomes2):
+            return pair
+        return None
+
+    def explore(self, stop_when_accepting=False):
+        """
+        Breadth-first exploration of the product.
+
+        Args:
+            stop_when_accepting: Stop at the first accepting pair. Type: bool
+
+        Returns:
+            Tuple ``(pairs, table, parents)``: the pairs reached, indexed by
+            id (0 is the initial one, ``None`` the sink), the flat
+            transition table indexed by ``pair_id * n_classes + class_id``
+            and, for each pair, ``(parent_id, symbol)`` of its first
+            discovery. Type: tuple
+
+        """
+        classes = self.pairs.classes
+        initial = self.normalize(self.pairs.initial_pair())
+        pairs = [initial]
+        pair_ids = {initial: 0}
+        parents = [None]
+        table = []
+
+        # La lista de pares hace de cola (BFS)
+        i = 0
+        while i < len(pairs):
+            pair = pairs[i]
+            if stop_when_accepting and self.is_accepting(pair):
+                break
+            for key, symbol in classes:
+                new_pair = None if pair is None else self.normalize(self.pairs.step(pair, key))
+                new_id = pair_ids.get(new_pair)
+                if new_id is None:
+                    new_id = pair_ids[new_pair] = len(pairs)
+                    pairs.append(new_pair)
+                    parents.append((i, symbol))
+                table.append(new_id)
+            i += 1
+
+        return pairs, table, parents
+
+
+def product(automaton1, automaton2, operation):
+    """
+    Build the DFA of a boolean combination of two automata.
+
+    Only the pairs of states reachable from the pair of initial states
+    are built (both automata are determinized as they are explored), and
+    the pairs that can no longer accept are merged into one ``empty``
+    sink. Other states are named ``q0``, ``q1``... in breadth-first order.
+
+    Args:
+        automaton1: First automaton (deterministic or not). Type: FiniteAutomaton
+        automaton2: Second automaton (deterministic or not). Type: FiniteAutomaton
+        operation: ``"intersect"``, ``"difference"`` (strings of the first
+            not in the second), ``"symmetric_difference"`` or
+            ``"complement"`` (strings of the common alphabet not in the
+            first). Type: str
+
+    Returns:
+        Complete DFA over the symbols of both automata. Type: FiniteAutomaton
+
+    """
+    explored = _Product(automaton1, automaton2, operation)
+    pairs, table, _ = explored.explore()
+    classes = explored.pairs.classes
+    n_classes = len(classes)
+
+    states = [
+        State("empty" if pair is None else f"q{i}", explored.is_accepting(pair))
+        for i, pair in enumerate(pairs)
+    ]
+    transitions = Transitions()
+    for i, state in enumerate(states):
+        for class_id, (key, _) in enumerate(classes):
+            next_state = states[table[i * n_classes + class_id]]
+            for symbol in explored.pairs.class_symbols[key]:
+                transitions.add_transition(state, symbol, next_state)
+
+    hooks = get_hooks()
+    if hooks is not None:
+        hooks.observe(f"product.{operation}.states", len(states))
+
+    symbols = [symbol for key, _ in classes for symbol in explored.pairs.class_symbols[key]]
+    return FiniteAutomaton(states[0], states, symbols, transitions)
+
+
+def shortest_string(automaton1, automaton2, operation):
+    """
+    Return a shortest string accepted by a combination of two automata.
+
+    The product is explored breadth-first and the search stops at the
+    first accepting pair, so a non-empty result is usually found without
+    building the whole product.
+
+    Args:
+        automaton1: First automaton. Type: FiniteAutomaton
+        automaton2: Second automaton. Type: FiniteAutomaton
+        operation: Operation, as in ``product``. Type: str
+
+    Returns:
+        A shortest accepted string, or ``None`` if the language is empty.
+        Type: str
+
+    """
+    explored = _Product(automaton1, automaton2, operation)
+    pairs, _, parents = explored.explore(stop_when_accepting=True)
+
+    for i, pair in enumerate(pairs):
+        if explored.is_accepting(pair):
+            symbols = deque()
+            while parents[i] is not None:
+                i, symbol = parents[i]
+                symbols.appendleft(symbol)
+            return "".join(symbols)
+
+    return None
+
+
+def is_empty(automaton1, automaton2, operation):
+    """Check if a combination of two automata accepts no string (see ``shortest_string``)."""
+    return shortest_string(automaton1, automaton2, operation) is None
+
+
+def _alphabet_automaton(symbols):
+    """Automaton accepting no string, with the given symbols."""
+    state = State("q0", False)
+    return FiniteAutomaton(state, [state], list(symbols), Transitions())
+
+
+def intersect(automaton1, automaton2):
+    """DFA of the strings accepted by both automata."""
+    return product(automaton1, automaton2, "intersect")
+
+
+def difference(automaton1, automaton2):
+    """DFA of the strings accepted by the first automaton and not by the second."""
+    return product(automaton1, automaton2, "difference")
+
+
+def symmetric_difference(automaton1, automaton2):
+    """DFA of the strings accepted by exactly one of the automata."""
+    return product(automaton1, automaton2, "symmetric_difference")
+
+
+def complement(automaton, symbols=None):
+    """
+    DFA of the strings not accepted by an automaton.
+
+    Args:
+        automaton: Automaton to complement. Type: FiniteAutomaton
+        symbols: Extra symbols of the alphabet of the complement (strings
+            with them are always accepted). Type: Iterable[str]
+
+    Returns:
+        Complete DFA over the symbols of the automaton and ``symbols``.
+        Type: FiniteAutomaton
+
+    """
+    return product(automaton, _alphabet_automaton(symbols or ()), "complement")
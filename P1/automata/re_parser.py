@@ -1,5 +1,6 @@
 """Conversion from regex to automata."""
 from automata.automaton import FiniteAutomaton, State, Transitions
+from automata.metrics import get_hooks
 from automata.utils import write_dot
 
 
@@ -271,6 +272,7 @@ class REParser():
         rpn_string = _re_to_rpn(re_string)
 
         stack = [] # list of FiniteAutomatons
+        hooks = get_hooks()
 
         self.state_counter = 0
         for x in rpn_string:
@@ -291,6 +293,12 @@ class REParser():
             else:
                 stack.append(self._create_automaton_symbol(x))
 
+            # Tamaño del automata tras cada combinador
+            if hooks is not None:
+                combinator = {"*": "star", "+": "union", ".": "concat", "λ": "lambda"}.get(x, "symbol")
+                hooks.observe(f"re_parser.{combinator}.states", len(stack[-1].states))
+                hooks.trace(f"re_parser.{combinator}", symbol=x, states=len(stack[-1].states))
+
         return stack.pop()
     
     
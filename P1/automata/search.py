@@ -0,0 +1,426 @@
+"""Unanchored search of the strings of a language inside a text."""
+from array import array
+from collections import deque
+from itertools import chain
+
+from automata.compiled import CompiledAutomaton
+from automata.dfa import subset_construction
+
+# Maximo de pasos memorizados por cada prefiltro (se vacian al llenarse)
+MAX_CACHED_STEPS = 10000
+
+
+def _coaccessible(table, n_columns, finals):
+    """Return which DFA states can reach a final state."""
+    n_states = len(finals)
+    predecessors = [[] for _ in range(n_states)]
+    for i in range(n_states):
+        for j in table[i * n_columns:(i + 1) * n_columns]:
+            predecessors[j].append(i)
+
+    alive = bytearray(finals)
+    pending = [i for i in range(n_states) if finals[i]]
+    while pending:
+        for i in predecessors[pending.pop()]:
+            if not alive[i]:
+                alive[i] = 1
+                pending.append(i)
+
+    return alive
+
+
+def _add_other_column(table, n_states, n_classes, other_state):
+    """Add a column for the symbols outside the alphabet to a flat table."""
+    extended = array("i")
+    for i in range(n_states):
+        extended.extend(table[i * n_classes:(i + 1) * n_classes])
+        extended.append(other_state)
+
+    return extended
+
+
+class _Thread():
+    """
+    Thread of the forward DFA followed by ``Searcher.finditer``.
+
+    A thread starts at a position of the text. When two threads reach the
+    same DFA state, the later one joins the earlier one (its ``parent``)
+    and shares its future from that ``position`` on.
+
+    Args:
+        last_end: Last position where the thread was in a final state, or
+            -1. Type: int
+
+    """
+
+    __slots__ = ("last_end", "live", "parent", "position", "root", "end")
+
+    def __init__(self, last_end):
+        self.last_end = last_end
+        self.live = True
+        self.parent = None
+        self.position = None
+        # Hilo por el que se sigue viviendo (comprimido al buscarlo)
+        self.root = None
+        # Final del match mas largo, una vez decidido
+        self.end = None
+
+    def join(self, leader, position):
+        """Follow another thread from a position on."""
+        self.live = False
+        self.parent = self.root = leader
+        self.position = position
+
+    def find_root(self):
+        """Return the thread this one still follows (itself if it never joined)."""
+        root = self
+        while root.root is not None:
+            root = root.root
+        thread = self
+        while thread.root is not None and thread.root is not root:
+            thread.root, thread = root, thread.root
+        return root
+
+    def longest_end(self):
+        """
+        End of the longest match of the thread.
+
+        Only valid once the thread it follows has died.
+        """
+        chain = []
+        thread = self
+        while thread.end is None and thread.parent is not None:
+            chain.append(thread)
+            thread = thread.parent
+        if thread.end is None:
+            thread.end = thread.last_end
+        end = thread.end
+        # El futuro compartido solo cuenta si tiene un final tras la union
+        for thread in reversed(chain):
+            end = thread.end = end if end >= thread.position else thread.last_end
+        return end
+
+
+class Searcher():
+    """
+    Leftmost-longest search of the matches of an automaton in a text.
+
+    The forward DFA of the language is built with ``subset_construction``
+    and the text is only read forwards, so the first match is found without
+    looking at the rest of the text:
+
+    - While no match is in progress, a prefilter runs the sets of states of
+      every thread on the DFA (an implicit ``Σ*`` prefix) until some match
+      ends, and a bounded backward pass from that end finds the leftmost
+      position whose thread is still alive there.
+    - From that position, ``finditer`` follows one thread per start in a
+      single forward pass until the matches are decided.
+
+    Symbols that are not in the alphabet cannot be part of a match.
+
+    Args:
+        automaton: Automaton whose language is searched. Type: FiniteAutomaton
+
+    """
+
+    def __init__(self, automaton):
+        compiled = CompiledAutomaton(automaton)
+        self.symbol_ids = compiled.symbol_ids
+        self.n_classes = compiled.n_classes
+
+        # AFD hacia delante (anclado); la columna extra lleva al sumidero
+        subsets, table = subset_construction(compiled)
+        if frozenset() not in subsets:
+            subsets.append(frozenset())
+            table.extend([len(subsets) - 1] * self.n_classes)
+        self.finals = bytearray(compiled.is_accepting(subset) for subset in subsets)
+        n_columns = self.n_classes + 1
+        self.table = _add_other_column(
+            table, len(subsets), self.n_classes, subsets.index(frozenset()),
+        )
+        self.alive = _coaccessible(self.table, n_columns, self.finals)
+        # starting[c]: si un hilo que empieza con la clase c sigue vivo
+        self.starting = bytearray(self.alive[self.table[c]] for c in range(n_columns))
+
+        # Transiciones inversas entre estados vivos, para la pasada hacia atras
+        self._predecessors = [[] for _ in range(len(subsets) * n_columns)]
+        for state in range(len(subsets)):
+            if self.alive[state]:
+                for c in range(n_columns):
+                    next_state = self.table[state * n_columns + c]
+                    if self.alive[next_state]:
+                        self._predecessors[next_state * n_columns + c].append(state)
+        self._alive_states = frozenset(
+            state for state in range(len(subsets)) if self.alive[state]
+        )
+        self._forward_steps = {}
+        self._backward_steps = {}
+
+    def _forward_step(self, subset, symbol_id):
+        """States of the threads after a symbol, with a new thread at state 0."""
+        table = self.table
+        alive = self.alive
+        n_columns = self.n_classes + 1
+
+        states = {0}
+        for state in subset:
+            next_state = table[state * n_columns + symbol_id]
+            if alive[next_state]:
+                states.add(next_state)
+
+        step = (frozenset(states), any(self.finals[state] for state in states))
+        if len(self._forward_steps) >= MAX_CACHED_STEPS:
+            self._forward_steps.clear()
+        self._forward_steps[(subset, symbol_id)] = step
+        return step
+
+    def _backward_step(self, subset, symbol_id):
+        """States that go to ``subset`` with a symbol, and if 0 is one of them."""
+        predecessors = self._predecessors
+        n_columns = self.n_classes + 1
+
+        states = frozenset(chain.from_iterable(
+            predecessors[state * n_columns + symbol_id] for state in subset
+        ))
+
+        step = (states, 0 in states)
+        if len(self._backward_steps) >= MAX_CACHED_STEPS:
+            self._backward_steps.clear()
+        self._backward_steps[(subset, symbol_id)] = step
+        return step
+
+    def next_start(self, text, position=0, symbol_ids=None):
+        """
+        Return a lower bound of the start of the next match.
+
+        A forward pass finds the first position where some match starting
+        at ``position`` or later ends (the set of DFA states of the threads
+        always has state 0, for the thread that starts at each position). Every such match is still alive
+        there, so a backward pass from that end, which stops as soon as no
+        DFA state can lead to it, finds the leftmost position whose thread
+        is alive at it. No match starts before it.
+
+        Args:
+            text: Text to search. Type: str
+            position: Position where the search starts. Type: int
+            symbol_ids: Id of each element of the text, if it is not a
+                string (e.g. one entry per byte value). Type: dict
+
+        Returns:
+            Leftmost position where a match can start, or -1 if there are no
+            more matches. Type: int
+
+        """
+        if symbol_ids is None:
+            symbol_ids = self.symbol_ids
+        if self.finals[0]:
+            return position
+        if not self.alive[0]:
+            return -1
+        other = self.n_classes
+
+        starting = self.starting
+        n = len(text)
+
+        steps = self._forward_steps
+        subset = frozenset((0,))
+        i = position
+        while True:
+            if len(subset) == 1:
+                # Sin hilos vivos se saltan los simbolos con los que no empieza ningun match
+                while i < n and not starting[symbol_ids.get(text[i], other)]:
+                    i += 1
+            if i == n:
+                return -1
+            symbol_id = symbol_ids.get(text[i], other)
+            step = steps.get((subset, symbol_id)) or self._forward_step(subset, symbol_id)
+            subset, accepting = step
+            i += 1
+            if accepting:
+                break
+
+        steps = self._backward_steps
+        subset = self._alive_states
+        start = i
+        while i > position:
+            i -= 1
+            symbol_id = symbol_ids.get(text[i], other)
+            step = steps.get((subset, symbol_id)) or self._backward_step(subset, symbol_id)
+            subset, has_initial = step
+            if not subset:
+                break
+            if has_initial:
+                start = i
+
+        return start
+
+    def longest_match(self, text, start, symbol_ids=None):
+        """
+        Return the end of the longest match starting at a position.
+
+        Args:
+            text: Text to search. Type: str
+            start: Position where the match starts. Type: int
+            symbol_ids: Id of each element of the text. Type: dict
+
+        Returns:
+            End of the longest match, or -1 if there is none. Type: int
+
+        """
+        if symbol_ids is None:
+            symbol_ids = self.symbol_ids
+        other = self.n_classes
+        n_columns = self.n_classes + 1
+        table = self.table
+        finals = self.finals
+        alive = self.alive
+
+        state = 0
+        end = start if finals[state] else -1
+        for i in range(start, len(text)):
+            state = table[state * n_columns + symbol_ids.get(text[i], other)]
+            if not alive[state]:
+                break
+            if finals[state]:
+                end = i + 1
+
+        return end
+
+    def finditer(self, text, symbol_ids=None):
+        """
+        Yield the non-overlapping leftmost-longest matches in a text.
+
+        From the position given by ``next_start``, a thread of the forward
+        DFA starts at every position whose first symbol does not kill it.
+        Two threads that reach the same state at the same position share
+        their future, so the later one just follows the earlier one from
+        there: there are never more threads than DFA states, and the time is
+        O(len(text) · n_states) however long the matches are. A match is
+        yielded as soon as its thread dies or the text ends, and a start is
+        forgotten once its match is yielded or discarded (or as soon as it
+        follows the thread of the leftmost pending start without a match of
+        its own, as it could only be inside that match). The memory is
+        bounded by the DFA states plus the starts whose match is still
+        undecided, not by the length of the text.
+
+        Args:
+            text: Text to search. Type: str
+            symbol_ids: Id of each element of the text, if it is not a
+                string (e.g. one entry per byte value). Type: dict
+
+        Yields:
+            ``(start, end)`` of every match, so that ``text[start:end]`` is
+            in the language. Type: tuple
+
+        """
+        if symbol_ids is None:
+            symbol_ids = self.symbol_ids
+        other = self.n_classes
+        n_columns = self.n_classes + 1
+        table = self.table
+        finals = self.finals
+        alive = self.alive
+        starting = self.starting
+        initial_final = finals[0]
+        n = len(text)
+
+        # Hilos (estado, hilo) ordenados por inicio; inicios (inicio, hilo) pendientes
+        threads = []
+        pending = deque()
+        symbol_id = None
+        done = False
+        i = 0
+        while True:
+            # El inicio pendiente mas a la izquierda sin hilo vivo ya tiene su match
+            while pending:
+                start, thread = pending[0]
+                if thread.find_root().live:
+                    break
+                pending.popleft()
+                end = thread.longest_end()
+                if end == -1:
+                    continue
+                yield (start, end)
+                # Se descartan los inicios dentro del match
+                while pending and pending[0][0] < end:
+                    pending.popleft()
+            if done:
+                return
+
+            if not threads:
+                # Sin hilos vivos se salta hasta donde puede empezar el siguiente match
+                i = self.next_start(text, i, symbol_ids)
+                if i == -1:
+                    return
+                symbol_id = None
+
+            # Nace un hilo en i si puede llegar a aceptar
+            if i < n and symbol_id is None:
+                symbol_id = symbol_ids.get(text[i], other)
+            if initial_final or (i < n and starting[symbol_id]):
+                thread = _Thread(i if initial_final else -1)
+                leader = next((held for state, held in threads if state == 0), None)
+                if leader is None:
+                    threads.append((0, thread))
+                    pending.append((i, thread))
+                else:
+                    thread.join(leader, i)
+                    if initial_final or not pending or pending[0][1] is not leader:
+                        pending.append((i, thread))
+
+            if i == n:
+                for _, thread in threads:
+                    thread.live = False
+                threads = []
+                done = True
+                continue
+
+            if len(threads) == 1 and not initial_final:
+                # Un solo hilo: se avanza sin mas comprobaciones hasta el siguiente nacimiento
+                state, thread = threads[0]
+                end = thread.last_end
+                while True:
+                    state = table[state * n_columns + symbol_id]
+                    i += 1
+                    symbol_id = None
+                    if not alive[state]:
+                        break
+                    if finals[state]:
+                        end = i
+                    if i == n:
+                        break
+                    symbol_id = symbol_ids.get(text[i], other)
+                    if starting[symbol_id]:
+                        break
+                thread.last_end = end
+                if alive[state]:
+                    threads = [(state, thread)]
+                else:
+                    thread.live = False
+                    threads = []
+                continue
+
+            advanced = []
+            leaders = {}
+            dropped = []
+            for state, thread in threads:
+                state = table[state * n_columns + symbol_id]
+                if not alive[state]:
+                    thread.live = False
+                    continue
+                if finals[state]:
+                    thread.last_end = i + 1
+                leader = leaders.get(state)
+                if leader is None:
+                    leaders[state] = thread
+                    advanced.append((state, thread))
+                else:
+                    thread.join(leader, i + 1)
+                    # Sin match propio, su match solo podria estar dentro del del inicio pendiente
+                    if thread.last_end == -1 and pending and pending[0][1] is leader:
+                        dropped.append(thread)
+            threads = advanced
+            while dropped and pending and pending[-1][1] in dropped:
+                dropped.remove(pending.pop()[1])
+            i += 1
+            symbol_id = None
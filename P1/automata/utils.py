@@ -1,11 +1,16 @@
 """General utilities to work with automatas."""
+from importlib.util import MAGIC_NUMBER
+import marshal
+import os
 import re
+import tempfile
 # from collections import defaultdict, deque
 # from typing import DefaultDict, Dict, Mapping, Optional, Set
 
 from typing_extensions import Final
 
 import automata.automaton as aut
+from automata.determinized_pair import DeterminizedPair
 from collections import deque, defaultdict
 
 
@@ -114,6 +119,54 @@ class AutomataFormat():
         )
 
 
+def default_cache_dir():
+    """
+    Directory where compiled artifacts are cached on disk.
+
+    It is ``$AUTOMATA_CACHE_DIR`` if set, ``~/.cache/automata`` otherwise.
+    """
+    return os.environ.get("AUTOMATA_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "automata",
+    )
+
+
+def load_marshalled(path):
+    """
+    Load a value written by ``store_marshalled``.
+
+    Returns:
+        The value, or ``None`` if the file is missing, corrupt or written
+        by another version of the interpreter.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+                return None
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def store_marshalled(path, value):
+    """
+    Write a value (e.g. a code object) to a disk cache atomically.
+
+    Errors are ignored: a value that could not be written is just
+    recomputed next time.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC_NUMBER)
+            marshal.dump(value, f)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def write_dot(automaton):
     """
     Write a dot representation of the automaton.
@@ -153,6 +206,55 @@ def write_dot(automaton):
     )
 
 
+def reverse_automaton(automaton):
+    """
+    Build an automaton that accepts the reversal of a language.
+
+    Every transition is reversed, the initial state becomes the only final
+    state and a new initial state reaches the old final states with lambda
+    transitions.
+
+    Args:
+        automaton: Automaton to reverse.
+
+    Returns:
+        Automaton accepting the reversed strings. Type: FiniteAutomaton
+
+    """
+    states = list(automaton.states)
+    for (start_state, _, end_state) in automaton.get_all_transitions():
+        for state in (start_state, end_state):
+            if state not in states:
+                states.append(state)
+
+    names = {state.name for state in states}
+    initial_name = "reversed"
+    while initial_name in names:
+        initial_name += "_"
+
+    reversed_states = {
+        state: aut.State(state.name, is_final=state == automaton.initial_state)
+        for state in states
+    }
+    initial_state = aut.State(initial_name, is_final=False)
+
+    transitions = aut.Transitions()
+    for state in states:
+        if state.is_final:
+            transitions.add_transition(initial_state, None, reversed_states[state])
+    for (start_state, symbol, end_state) in automaton.get_all_transitions():
+        transitions.add_transition(
+            reversed_states[end_state], symbol, reversed_states[start_state],
+        )
+
+    return aut.FiniteAutomaton(
+        initial_state=initial_state,
+        states=[initial_state] + list(reversed_states.values()),
+        symbols=list(automaton.symbols),
+        transitions=transitions,
+    )
+
+
 def is_deterministic(
     automaton,
 ):
@@ -234,4 +336,129 @@ def deterministic_automata_isomorphism(automaton1, automaton2):
 
                 pending.appendleft((final1, final2))
 
-    return equiv_map
\ No newline at end of file
+    return equiv_map
+
+class Comparison():
+    """
+    Result of comparing the languages of two automata.
+
+    It is truthy when the comparison holds. Otherwise ``counterexample`` is
+    a shortest string that proves it wrong.
+
+    Attributes:
+        holds: Whether the comparison holds. Type: bool
+        counterexample: String that proves it wrong, ``None`` if it holds.
+            Type: str
+
+    """
+
+    def __init__(self, counterexample=None):
+        self.holds = counterexample is None
+        self.counterexample = counterexample
+
+    def __bool__(self):
+        return self.holds
+
+    def __repr__(self):
+        return f"{type(self).__name__}(counterexample={self.counterexample!r})"
+
+
+def _hopcroft_karp(product, pair1, pair2):
+    """
+    Check if two states of a ``DeterminizedPair`` accept the same strings.
+
+    Pairs are merged with a union-find structure (Hopcroft and Karp): a
+    pair of states already known to be equivalent, directly or by
+    transitivity, is not explored again, so the work is almost linear in
+    the number of states reached. The exploration is breadth-first, so the
+    counterexample found is a shortest one.
+
+    Returns:
+        ``None`` if both states are equivalent, a string accepted by only
+        one of them otherwise.
+    """
+    parent = {}
+    size = {}
+
+    def find(x):
+        root = x
+        while parent.get(root, root) != root:
+            root = parent[root]
+        # Compresion de caminos
+        while x != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(x, y):
+        x, y = find(x), find(y)
+        if x == y:
+            return False
+        if size.get(x, 1) < size.get(y, 1):
+            x, y = y, x
+        parent[y] = x
+        size[x] = size.get(x, 1) + size.get(y, 1)
+        return True
+
+    union(pair1, pair2)
+    # Cada entrada guarda la palabra como (entrada anterior, simbolo)
+    pending = deque([(pair1, pair2, None)])
+    while pending:
+        x, y, word = pending.popleft()
+        if product.is_accepting(x) != product.is_accepting(y):
+            symbols = []
+            while word is not None:
+                word, symbol = word
+                symbols.append(symbol)
+            return "".join(reversed(symbols))
+
+        for (class1, class2), symbol in product.classes:
+            next_x = (product.successor(0, x[0], class1), product.successor(1, x[1], class2))
+            next_y = (product.successor(0, y[0], class1), product.successor(1, y[1], class2))
+            if union(next_x, next_y):
+                pending.append((next_x, next_y, (word, symbol)))
+
+    return None
+
+
+def equivalent(automaton1, automaton2):
+    """
+    Check if two automata accept the same language.
+
+    Both automata may be NFAs (e.g. from ``REParser``): they are only
+    determinized as far as the comparison needs (Hopcroft and Karp's
+    algorithm), without minimizing them.
+
+    Args:
+        automaton1: First automaton. Type: FiniteAutomaton
+        automaton2: Second automaton. Type: FiniteAutomaton
+
+    Returns:
+        Result of the comparison, with a string accepted by only one of the
+        automata if they are not equivalent. Type: Comparison
+
+    """
+    product = DeterminizedPair(automaton1, automaton2)
+    return Comparison(_hopcroft_karp(product, product.initial(0), product.initial(1)))
+
+
+def includes(automaton1, automaton2):
+    """
+    Check if the language of an automaton includes the one of another.
+
+    The language of ``automaton1`` includes the one of ``automaton2`` iff
+    the union of both is equivalent to ``automaton1``, which is checked as
+    in ``equivalent``.
+
+    Args:
+        automaton1: Automaton with the larger language. Type: FiniteAutomaton
+        automaton2: Automaton with the smaller language. Type: FiniteAutomaton
+
+    Returns:
+        Result of the comparison, with a string accepted by ``automaton2``
+        but not by ``automaton1`` if it does not hold. Type: Comparison
+
+    """
+    product = DeterminizedPair(automaton1, automaton2)
+    initial1 = product.initial(0)
+    union = (initial1[0], product.initial(1)[1])
+    return Comparison(_hopcroft_karp(product, union, initial1))
\ No newline at end of file
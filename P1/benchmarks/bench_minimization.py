@@ -0,0 +1,76 @@
+"""
+Benchmark of DFA minimization.
+
+Times ``minimize_table`` (Hopcroft) on random complete DFAs and
+``DeterministicFiniteAutomaton.to_minimized`` on DFAs whose states come in
+pairs of equivalent states, for growing numbers of states.
+
+Usage (from the ``P1`` directory)::
+
+    python -m benchmarks.bench_minimization [--sizes 1000 10000 100000]
+
+"""
+import argparse
+from array import array
+import random
+import time
+
+from automata.automaton import FiniteAutomaton, State, Transitions
+from automata.dfa import DeterministicFiniteAutomaton, minimize_table
+
+
+def random_table(n_states, n_classes, rng):
+    """Random complete DFA as a flat table and its final states."""
+    table = array("i", [rng.randrange(n_states) for _ in range(n_states * n_classes)])
+    finals = [rng.random() < 0.5 for _ in range(n_states)]
+    return table, finals
+
+
+def doubled_automaton(n_states, symbols, rng):
+    """
+    DFA with ``2 * n_states`` states and at most ``n_states`` after minimization.
+
+    State ``q<2i>`` and ``q<2i+1>`` are two copies of state ``i`` of a random
+    DFA, and every transition goes to either copy.
+    """
+    table, finals = random_table(n_states, len(symbols), rng)
+    states = [State(f"q{i}", finals[i // 2]) for i in range(2 * n_states)]
+    transitions = Transitions()
+    for i, state in enumerate(states):
+        for c, symbol in enumerate(symbols):
+            target = table[(i // 2) * len(symbols) + c]
+            transitions.add_transition(state, symbol, states[2 * target + rng.randrange(2)])
+
+    return FiniteAutomaton(states[0], states, symbols, transitions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--symbols", default="ab")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    n_classes = len(args.symbols)
+
+    print(f"{'states':>8} {'minimize_table':>15} {'blocks':>8} {'to_minimized':>13} {'states':>8}")
+    for n_states in args.sizes:
+        table, finals = random_table(n_states, n_classes, rng)
+        start = time.perf_counter()
+        block_ids, _ = minimize_table(table, n_classes, finals)
+        table_seconds = time.perf_counter() - start
+
+        automaton = doubled_automaton(n_states // 2, list(args.symbols), rng)
+        start = time.perf_counter()
+        minimized = DeterministicFiniteAutomaton.to_minimized(automaton)
+        automaton_seconds = time.perf_counter() - start
+
+        print(
+            f"{n_states:>8} {table_seconds:>14.3f}s {max(block_ids) + 1:>8} "
+            f"{automaton_seconds:>12.3f}s {len(minimized.states):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
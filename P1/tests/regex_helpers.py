@@ -0,0 +1,36 @@
+"""Random regexes and enumerated languages shared by the tests."""
+import itertools
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+
+
+def random_regex(rng, depth):
+    """Random regex over ``ab`` in Kleene notation."""
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice("abλ")
+    operator = rng.choice("+.*")
+    if operator == "*":
+        return f"({random_regex(rng, depth - 1)})*"
+    return f"({random_regex(rng, depth - 1)}{operator}{random_regex(rng, depth - 1)})"
+
+
+def accepts(automaton, string):
+    """Acceptance of a string, rejecting symbols outside the alphabet."""
+    try:
+        return FiniteAutomatonEvaluator(automaton).accepts(string)
+    except ValueError:
+        return False
+
+
+def strings(alphabet="ab", max_length=5):
+    """Every string over an alphabet up to a length."""
+    for length in range(max_length + 1):
+        yield from map("".join, itertools.product(alphabet, repeat=length))
+
+
+def language(automaton, alphabet="ab", max_length=6):
+    """Strings over an alphabet up to a length accepted by an automaton."""
+    evaluator = FiniteAutomatonEvaluator(automaton)
+    # Solo las cadenas del alfabeto del automata pueden ser aceptadas
+    alphabet = "".join(symbol for symbol in alphabet if symbol in automaton.symbols)
+    return {string for string in strings(alphabet, max_length) if evaluator.accepts(string)}
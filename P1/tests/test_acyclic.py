@@ -0,0 +1,76 @@
+"""Test the incremental construction of minimal acyclic automata."""
+import os
+import tempfile
+import unittest
+
+from automata.acyclic import AcyclicDFABuilder, from_sorted_words, from_word_file
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.dfa import DeterministicFiniteAutomaton
+from automata.re_parser import REParser
+from automata.utils import deterministic_automata_isomorphism
+
+
+class TestAcyclic(unittest.TestCase):
+    """Tests for the minimal DFA of word lists."""
+
+    words = ["", "ab", "abab", "abb", "b", "ba", "bab", "bb", "bbb"]
+
+    def test_language(self):
+        """Exactly the words are accepted."""
+        evaluator = FiniteAutomatonEvaluator(from_sorted_words(self.words))
+        for string in self.words + ["a", "aa", "abba", "babb", "bbbb"]:
+            with self.subTest(string=string):
+                self.assertEqual(evaluator.accepts(string), string in self.words)
+
+    def test_minimal(self):
+        """The result is the minimal DFA of the words."""
+        pattern = "+".join(".".join(word) if word else "λ" for word in self.words)
+        expected = DeterministicFiniteAutomaton.to_minimized(
+            REParser().create_automaton(pattern).to_deterministic(),
+        )
+        automaton = from_sorted_words(self.words, complete=True)
+
+        self.assertIsNotNone(deterministic_automata_isomorphism(automaton, expected))
+        self.assertEqual(len(from_sorted_words(self.words).states), len(expected.states) - 1)
+
+    def test_order(self):
+        """Words must be sorted; repeated words are ignored."""
+        builder = AcyclicDFABuilder()
+        builder.add_all(["a", "a", "b"])
+        self.assertEqual(builder.n_words, 2)
+        with self.assertRaises(ValueError):
+            builder.add("ab")
+
+    def test_file(self):
+        """Word lists are streamed from files."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.txt")
+            words = sorted(f"{i:05d}" for i in range(0, 20000, 3))
+            with open(path, "w", encoding="utf-8") as f:
+                f.writelines(word + "\n" for word in words)
+
+            automaton = from_word_file(path)
+
+        evaluator = FiniteAutomatonEvaluator(automaton)
+        self.assertTrue(all(evaluator.accepts(word) for word in words[:500]))
+        self.assertFalse(evaluator.accepts("00001"))
+        self.assertFalse(evaluator.accepts("0000"))
+        self.assertLess(len(automaton.states), 100)
+
+    def test_file_blank_lines(self):
+        """Blank lines, such as a trailing empty line, are skipped."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "words.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("ab\nabc\n\nb\r\n\n")
+
+            automaton = from_word_file(path)
+
+        evaluator = FiniteAutomatonEvaluator(automaton)
+        for word in ("ab", "abc", "b"):
+            self.assertTrue(evaluator.accepts(word))
+        self.assertFalse(evaluator.accepts(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
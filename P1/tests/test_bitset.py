@@ -0,0 +1,62 @@
+"""Test bit-parallel simulation of automata."""
+import itertools
+import unittest
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.re_parser import REParser
+from automata.utils import AutomataFormat
+
+
+class TestBitset(unittest.TestCase):
+    """Tests for the bitset evaluation mode."""
+
+    def _check_same_language(self, regex, alphabet, max_length=6):
+        automaton = REParser().create_automaton(regex)
+        bitset = FiniteAutomatonEvaluator(automaton, mode="bitset")
+        nfa = FiniteAutomatonEvaluator(automaton)
+        for length in range(max_length + 1):
+            for string in map("".join, itertools.product(alphabet, repeat=length)):
+                with self.subTest(regex=regex, string=string):
+                    self.assertEqual(bitset.accepts(string), nfa.accepts(string))
+
+    def test_languages(self):
+        """The bitset mode accepts the same language as the NFA."""
+        self._check_same_language("(a+b)*.a.(a+b).(a+b)", "ab")
+        self._check_same_language("a*.b*", "ab")
+        self._check_same_language("(a.b+c)*.(c+λ)", "abc")
+
+    def test_masks(self):
+        """Current states are stored as a single integer mask."""
+        automaton = REParser().create_automaton("a.b*")
+        evaluator = FiniteAutomatonEvaluator(automaton, mode="bitset")
+        nfa = FiniteAutomatonEvaluator(automaton)
+
+        evaluator.process_symbol("a")
+        nfa.process_symbol("a")
+        self.assertIsInstance(evaluator._current, int)
+        self.assertEqual(evaluator.current_states, nfa.current_states)
+
+        evaluator.current_states = set()
+        self.assertEqual(evaluator._current, 0)
+        self.assertFalse(evaluator.accepts("b"))
+
+    def test_invalid_symbol(self):
+        """Symbols outside the alphabet raise ``ValueError``."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: a
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+        """)
+        evaluator = FiniteAutomatonEvaluator(automaton, mode="bitset")
+
+        self.assertTrue(evaluator.accepts("a"))
+        with self.assertRaises(ValueError):
+            evaluator.accepts("b")
+
+
+if __name__ == '__main__':
+    unittest.main()
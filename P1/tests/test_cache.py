@@ -0,0 +1,128 @@
+"""Test the cache of automata compiled from regexes."""
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from automata import cache
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.metrics import Metrics, use_hooks
+from automata.re_parser import REParser
+from automata.utils import (
+    AutomataFormat, deterministic_automata_isomorphism, load_marshalled, store_marshalled,
+)
+
+
+class TestCompileCache(unittest.TestCase):
+    """Tests for ``CompileCache`` and the compact format."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def _check_language(self, automaton, pattern):
+        """Test that an automaton accepts the language of a regex."""
+        evaluator = FiniteAutomatonEvaluator(automaton)
+        expected = FiniteAutomatonEvaluator(REParser().create_automaton(pattern))
+        for length in range(6):
+            for string in map("".join, itertools.product("ab", repeat=length)):
+                with self.subTest(pattern=pattern, string=string):
+                    self.assertEqual(evaluator.accepts(string), expected.accepts(string))
+
+    def test_compact_round_trip(self):
+        """Test that the compact form keeps the automaton."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+        Symbols: abc
+
+        q0
+        q1 final
+        empty
+
+        ini q0 -a-> q1
+        q0 -b-> q1
+        q0 -c-> empty
+        q1 -a-> q1
+        q1 -b-> q1
+        q1 -c-> empty
+        empty -a-> empty
+        empty -b-> empty
+        empty -c-> empty
+        """)
+        data = cache.to_compact(automaton)
+
+        # a y b forman una sola clase
+        self.assertEqual(len(data[1]), 2)
+        decoded = cache.from_compact(data)
+        self.assertIsNotNone(deterministic_automata_isomorphism(automaton, decoded))
+        self.assertIn("empty", {state.name for state in decoded.states})
+
+        with self.assertRaises(ValueError):
+            cache.to_compact(REParser().create_automaton("a*"))
+
+    def test_methods(self):
+        """Test that every pipeline gives the language of the regex."""
+        for method in ("auto", "hopcroft", "brzozowski", "valmari", None):
+            for pattern in ("(a+b)*.a.b", "a*.b+λ", "(a.b)*.a"):
+                compile_cache = cache.CompileCache(cache_dir=self.cache_dir.name)
+                self._check_language(compile_cache.get(pattern, method), pattern)
+
+    def test_tiers(self):
+        """Test that automata are served from memory, then from disk."""
+        compile_cache = cache.CompileCache(cache_dir=self.cache_dir.name)
+        automaton = compile_cache.get("(a+b)*.a")
+        self.assertIs(compile_cache.get("(a+b)*.a"), automaton)
+        self.assertEqual((compile_cache.misses, compile_cache.hits), (1, 1))
+
+        # Un arranque en caliente no construye nada
+        warm = cache.CompileCache(cache_dir=self.cache_dir.name)
+        metrics = Metrics()
+        with mock.patch.object(cache.REParser, "create_automaton") as create, use_hooks(metrics):
+            from_disk = warm.get("(a+b)*.a")
+        create.assert_not_called()
+        self.assertEqual((warm.misses, warm.disk_hits), (0, 1))
+        self.assertEqual(metrics.counters["cache.disk_hits"], 1)
+        self.assertIsNotNone(deterministic_automata_isomorphism(automaton, from_disk))
+
+        # Otras opciones u otra version son otra entrada
+        self.assertNotEqual(cache.CompileCache.key("a", "auto"), cache.CompileCache.key("a", None))
+        with mock.patch("automata.__version__", "0.0.0"):
+            warm.get("(a+b)*.a")
+        self.assertEqual(warm.misses, 1)
+
+    def test_disk_errors(self):
+        """Test that a disk cache that cannot be written is ignored."""
+        path = os.path.join(self.cache_dir.name, "file")
+        with open(path, "w"):
+            pass
+        compile_cache = cache.CompileCache(cache_dir=path)
+        self._check_language(compile_cache.get("a.b"), "a.b")
+        self.assertEqual(compile_cache.misses, 1)
+
+        # Un valor que no se puede serializar no deja ficheros temporales
+        target = os.path.join(self.cache_dir.name, "values", "value.bin")
+        store_marshalled(target, object())
+        self.assertEqual(os.listdir(os.path.dirname(target)), [])
+        self.assertIsNone(load_marshalled(target))
+
+    def test_eviction(self):
+        """Test that the memory tier is bounded by the size of the tables."""
+        compile_cache = cache.CompileCache(max_size=10, use_disk_cache=False)
+        compile_cache.get("a.b")
+        compile_cache.get("a")
+        self.assertLessEqual(compile_cache.size, 10)
+        self.assertEqual(len(compile_cache), 1)
+
+        compile_cache.get("a")
+        self.assertEqual(compile_cache.hits, 1)
+        compile_cache.get("a.b")
+        self.assertEqual(compile_cache.misses, 3)
+
+        compile_cache.clear()
+        self.assertEqual((len(compile_cache), compile_cache.size), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
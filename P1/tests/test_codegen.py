@@ -0,0 +1,79 @@
+"""Test generation of Python code for automata."""
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from automata import codegen
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.re_parser import REParser
+
+
+class TestCodegen(unittest.TestCase):
+    """Tests for the generated ``accepts`` functions."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        codegen._functions.clear()
+
+    def test_accepts(self):
+        """The generated function accepts the language of the automaton."""
+        automaton = REParser().create_automaton("(a+b)*.a.b")
+        accepts = codegen.compile_accepts(automaton, cache_dir=self.cache_dir.name)
+        evaluator = FiniteAutomatonEvaluator(automaton)
+
+        for length in range(7):
+            for string in map("".join, itertools.product("ab", repeat=length)):
+                with self.subTest(string=string):
+                    self.assertEqual(accepts(string), evaluator.accepts(string))
+
+        with self.assertRaises(ValueError):
+            accepts("abc")
+
+    def test_caches(self):
+        """Code objects are reused from memory and from disk."""
+        automaton = REParser().create_automaton("a.b*")
+        accepts = codegen.compile_accepts(automaton, cache_dir=self.cache_dir.name)
+
+        self.assertIs(codegen.compile_accepts(automaton, cache_dir=self.cache_dir.name), accepts)
+        path = os.path.join(
+            self.cache_dir.name, "codegen", f"{codegen.fingerprint(automaton)}.bin",
+        )
+        self.assertTrue(os.path.exists(path))
+
+        codegen._functions.clear()
+        from_disk = codegen.compile_accepts(automaton, cache_dir=self.cache_dir.name)
+        self.assertIsNot(from_disk, accepts)
+        self.assertTrue(from_disk("abbb"))
+        self.assertFalse(from_disk("ba"))
+
+    def test_bounded_memory_cache(self):
+        """Only the most recently used functions are kept in memory."""
+        candidates = [REParser().create_automaton("a" + ".a" * i) for i in range(3)]
+        with mock.patch.object(codegen, "MAX_FUNCTIONS", 2):
+            for automaton in candidates:
+                codegen.compile_accepts(automaton, use_disk_cache=False)
+        self.assertEqual(len(codegen._functions), 2)
+        self.assertNotIn(codegen.fingerprint(candidates[0]), codegen._functions)
+
+    def test_fingerprint_version(self):
+        """Code generated by another version of the library is not reused."""
+        automaton = REParser().create_automaton("a.b*")
+        key = codegen.fingerprint(automaton)
+        with mock.patch("automata.__version__", "0.0.0"):
+            self.assertNotEqual(codegen.fingerprint(automaton), key)
+
+    def test_disk_errors(self):
+        """A disk cache that cannot be written is ignored."""
+        path = os.path.join(self.cache_dir.name, "file")
+        with open(path, "w"):
+            pass
+        accepts = codegen.compile_accepts(REParser().create_automaton("a.b"), cache_dir=path)
+        self.assertTrue(accepts("ab"))
+
+
+if __name__ == '__main__':
+    unittest.main()
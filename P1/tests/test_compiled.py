@@ -0,0 +1,168 @@
+"""Test compilation of automata into transition tables."""
+import unittest
+
+from automata.compiled import CompiledAutomaton
+from automata.re_parser import REParser
+from automata.utils import AutomataFormat
+
+
+class TestCompiledAutomaton(unittest.TestCase):
+    """Tests for the compiled transition table."""
+
+    def test_deterministic_table(self):
+        """A deterministic automaton gets a flat table of ids."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+            q1 -b-> q0
+        """)
+        compiled = CompiledAutomaton(automaton)
+
+        self.assertIsNotNone(compiled.deterministic_table)
+        self.assertEqual(len(compiled.deterministic_table), 4)
+        self.assertTrue(compiled.is_accepting(compiled.run(compiled.initial, "aba")))
+        self.assertFalse(compiled.is_accepting(compiled.run(compiled.initial, "ab")))
+        self.assertEqual(compiled.run(compiled.initial, "b"), frozenset())
+
+    def test_lambda_completed_table(self):
+        """Table entries of an NFA already include lambda closures."""
+        automaton = REParser().create_automaton("a*.b")
+        compiled = CompiledAutomaton(automaton)
+
+        self.assertIsNone(compiled.deterministic_table)
+        current = compiled.step(compiled.initial, "a")
+        self.assertEqual(current, compiled.step(current, "a"))
+        self.assertTrue(compiled.is_accepting(compiled.run(current, "b")))
+
+    def test_lambda_cycle(self):
+        """Lambda cycles do not make the closure loop forever."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: a
+
+            q0
+            q1
+            q2 final
+
+            ini q0 --> q1
+            q1 --> q0
+            q1 -a-> q2
+        """)
+        compiled = CompiledAutomaton(automaton)
+
+        initial_names = {state.name for state in compiled.decode(compiled.initial)}
+        self.assertEqual(initial_names, {"q0", "q1"})
+        self.assertTrue(compiled.is_accepting(compiled.run(compiled.initial, "a")))
+
+    def test_closure_cache(self):
+        """Closures of state sets are memoized in a bounded cache."""
+        automaton = REParser().create_automaton("(a*.b*)*")
+        compiled = CompiledAutomaton(automaton, closure_cache_size=2)
+
+        closures = [compiled.closure({i}) for i in range(compiled.n_states)]
+        self.assertEqual(closures, [compiled.closures[i] for i in range(compiled.n_states)])
+        self.assertLessEqual(len(compiled._closure_cache), 2)
+
+        current = compiled.initial
+        for symbol in "abba":
+            current = compiled.step(current, symbol)
+        self.assertEqual(current, compiled.run(compiled.initial, "abba"))
+        self.assertTrue(compiled.is_accepting(current))
+
+    def test_symbol_classes(self):
+        """Symbols with the same transitions share a column."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: 0123456789.
+
+            q0
+            q1 final
+            q2
+            q3 final
+
+            ini q0 -0-> q1
+            q0 -1-> q1
+            q0 -2-> q1
+            q0 -3-> q1
+            q1 -0-> q1
+            q1 -1-> q1
+            q1 -2-> q1
+            q1 -3-> q1
+            q1 -.-> q2
+            q2 -0-> q3
+            q2 -1-> q3
+            q2 -2-> q3
+            q2 -3-> q3
+        """)
+        compiled = CompiledAutomaton(automaton)
+
+        self.assertEqual(compiled.n_classes, 3)
+        self.assertEqual(set(compiled.classes), {("0", "1", "2", "3"), ("4", "5", "6", "7", "8", "9"), (".",)})
+        self.assertEqual(len(compiled.table), compiled.n_states * 3)
+        self.assertTrue(compiled.is_accepting(compiled.run(compiled.initial, "30.1")))
+        self.assertFalse(compiled.is_accepting(compiled.run(compiled.initial, "30.")))
+        self.assertFalse(compiled.is_accepting(compiled.run(compiled.initial, "39")))
+
+        dfa = automaton.to_deterministic()
+        self.assertEqual(len(dfa.states), 5)
+        self.assertEqual(len(dfa.get_all_transitions()), 5 * 11)
+
+    def test_invalid_symbol(self):
+        """Symbols outside the alphabet raise ``ValueError``."""
+        compiled = CompiledAutomaton(REParser().create_automaton("a.b"))
+
+        with self.assertRaises(ValueError):
+            compiled.run(compiled.initial, "ac")
+
+    def test_dead_and_universal_states(self):
+        """Dead, universal and sink states are detected."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+            q2 final
+            empty
+
+            ini q0 -a-> q1
+            q0 -b-> empty
+            q1 -a-> q2
+            q1 -b-> empty
+            q2 -a-> q2
+            q2 -b-> q2
+            empty -a-> empty
+            empty -b-> empty
+        """)
+        compiled = CompiledAutomaton(automaton)
+
+        self.assertEqual({compiled.states[i].name for i in compiled.dead}, {"empty"})
+        self.assertEqual({compiled.states[i].name for i in compiled.universal}, {"q2"})
+        self.assertEqual({compiled.states[i].name for i in compiled.sinks}, {"q2", "empty"})
+
+        # La salida temprana sigue validando el resto de la cadena
+        self.assertEqual(compiled.decode(compiled.run(compiled.initial, "bab")), compiled.decode(compiled.dead))
+        with self.assertRaises(ValueError):
+            compiled.run(compiled.initial, "babc")
+        self.assertTrue(compiled.is_accepting(compiled.run(compiled.initial, "aab", stop_when_decided=True)))
+        with self.assertRaises(ValueError):
+            compiled.run(compiled.initial, "aabc", stop_when_decided=True)
+
+    def test_dead_states_nfa(self):
+        """States of an NFA that cannot reach a final state are dead."""
+        compiled = CompiledAutomaton(REParser().create_automaton("a.b+a*"))
+
+        self.assertFalse(compiled.is_decided(compiled.initial))
+        self.assertFalse(compiled.is_decided(compiled.run(compiled.initial, "ab")))
+        self.assertTrue(compiled.is_decided(compiled.run(compiled.initial, "aba")))
+        self.assertEqual(compiled.run(compiled.initial, "b" * 10), frozenset())
+        self.assertEqual(compiled.universal, frozenset())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Test equivalence and inclusion checks between automata."""
+import random
+import unittest
+
+from automata.re_parser import REParser
+from automata.utils import AutomataFormat, equivalent, includes
+from regex_helpers import language, random_regex
+
+
+class TestEquivalence(unittest.TestCase):
+    """Tests for ``equivalent`` and ``includes``."""
+
+    def _language(self, pattern, max_length=6):
+        """Strings of the language of a regex up to a length."""
+        return language(REParser().create_automaton(pattern), max_length=max_length)
+
+    def test_equivalent(self):
+        """Test equivalent regexes and counterexamples."""
+        def create(pattern):
+            return REParser().create_automaton(pattern)
+
+        self.assertTrue(equivalent(create("(a+b)*"), create("(a*.b*)*")))
+        self.assertTrue(equivalent(create("a.(b.a)*"), create("(a.b)*.a")))
+
+        result = equivalent(create("a.b"), create("a.b+b"))
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, "b")
+
+        # La cadena vacia tambien es un contraejemplo
+        result = equivalent(create("a*"), create("a.a*"))
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, "")
+
+    def test_alphabets(self):
+        """Test automata with different alphabets."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+        Symbols: abc
+
+        q0 final
+
+        ini q0 -a-> q0
+        """)
+        self.assertTrue(equivalent(automaton, REParser().create_automaton("a*")))
+        self.assertEqual(
+            equivalent(automaton, REParser().create_automaton("(a+c)*")).counterexample,
+            "c",
+        )
+
+    def test_includes(self):
+        """Test inclusion and its counterexamples."""
+        def create(pattern):
+            return REParser().create_automaton(pattern)
+
+        self.assertTrue(includes(create("a*"), create("a.a")))
+        self.assertTrue(includes(create("(a+b)*"), create("(a.b)*+b")))
+
+        result = includes(create("a.a"), create("a*"))
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, "")
+
+        result = includes(create("a*.b"), create("(a+b)*.b"))
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, "bb")
+
+    def test_random(self):
+        """Test random regexes against their languages."""
+        rng = random.Random(1)
+        for _ in range(150):
+            pattern1 = random_regex(rng, 3)
+            pattern2 = random_regex(rng, 3)
+            language1 = self._language(pattern1)
+            language2 = self._language(pattern2)
+            automaton1 = REParser().create_automaton(pattern1)
+            automaton2 = REParser().create_automaton(pattern2)
+
+            with self.subTest(pattern1=pattern1, pattern2=pattern2):
+                result = equivalent(automaton1, automaton2)
+                if language1 != language2:
+                    self.assertFalse(result)
+                if not result:
+                    length = len(result.counterexample)
+                    self.assertIn(
+                        result.counterexample,
+                        self._language(pattern1, length) ^ self._language(pattern2, length),
+                    )
+
+                result = includes(automaton1, automaton2)
+                if not language2 <= language1:
+                    self.assertFalse(result)
+                if not result:
+                    counterexample = result.counterexample
+                    self.assertIn(counterexample, self._language(pattern2, len(counterexample)))
+                    self.assertNotIn(counterexample, self._language(pattern1, len(counterexample)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,20 @@
 """Test evaluation of automatas."""
 import unittest
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import Optional, Type
+from unittest import mock
 
 from automata.automaton import FiniteAutomaton
 from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.re_parser import REParser
 from automata.utils import AutomataFormat
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestEvaluatorBase(ABC, unittest.TestCase):
     """Base class for string acceptance tests."""
@@ -145,5 +153,251 @@ class TestEvaluatorNumber(TestEvaluatorBase):
     #     self._check_accept("0-0.0", should_accept=False)
 
 
+class TestEvaluatorStreaming(unittest.TestCase):
+    """Test for chunked input."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a.b)*"))
+
+    def test_feed(self):
+        """Feeding chunks is equivalent to processing the whole string."""
+        for chunk in ["a", "ba", "", "ba"]:
+            self.evaluator.feed(chunk)
+        self.assertFalse(self.evaluator.is_accepting())
+        self.evaluator.feed("b")
+        self.assertTrue(self.evaluator.finish())
+
+        # finish vuelve al estado inicial
+        self.assertTrue(self.evaluator.is_accepting())
+        self.evaluator.feed("b")
+        self.assertFalse(self.evaluator.finish())
+
+    def test_snapshot(self):
+        """Streams can be resumed from a snapshot."""
+        self.evaluator.feed("aba")
+        snapshot = self.evaluator.snapshot()
+
+        self.evaluator.feed("b")
+        self.assertTrue(self.evaluator.is_accepting())
+        self.evaluator.restore(snapshot)
+        self.evaluator.feed("a")
+        self.assertFalse(self.evaluator.is_accepting())
+        self.evaluator.restore(snapshot)
+        self.evaluator.feed("bab")
+        self.assertTrue(self.evaluator.is_accepting())
+
+    def test_accepts_stream(self):
+        """Generators of chunks are accepted without changing state."""
+        self.assertTrue(self.evaluator.accepts_stream("ab" for _ in range(1000)))
+        self.assertFalse(self.evaluator.accepts_stream(iter(["ab", "a"])))
+        self.assertEqual(self.evaluator.snapshot(), self.evaluator.compiled.initial)
+
+        with self.assertRaises(ValueError):
+            self.evaluator.feed("abc")
+
+
+class TestEvaluatorEarlyExit(unittest.TestCase):
+    """Test for early exit on dead and universal states."""
+
+    def test_modes(self):
+        """Every mode agrees with and without early exit."""
+        automaton = REParser().create_automaton("a.(a+b)*.b+b.b")
+        for mode in ("nfa", "lazy", "bitset"):
+            evaluator = FiniteAutomatonEvaluator(automaton, mode=mode)
+            for string in ("", "ab", "aab", "aaba", "ba", "bb", "bba", "bbb" * 100, "a" * 100 + "b"):
+                with self.subTest(mode=mode, string=string):
+                    evaluator.process_string(string)
+                    expected = evaluator.finish()
+                    self.assertEqual(evaluator.accepts(string), expected)
+                    self.assertEqual(evaluator.accepts_stream(iter([string])), expected)
+
+    def test_invalid_symbol_after_exit(self):
+        """Symbols after a decided prefix are still checked."""
+        automaton = REParser().create_automaton("a.b")
+        for mode in ("nfa", "lazy", "bitset"):
+            evaluator = FiniteAutomatonEvaluator(automaton, mode=mode)
+            with self.subTest(mode=mode):
+                self.assertFalse(evaluator.accepts("ba" * 1000))
+                with self.assertRaises(ValueError):
+                    evaluator.accepts("ba" * 1000 + "c")
+                with self.assertRaises(ValueError):
+                    evaluator.process_string("bac")
+
+    def test_universal(self):
+        """Strings are accepted as soon as a universal state is reached."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+            q0 -b-> q0
+            q1 -a-> q1
+            q1 -b-> q1
+        """)
+        for mode in ("nfa", "lazy", "bitset"):
+            evaluator = FiniteAutomatonEvaluator(automaton, mode=mode)
+            with self.subTest(mode=mode):
+                self.assertTrue(evaluator.accepts("ba" + "b" * 1000))
+                self.assertFalse(evaluator.accepts("b" * 1000))
+                evaluator.process_string("ab" * 10)
+                self.assertEqual({state.name for state in evaluator.current_states}, {"q1"})
+
+
+class TestEvaluatorPrefixes(unittest.TestCase):
+    """Test for accepted prefixes."""
+
+    def test_prefixes(self):
+        """Every accepted prefix is found in one pass."""
+        automaton = REParser().create_automaton("a.(b.a)*")
+        for mode in ("nfa", "lazy", "bitset"):
+            evaluator = FiniteAutomatonEvaluator(automaton, mode=mode)
+            for string in ("", "a", "ab", "ababa", "ababb", "abac", "bab"):
+                with self.subTest(mode=mode, string=string):
+                    expected = [
+                        i for i in range(len(string) + 1)
+                        if "c" not in string[:i] and evaluator.accepts(string[:i])
+                    ]
+                    self.assertEqual(evaluator.matching_prefix_lengths(string), expected)
+                    self.assertEqual(evaluator.longest_match_prefix(string), max(expected, default=-1))
+
+    def test_current_states(self):
+        """Prefixes are checked from the current states, which do not change."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b*"))
+        self.assertEqual(evaluator.longest_match_prefix("bbb"), -1)
+        evaluator.process_symbol("a")
+        snapshot = evaluator.snapshot()
+        self.assertEqual(evaluator.matching_prefix_lengths("bba"), [0, 1, 2])
+        self.assertEqual(evaluator.longest_match_prefix("bba"), 2)
+        self.assertEqual(evaluator.snapshot(), snapshot)
+
+
+class TestEvaluatorParallel(unittest.TestCase):
+    """Test for parallel evaluation."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.strings = ["", "ab", "abab", "aba", "b", "ababababab"] * 50
+
+    def _check_parallel(self, evaluator, executor):
+        expected = [evaluator.accepts(string) for string in self.strings]
+        results = evaluator.accepts_parallel(
+            iter(self.strings), workers=2, executor=executor, batch_size=7,
+        )
+        self.assertEqual(results, expected)
+
+    def test_threads(self):
+        """Thread pools give the same results as ``accepts``."""
+        for mode in ("nfa", "lazy", "bitset"):
+            with self.subTest(mode=mode):
+                evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a.b)*"), mode=mode)
+                self._check_parallel(evaluator, "thread")
+
+    def test_processes(self):
+        """Process pools start from the current states of the evaluator."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a.b)*"))
+        evaluator.process_symbol("a")
+        self._check_parallel(evaluator, "process")
+
+    def test_chunked(self):
+        """Composing the mappings of the chunks gives the final state."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a+b)*.a.b.(a+b)"))
+        strings = ["", "aba", "abb" * 100, "ab" * 100, "ab" * 100 + "a", "b" * 50 + "aba"]
+
+        for string in strings:
+            with self.subTest(string=string[:10]):
+                accepted = evaluator.accepts_chunked(string, workers=2, chunk_size=7)
+                self.assertEqual(accepted, evaluator.accepts(string))
+
+        with self.assertRaises(ValueError):
+            evaluator.accepts_chunked("ab" * 20 + "c", workers=2, chunk_size=5)
+
+    def test_chunked_window(self):
+        """Only a bounded window of chunks is in flight, and the DFA is bounded."""
+        class InlinePool():
+            """Pool that runs every task when it is submitted."""
+
+            in_flight = 0
+            max_in_flight = 0
+
+            def __init__(self, max_workers, initializer, initargs):
+                initializer(*initargs)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def submit(self, function, *args):
+                future = Future()
+                future.set_result(function(*args))
+                InlinePool.in_flight += 1
+                InlinePool.max_in_flight = max(InlinePool.max_in_flight, InlinePool.in_flight)
+                result = future.result
+
+                def counted_result():
+                    InlinePool.in_flight -= 1
+                    return result()
+
+                future.result = counted_result
+                return future
+
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a+b)*.a.b.(a+b)"))
+        string = "ab" * 500 + "a"
+        with mock.patch("automata.parallel.ProcessPoolExecutor", InlinePool):
+            accepted = evaluator.accepts_chunked(string, workers=2, chunk_size=3)
+        self.assertEqual(accepted, evaluator.accepts(string))
+        self.assertEqual(InlinePool.in_flight, 0)
+        self.assertLessEqual(InlinePool.max_in_flight, 4)
+
+        # El AFD completo tiene 2^9 estados
+        blowup = FiniteAutomatonEvaluator(
+            REParser().create_automaton("(a+b)*.a" + ".(a+b)" * 8), max_dfa_states=16,
+        )
+        with mock.patch("automata.parallel.ProcessPoolExecutor") as pool:
+            with self.assertRaisesRegex(ValueError, "more than 16 states"):
+                blowup.accepts_chunked("ab" * 10, workers=2)
+        pool.assert_not_called()
+
+    def test_unknown_executor(self):
+        """Unknown executors are rejected."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a"))
+        with self.assertRaises(ValueError):
+            evaluator.accepts_parallel(["a"], executor="cluster")
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestEvaluatorAcceptsMany(unittest.TestCase):
+    """Test for batch acceptance."""
+
+    def test_accepts_many(self):
+        """Batch results match ``accepts`` string by string."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a*.b.(a+b)*"))
+        strings = ["", "a", "b", "ab", "aab", "ba", "aaaa", "abababab", "bbbbbbbbbbbbbbbba"]
+
+        accepted = evaluator.accepts_many(strings)
+        self.assertEqual(accepted.dtype, bool)
+        self.assertEqual(list(accepted), [evaluator.accepts(s) for s in strings])
+        self.assertEqual(len(evaluator.accepts_many([])), 0)
+
+    def test_accepts_many_current_states(self):
+        """Batch acceptance starts from the current states."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b"))
+        evaluator.process_symbol("a")
+
+        self.assertEqual(list(evaluator.accepts_many(["b", "ab", ""])), [True, False, False])
+
+    def test_accepts_many_invalid_symbol(self):
+        """Symbols outside the alphabet raise ``ValueError``."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b"))
+
+        with self.assertRaises(ValueError):
+            evaluator.accepts_many(["ab", "ac"])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
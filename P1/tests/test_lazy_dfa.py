@@ -0,0 +1,89 @@
+"""Test lazy determinization of automata."""
+import itertools
+import unittest
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.re_parser import REParser
+
+
+class TestLazyDFA(unittest.TestCase):
+    """Tests for the lazy DFA evaluation mode."""
+
+    regex = "(a+b)*.a.(a+b).(a+b).(a+b)"
+
+    def _check_same_language(self, lazy, max_length=8):
+        nfa = FiniteAutomatonEvaluator(REParser().create_automaton(self.regex))
+        for length in range(max_length + 1):
+            for string in map("".join, itertools.product("ab", repeat=length)):
+                with self.subTest(string=string):
+                    self.assertEqual(lazy.accepts(string), nfa.accepts(string))
+
+    def test_lazy(self):
+        """The lazy DFA accepts the same language as the NFA."""
+        lazy = FiniteAutomatonEvaluator(REParser().create_automaton(self.regex), mode="lazy")
+
+        self._check_same_language(lazy)
+        self.assertEqual(lazy._engine.flushes, 0)
+        self.assertEqual(lazy._engine.fallbacks, 0)
+
+    def test_bounded_cache(self):
+        """A small cache is flushed and the calls that thrash it fall back to NFA simulation."""
+        lazy = FiniteAutomatonEvaluator(
+            REParser().create_automaton(self.regex),
+            mode="lazy",
+            max_dfa_states=4,
+        )
+        engine = lazy._engine
+
+        self._check_same_language(lazy)
+        self.assertGreater(engine.flushes, 0)
+        self.assertGreater(engine.fallbacks, 0)
+        self.assertLessEqual(len(engine), 4)
+
+        # La siguiente llamada vuelve a usar (y llenar) el AFD
+        fallbacks = engine.fallbacks
+        with engine._lock:
+            engine._flush()
+        self.assertFalse(lazy.accepts("aa"))
+        self.assertEqual(engine.fallbacks, fallbacks)
+        self.assertEqual(len(engine), 3)
+
+    def test_cache_limit(self):
+        """The cache never holds more than ``max_dfa_states`` states."""
+        lazy = FiniteAutomatonEvaluator(
+            REParser().create_automaton(self.regex),
+            mode="lazy",
+            max_dfa_states=3,
+        )
+        engine = lazy._engine
+
+        engine.run(engine.initial, "aa")
+        self.assertEqual(len(engine), 3)
+        # Empezar desde un estado que no esta en la cache la vacia antes
+        engine.run(engine.encode(lazy.automaton.states), "")
+        self.assertEqual(len(engine), 1)
+        self.assertEqual(engine.flushes, 1)
+
+    def test_process_symbol(self):
+        """Processing symbol by symbol keeps ``current_states`` consistent."""
+        automaton = REParser().create_automaton(self.regex)
+        lazy = FiniteAutomatonEvaluator(automaton, mode="lazy")
+        nfa = FiniteAutomatonEvaluator(automaton)
+
+        for symbol in "babba":
+            lazy.process_symbol(symbol)
+            nfa.process_symbol(symbol)
+            self.assertEqual(lazy.current_states, nfa.current_states)
+        self.assertTrue(lazy.is_accepting())
+
+        with self.assertRaises(ValueError):
+            lazy.process_symbol("c")
+
+    def test_unknown_mode(self):
+        """Unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            FiniteAutomatonEvaluator(REParser().create_automaton("a"), mode="dfa")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Test the instrumentation hooks."""
+import unittest
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.dfa import DeterministicFiniteAutomaton
+from automata.metrics import Histogram, Metrics, get_hooks, use_hooks
+from automata.re_parser import REParser
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the metrics of evaluators and algorithms."""
+
+    def test_disabled(self):
+        """Without hooks nothing is instrumented."""
+        self.assertIsNone(get_hooks())
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b*"))
+        self.assertIsNone(evaluator.hooks)
+        self.assertTrue(evaluator.accepts("abb"))
+
+    def test_opt_out(self):
+        """An evaluator created with ``hooks=None`` ignores the global hooks."""
+        metrics = Metrics()
+        with use_hooks(metrics):
+            automaton = REParser().create_automaton("a.b*")
+            evaluator = FiniteAutomatonEvaluator(automaton, hooks=None)
+            instrumented = FiniteAutomatonEvaluator(automaton)
+        self.assertIsNone(evaluator.hooks)
+        self.assertIs(instrumented.hooks, metrics)
+
+        self.assertTrue(evaluator.accepts("abb"))
+        self.assertNotIn("evaluator.symbols", metrics.counters)
+
+    def test_evaluator(self):
+        """Evaluators report symbols, set sizes, cache use and latency."""
+        automaton = REParser().create_automaton("(a+b)*.a")
+        for mode in ("nfa", "lazy", "bitset"):
+            with self.subTest(mode=mode):
+                metrics = Metrics()
+                evaluator = FiniteAutomatonEvaluator(automaton, mode=mode, hooks=metrics)
+                plain = FiniteAutomatonEvaluator(automaton, mode=mode)
+
+                for string in ("", "ab", "aba", "bbba"):
+                    self.assertEqual(evaluator.accepts(string), plain.accepts(string))
+                evaluator.process_string("ab")
+                evaluator.process_symbol("a")
+                self.assertEqual(evaluator.current_states, plain.compiled.decode(
+                    plain.compiled.run(plain.compiled.initial, "aba"),
+                ))
+
+                self.assertEqual(metrics.counters["evaluator.symbols"], 12)
+                self.assertEqual(metrics.histograms["evaluator.active_states"].count, 12)
+                self.assertEqual(metrics.histograms["evaluator.accepts.seconds"].count, 4)
+                self.assertEqual(metrics.histograms["evaluator.process_symbol.seconds"].count, 1)
+                self.assertEqual(metrics.events[-1][0], "evaluator.process_symbol")
+                if mode == "nfa":
+                    self.assertGreater(metrics.closure_cache_hit_rate, 0)
+
+    def test_algorithms(self):
+        """The parser and the DFA algorithms report through the global hooks."""
+        metrics = Metrics()
+        with use_hooks(metrics):
+            automaton = REParser().create_automaton("(a+b)*.a")
+            dfa = DeterministicFiniteAutomaton.to_deterministic(automaton)
+            DeterministicFiniteAutomaton.to_minimized(dfa)
+        self.assertIsNone(get_hooks())
+
+        self.assertEqual(metrics.histograms["re_parser.symbol.states"].count, 3)
+        self.assertEqual(metrics.histograms["re_parser.concat.states"].max, len(automaton.states))
+        self.assertEqual(metrics.counters["dfa.to_deterministic.states"], len(dfa.states))
+        self.assertEqual(metrics.histograms["dfa.minimize.splitters"].count, 1)
+        self.assertEqual(metrics.events[-1][0], "dfa.to_minimized")
+
+        # Un automata ya determinista tambien se reporta
+        with use_hooks(metrics):
+            DeterministicFiniteAutomaton.to_deterministic(dfa)
+        self.assertEqual(metrics.counters["dfa.to_deterministic.states"], 2 * len(dfa.states))
+        self.assertEqual(metrics.events[-1][0], "dfa.to_deterministic")
+
+    def test_histogram(self):
+        """Observations fall in power-of-two buckets."""
+        histogram = Histogram()
+        for value in (0, 1, 2, 3, 4, 5, 0.3):
+            histogram.add(value)
+        self.assertEqual(histogram.buckets, {0: 1, 1: 1, 2: 1, 4: 2, 8: 1, 0.5: 1})
+        self.assertEqual((histogram.min, histogram.max, histogram.count), (0, 5, 7))
+        self.assertAlmostEqual(histogram.mean, 15.3 / 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
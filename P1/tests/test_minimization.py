@@ -1,8 +1,16 @@
 """Test evaluation of automatas."""
+import random
 import unittest
 from abc import ABC
-
-from automata.dfa import DeterministicFiniteAutomaton
+from array import array
+from unittest import mock
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.compiled import CompiledAutomaton
+from automata.dfa import (
+    DeterministicFiniteAutomaton, choose_minimization, minimize_table, subset_construction,
+)
+from automata.re_parser import REParser
 from automata.utils import AutomataFormat, deterministic_automata_isomorphism
 
 
@@ -186,6 +194,144 @@ class TestMinimize(ABC, unittest.TestCase):
 
         self._check_minimize(automaton, simplified)
 
+    def test_partial_automaton(self):
+        """Missing transitions go to an implicit sink."""
+        automaton_str = """
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+            q2 final
+
+            ini q0 -a-> q1
+            q1 -a-> q2
+            q2 -a-> q1
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+
+        simplified_str = """
+        Automaton:
+            Symbols: ab
+
+            q0
+            q1 final
+
+            ini q0 -a-> q1
+            q1 -a-> q1
+        """
+
+        simplified = AutomataFormat.read(simplified_str)
+
+        self._check_minimize(automaton, simplified)
+
+    def test_nondeterministic(self):
+        """Non deterministic automata are rejected."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: a
+
+            q0
+            q1 final
+
+            ini q0 -a-> q0
+            q0 -a-> q1
+        """)
+
+        with self.assertRaises(ValueError):
+            DeterministicFiniteAutomaton.to_minimized(automaton)
+
+
+class TestBrzozowski(unittest.TestCase):
+    """Tests for Brzozowski minimization and the choice of algorithm."""
+
+    patterns = ["a.b*+c", "(a.b+b.a)*.c", "(a+b)*.a.(a+b).(a+b)", "λ+a", "a*.a*", ""]
+
+    def test_same_minimal_automaton(self):
+        """Both algorithms give isomorphic minimal automata."""
+        for pattern in self.patterns:
+            with self.subTest(pattern=pattern):
+                automaton = REParser().create_automaton(pattern)
+                brzozowski = DeterministicFiniteAutomaton.to_minimized_brzozowski(automaton)
+                hopcroft = DeterministicFiniteAutomaton.minimize(
+                    REParser().create_automaton(pattern), method="hopcroft",
+                )
+                self.assertIsNotNone(deterministic_automata_isomorphism(brzozowski, hopcroft))
+
+                evaluator = FiniteAutomatonEvaluator(automaton)
+                minimized = FiniteAutomatonEvaluator(brzozowski)
+                for string in ("", "a", "ab", "abb", "c", "abc", "aab", "baab", "aaa"):
+                    if set(string) <= set(evaluator.compiled.symbols):
+                        self.assertEqual(minimized.accepts(string), evaluator.accepts(string))
+
+    def test_choose_minimization(self):
+        """Brzozowski is chosen when the forward subset construction blows up."""
+        blowup = REParser().create_automaton("(a+b)*.a" + ".(a+b)" * 10)
+        self.assertEqual(choose_minimization(CompiledAutomaton(blowup))[0], "brzozowski")
+        self.assertEqual(len(blowup.minimize().states), 2 ** 11)
+
+        small = REParser().create_automaton("a.b*+c")
+        method, (subsets, table) = choose_minimization(CompiledAutomaton(small))
+        self.assertEqual(method, "hopcroft")
+        self.assertEqual(len(table), len(subsets) * CompiledAutomaton(small).n_classes)
+        dfa = DeterministicFiniteAutomaton.to_deterministic(small)
+        self.assertEqual(choose_minimization(CompiledAutomaton(dfa)), ("hopcroft", None))
+
+        with self.assertRaises(ValueError):
+            small.minimize(method="moore")
+
+    def test_probe_reused(self):
+        """The DFA built to choose the algorithm is not determinized again."""
+        for pattern, n_determinizations in (("a.b*+c", 1), ("(a+b)*.a" + ".(a+b)" * 10, 3)):
+            automaton = REParser().create_automaton(pattern)
+            with mock.patch("automata.dfa.subset_construction", wraps=subset_construction) as build:
+                minimized = automaton.minimize()
+            with self.subTest(pattern=pattern):
+                # Hopcroft: la sonda; Brzozowski: las dos sondas y la segunda inversion
+                self.assertEqual(build.call_count, n_determinizations)
+                self.assertIsNotNone(deterministic_automata_isomorphism(
+                    minimized, automaton.minimize(method="hopcroft"),
+                ))
+
+
+class TestMinimizeTable(unittest.TestCase):
+    """Tests for the minimization of flat transition tables."""
+
+    @staticmethod
+    def _moore(table, n_classes, labels):
+        """Reference minimization: refine until the partition is stable."""
+        block_ids = list(labels)
+        while True:
+            signatures = [
+                (block_ids[s], tuple(block_ids[t] for t in table[s * n_classes:(s + 1) * n_classes]))
+                for s in range(len(labels))
+            ]
+            if len(set(signatures)) == len(set(block_ids)):
+                return block_ids
+            block_ids = signatures
+
+    def test_random_tables(self):
+        """The blocks are the Myhill-Nerode classes of every state."""
+        rng = random.Random(0)
+        for _ in range(50):
+            n_states = rng.randint(1, 40)
+            n_classes = rng.randint(1, 3)
+            table = array("i", [rng.randrange(n_states) for _ in range(n_states * n_classes)])
+            labels = [rng.random() < 0.3 for _ in range(n_states)]
+
+            block_ids, minimized = minimize_table(table, n_classes, labels)
+            expected = self._moore(table, n_classes, labels)
+
+            self.assertEqual(block_ids[0], 0)
+            for s in range(n_states):
+                for t in range(n_states):
+                    self.assertEqual(block_ids[s] == block_ids[t], expected[s] == expected[t])
+                for c in range(n_classes):
+                    self.assertEqual(
+                        minimized[block_ids[s] * n_classes + c],
+                        block_ids[table[s * n_classes + c]],
+                    )
 
 
 if __name__ == '__main__':
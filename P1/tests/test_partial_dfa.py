@@ -0,0 +1,120 @@
+"""Test minimization of partial DFAs."""
+import random
+import unittest
+from array import array
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.dfa import DeterministicFiniteAutomaton, minimize_table
+from automata.partial_dfa import minimize_partial
+from automata.re_parser import REParser
+from automata.utils import AutomataFormat
+
+
+class TestMinimizePartial(unittest.TestCase):
+    """Tests for the Valmari-Lehtinen minimization."""
+
+    def _reference(self, n_states, n_classes, table, finals):
+        """Blocks of the reachable live states, with Hopcroft on the completed table."""
+        sink = n_states
+        complete = array("i", [sink if t == -1 else t for t in table] + [sink] * n_classes)
+        labels = [s in finals for s in range(n_states)] + [False]
+        block_ids, _ = minimize_table(complete, n_classes, labels)
+
+        reachable = {0}
+        pending = [0]
+        while pending:
+            s = pending.pop()
+            for t in table[s * n_classes:(s + 1) * n_classes]:
+                if t != -1 and t not in reachable:
+                    reachable.add(t)
+                    pending.append(t)
+        dead = block_ids[sink]
+        return {s: block_ids[s] for s in reachable if block_ids[s] != dead}
+
+    def test_random_partial_dfas(self):
+        """The blocks are the classes of the reachable live states."""
+        rng = random.Random(1)
+        for _ in range(100):
+            n_states = rng.randint(1, 30)
+            n_classes = rng.randint(1, 4)
+            table = [
+                rng.randrange(n_states) if rng.random() < 0.6 else -1
+                for _ in range(n_states * n_classes)
+            ]
+            finals = {s for s in range(n_states) if rng.random() < 0.3}
+            transitions = [
+                (pair // n_classes, pair % n_classes, t)
+                for pair, t in enumerate(table) if t != -1
+            ]
+
+            block_ids, minimized = minimize_partial(n_states, transitions, finals)
+            expected = self._reference(n_states, n_classes, table, finals)
+
+            kept = {s for s in range(n_states) if block_ids[s] != -1}
+            self.assertEqual(kept, set(expected))
+            for s in kept:
+                for t in kept:
+                    self.assertEqual(block_ids[s] == block_ids[t], expected[s] == expected[t])
+            if kept:
+                self.assertEqual(block_ids[0], 0)
+            for (block, label, next_block) in minimized:
+                self.assertNotEqual(next_block, -1)
+
+    def test_partial_from_deterministic(self):
+        """A complete DFA loses its sinks when a partial DFA is requested."""
+        complete = REParser().create_automaton("(a.b+c)*.d").to_deterministic()
+        self.assertIs(complete.to_deterministic(), complete)
+
+        partial = complete.to_deterministic(complete=False)
+        self.assertNotIn("empty", {state.name for state in partial.states})
+        self.assertEqual(len(partial.states), len(complete.states) - 1)
+        evaluators = [FiniteAutomatonEvaluator(a) for a in (complete, partial)]
+        for string in ("", "d", "abd", "cabcd", "ab", "ad", "dd", "abcabd"):
+            with self.subTest(string=string):
+                self.assertEqual(len({evaluator.accepts(string) for evaluator in evaluators}), 1)
+
+        # Lenguaje vacio: solo queda el estado inicial, sin transiciones
+        empty = REParser().create_automaton("").to_deterministic()
+        partial = empty.to_deterministic(complete=False)
+        self.assertEqual(len(partial.states), 1)
+        self.assertEqual(partial.get_all_transitions(), [])
+
+    def test_partial_to_deterministic(self):
+        """Partial DFAs have no sink and accept the same language."""
+        automaton = REParser().create_automaton("(a.b+c)*.d")
+        complete = automaton.to_deterministic()
+        partial = REParser().create_automaton("(a.b+c)*.d").to_deterministic(complete=False)
+
+        self.assertIn("empty", {state.name for state in complete.states})
+        self.assertNotIn("empty", {state.name for state in partial.states})
+        self.assertLess(len(partial.get_all_transitions()), len(complete.get_all_transitions()))
+
+        minimized = DeterministicFiniteAutomaton.to_minimized_partial(partial)
+        self.assertEqual(len(minimized.states), 3)
+        self.assertEqual(len(automaton.minimize(method="valmari").states), 3)
+
+        evaluators = [FiniteAutomatonEvaluator(a) for a in (complete, partial, minimized)]
+        for string in ("", "d", "abd", "cabcd", "ab", "ad", "dd", "abcabd"):
+            with self.subTest(string=string):
+                results = {evaluator.accepts(string) for evaluator in evaluators}
+                self.assertEqual(len(results), 1)
+
+    def test_empty_language(self):
+        """Automata without reachable final states keep only their initial state."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+            Symbols: a
+
+            q0
+            q1 final
+
+            ini q0 -a-> q0
+        """)
+        minimized = DeterministicFiniteAutomaton.to_minimized_partial(automaton)
+
+        self.assertEqual(len(minimized.states), 1)
+        self.assertFalse(FiniteAutomatonEvaluator(minimized).accepts("aaa"))
+
+
+if __name__ == '__main__':
+    unittest.main()
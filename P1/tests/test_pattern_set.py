@@ -0,0 +1,43 @@
+"""Test matching of many regular expressions at once."""
+import itertools
+import unittest
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.pattern_set import PatternSet
+from automata.re_parser import REParser
+
+
+class TestPatternSet(unittest.TestCase):
+    """Tests for PatternSet."""
+
+    patterns = ["a*.b", "(a+b)*.a", "a.b.c", "c*", "(a+b+c)*.c.c"]
+
+    def test_match(self):
+        """Each string reports exactly the patterns that accept it."""
+        pattern_set = PatternSet(self.patterns)
+        evaluators = [
+            FiniteAutomatonEvaluator(REParser().create_automaton(pattern))
+            for pattern in self.patterns
+        ]
+
+        for length in range(6):
+            for string in map("".join, itertools.product("abc", repeat=length)):
+                expected = set()
+                for p, evaluator in enumerate(evaluators):
+                    if set(string) <= set(evaluator.automaton.symbols) and evaluator.accepts(string):
+                        expected.add(p)
+                with self.subTest(string=string):
+                    self.assertEqual(pattern_set.match(string), expected)
+
+    def test_minimal(self):
+        """Equivalent patterns collapse into the same states."""
+        pattern_set = PatternSet(["a.a*", "a*.a"])
+
+        self.assertEqual(len(pattern_set.labels), 2)
+        self.assertEqual(pattern_set.match("aaa"), {0, 1})
+        self.assertEqual(pattern_set.matching_patterns("a"), ["a.a*", "a*.a"])
+        self.assertEqual(pattern_set.match("ab"), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
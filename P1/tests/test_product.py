@@ -0,0 +1,98 @@
+"""Test product constructions of automata."""
+import random
+import unittest
+
+from automata import product
+from automata.metrics import Metrics, use_hooks
+from automata.re_parser import REParser
+from automata.utils import equivalent, is_deterministic
+from regex_helpers import accepts, random_regex, strings
+
+
+class TestProduct(unittest.TestCase):
+    """Tests for the lazy product constructions."""
+
+    def _check_language(self, automaton, expected, alphabet="ab", max_length=5):
+        """Test that an automaton accepts the strings selected by ``expected``."""
+        self.assertTrue(is_deterministic(automaton))
+        for string in strings(alphabet, max_length):
+            with self.subTest(string=string):
+                self.assertEqual(accepts(automaton, string), expected(string))
+
+    def test_operations(self):
+        """Test the operations as methods of the automata."""
+        automaton1 = REParser().create_automaton("(a+b)*.a.(a+b)*")
+        automaton2 = REParser().create_automaton("(a+b)*.b.(a+b)*")
+
+        self._check_language(
+            automaton1.intersect(automaton2),
+            lambda string: "a" in string and "b" in string,
+        )
+        self._check_language(
+            automaton1.difference(automaton2),
+            lambda string: "a" in string and "b" not in string,
+        )
+        self._check_language(
+            automaton1.symmetric_difference(automaton2),
+            lambda string: ("a" in string) != ("b" in string),
+        )
+        self._check_language(automaton1.complement(), lambda string: "a" not in string)
+
+    def test_complement_symbols(self):
+        """Test the complement over a larger alphabet."""
+        automaton = REParser().create_automaton("a*").complement(symbols="b")
+        self.assertEqual(set(automaton.symbols), {"a", "b"})
+        self._check_language(automaton, lambda string: "b" in string)
+
+    def test_dead_pairs(self):
+        """Test that the pairs that can no longer accept are one sink."""
+        automaton1 = REParser().create_automaton("a.(a+b)*")
+        automaton2 = REParser().create_automaton("b.(a+b)*")
+
+        metrics = Metrics()
+        with use_hooks(metrics):
+            intersection = automaton1.intersect(automaton2)
+        # Tras el primer simbolo uno de los dos ya no puede aceptar
+        self.assertEqual([state.name for state in intersection.states], ["q0", "empty"])
+        self.assertEqual(metrics.histograms["product.intersect.states"].max, 2)
+
+    def test_shortest_string(self):
+        """Test emptiness queries."""
+        automaton1 = REParser().create_automaton("(a+b)*.a.b.a")
+        automaton2 = REParser().create_automaton("(a.b)*")
+
+        self.assertEqual(product.shortest_string(automaton1, automaton2, "difference"), "aba")
+        self.assertEqual(product.shortest_string(automaton2, automaton1, "difference"), "")
+        self.assertTrue(product.is_empty(automaton1, automaton2, "intersect"))
+        self.assertFalse(product.is_empty(automaton1, automaton1, "complement"))
+
+        with self.assertRaises(ValueError):
+            product.shortest_string(automaton1, automaton2, "union")
+
+    def test_random(self):
+        """Test random regexes against their languages."""
+        rng = random.Random(2)
+        for _ in range(40):
+            pattern1 = random_regex(rng, 3)
+            pattern2 = random_regex(rng, 3)
+            automaton1 = REParser().create_automaton(pattern1)
+            automaton2 = REParser().create_automaton(pattern2)
+            reference1 = REParser().create_automaton(pattern1)
+            reference2 = REParser().create_automaton(pattern2)
+
+            with self.subTest(pattern1=pattern1, pattern2=pattern2):
+                intersection = product.intersect(automaton1, automaton2)
+                self._check_language(
+                    intersection,
+                    lambda string: accepts(reference1, string) and accepts(reference2, string),
+                    max_length=4,
+                )
+                # L1 - L2 y L1 ∩ L2 forman L1
+                difference = product.difference(automaton1, automaton2)
+                self.assertTrue(equivalent(
+                    product.symmetric_difference(intersection, difference), automaton1,
+                ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Test unanchored search of automata inside texts."""
+import itertools
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+from automata.automaton_evaluator import FiniteAutomatonEvaluator
+from automata.dfa import subset_construction
+from automata.re_parser import REParser
+from regex_helpers import random_regex
+
+
+class CountingIds(dict):
+    """Symbol ids that count how many times they are looked up."""
+
+    lookups = 0
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        return super().get(key, default)
+
+
+def _naive_finditer(evaluator, text):
+    """Leftmost-longest matches trying every substring."""
+    position = 0
+    while position <= len(text):
+        ends = [
+            end for end in range(position, len(text) + 1)
+            if all(c in evaluator.automaton.symbols for c in text[position:end])
+            and evaluator.accepts(text[position:end])
+        ]
+        if ends:
+            yield (position, ends[-1])
+            position = ends[-1] if ends[-1] > position else position + 1
+        else:
+            position += 1
+
+
+class TestSearch(unittest.TestCase):
+    """Tests for search, finditer and count_matches."""
+
+    def _check_search(self, regex, texts):
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton(regex))
+        for text in texts:
+            with self.subTest(regex=regex, text=text):
+                expected = list(_naive_finditer(evaluator, text))
+                self.assertEqual(list(evaluator.finditer(text)), expected)
+                self.assertEqual(evaluator.count_matches(text), len(expected))
+                self.assertEqual(evaluator.search(text), expected[0] if expected else None)
+
+    def test_search(self):
+        """Matches are the leftmost-longest ones."""
+        self._check_search("a.b*", ["", "xxabbbcabaab", "bbbb", "a"])
+        self._check_search("a.b.a", ["ababa", "abaaba", "cabac"])
+
+    def test_empty_matches(self):
+        """Languages with the empty string match at every position."""
+        self._check_search("b*", ["abba", "", "c"])
+
+    def test_exhaustive(self):
+        """Compare with the naive search on every short text."""
+        texts = map("".join, itertools.product("abc", repeat=5))
+        self._check_search("(a+b)*.a.b", list(texts))
+
+    def test_overlapping_starts(self):
+        """Starts whose threads meet keep their own longest matches."""
+        self._check_search("(a+λ).(b+λ).a*", ["cccbabcabccbaaa", "bab", "abab"])
+        self._check_search("a+a*.b", ["aaaa", "aaab", "aabaab"])
+
+    def test_linear(self):
+        """Each symbol is read a bounded number of times, even with long partial matches."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a+a*.b"))
+        searcher = evaluator.searcher
+        text = "a" * 2000
+        symbol_ids = CountingIds(searcher.symbol_ids)
+        matches = list(searcher.finditer(text, symbol_ids=symbol_ids))
+
+        self.assertEqual(matches, [(i, i + 1) for i in range(2000)])
+        # El prefiltro y una pasada hacia delante
+        self.assertLessEqual(symbol_ids.lookups, 2 * len(text))
+
+    def test_early_exit(self):
+        """The first match is found without reading the rest of the text."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b"))
+        searcher = evaluator.searcher
+        symbol_ids = CountingIds(searcher.symbol_ids)
+
+        self.assertEqual(next(searcher.finditer("cab" + "b" * 10000, symbol_ids=symbol_ids)), (1, 3))
+        self.assertLess(symbol_ids.lookups, 20)
+
+    def test_bounded_memory(self):
+        """Decided starts are forgotten, so memory does not grow with the text."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b*"))
+        text = "abbbbc" * 6000
+
+        tracemalloc.start()
+        try:
+            self.assertEqual(evaluator.count_matches(text), 6000)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 100000)
+
+    def test_random(self):
+        """Compare with the naive search on random regexes."""
+        rng = random.Random(3)
+        for _ in range(60):
+            texts = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 10))) for _ in range(5)]
+            self._check_search(random_regex(rng, 4), texts)
+
+    def test_no_matches(self):
+        """The empty language has no matches."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton(""))
+
+        self.assertIsNone(evaluator.search("abc"))
+        self.assertEqual(evaluator.count_matches("abc"), 0)
+
+
+class TestSearchFile(unittest.TestCase):
+    """Tests for matching over memory-mapped files."""
+
+    def _write_file(self, contents):
+        f = tempfile.NamedTemporaryFile(delete=False)
+        f.write(contents)
+        f.close()
+        self.addCleanup(os.remove, f.name)
+        return f.name
+
+    def test_accepts_file(self):
+        """Files are accepted byte by byte, without decoding them."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("(a.b)*"))
+
+        self.assertTrue(evaluator.accepts_file(self._write_file(b"ab" * 1000)))
+        self.assertFalse(evaluator.accepts_file(self._write_file(b"ab" * 1000 + b"a")))
+        self.assertTrue(evaluator.accepts_file(self._write_file(b"")))
+        with self.assertRaises(ValueError):
+            evaluator.accepts_file(self._write_file(b"abc"))
+
+    def test_accepts_file_decided(self):
+        """Once the acceptance is decided the rest is only checked against the alphabet."""
+        for mode in ("nfa", "lazy"):
+            evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.(a+b)*"), mode=mode)
+            with self.subTest(mode=mode):
+                self.assertTrue(evaluator.accepts_file(self._write_file(b"a" + b"ba" * 1000)))
+                self.assertFalse(evaluator.accepts_file(self._write_file(b"b" + b"ab" * 1000)))
+                with self.assertRaises(ValueError):
+                    evaluator.accepts_file(self._write_file(b"a" + b"ab" * 1000 + b"c"))
+                with self.assertRaises(ValueError):
+                    evaluator.accepts_file(self._write_file(b"b" + b"ab" * 1000 + b"c"))
+
+    def test_accepts_file_bounded_dfa(self):
+        """The lazy mode and the DFA state bound are honoured."""
+        # El AFD completo tiene 2^9 estados
+        regex = "(a+b)*.a" + ".(a+b)" * 8
+        rng = random.Random(4)
+        contents = [bytes(rng.choice(b"ab") for _ in range(rng.randint(0, 200))) for _ in range(20)]
+
+        for mode, max_dfa_states in (("lazy", 64), ("nfa", 16)):
+            evaluator = FiniteAutomatonEvaluator(
+                REParser().create_automaton(regex), mode=mode, max_dfa_states=max_dfa_states,
+            )
+            with mock.patch(
+                "automata.automaton_evaluator.subset_construction", wraps=subset_construction,
+            ) as build:
+                for content in contents:
+                    with self.subTest(mode=mode, content=content):
+                        self.assertEqual(
+                            evaluator.accepts_file(self._write_file(content)),
+                            evaluator.accepts(content.decode("latin-1")),
+                        )
+            # El modo perezoso no determiniza; el otro abandona al pasar del limite
+            if mode == "lazy":
+                build.assert_not_called()
+            else:
+                self.assertEqual(build.call_args.kwargs["max_states"], max_dfa_states)
+                self.assertFalse(evaluator._dfas)
+
+    def test_search_file_memory(self):
+        """Searching a file does not allocate memory proportional to it."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b*"))
+        path = self._write_file(b"xab" + b"c" * (1 << 20))
+
+        tracemalloc.start()
+        try:
+            self.assertEqual(evaluator.search_file(path), (1, 3))
+            self.assertEqual(list(evaluator.finditer_file(path)), [(1, 3)])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1 << 18)
+
+    def test_search_file(self):
+        """Matches inside files are given as byte offsets."""
+        evaluator = FiniteAutomatonEvaluator(REParser().create_automaton("a.b*"))
+        path = self._write_file(b"xxabbb\ncab\xffaab")
+
+        self.assertEqual(evaluator.search_file(path), (2, 6))
+        self.assertEqual(list(evaluator.finditer_file(path)), list(evaluator.finditer("xxabbb\ncab\xffaab")))
+        self.assertIsNone(evaluator.search_file(self._write_file(b"")))
+
+
+if __name__ == '__main__':
+    unittest.main()
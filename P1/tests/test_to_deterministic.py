@@ -2,8 +2,9 @@
 import unittest
 from abc import ABC
 
-from automata.automaton import FiniteAutomaton
-from automata.utils import AutomataFormat, deterministic_automata_isomorphism
+from automata.automaton import DerivedState, FiniteAutomaton, State
+from automata.dfa import order_states
+from automata.utils import AutomataFormat, deterministic_automata_isomorphism, write_dot
 
 
 class TestTransform(ABC, unittest.TestCase):
@@ -270,7 +271,96 @@ class TestTransform(ABC, unittest.TestCase):
         expected = AutomataFormat.read(expected_str)
 
         self._check_transform(automaton, expected)
-    
-    
+
+
+
+class TestDerivedNames(unittest.TestCase):
+    """Test that derived states are only named on demand."""
+
+    automaton_str = """
+    Automaton:
+    Symbols: ab
+
+    q0
+    q1
+    q2 final
+
+    ini q0 -a-> q0
+    q0 -a-> q1
+    q0 -b-> q0
+    q1 -b-> q2
+    """
+
+    def test_deterministic_names(self):
+        """Test that subsets keep their provenance and get their name lazily."""
+        automaton = AutomataFormat.read(self.automaton_str)
+        transformed = automaton.to_deterministic()
+
+        self.assertTrue(all(isinstance(state, DerivedState) for state in transformed.states))
+        for state in transformed.states:
+            self.assertIsNone(state._name)
+        for state in transformed.states:
+            if state.provenance:
+                self.assertEqual(state.name, order_states(state.provenance))
+
+        names = {state.name for state in transformed.states}
+        self.assertEqual(names, {"q0", "q0q1", "q0q2", "empty"})
+        self.assertIn("q0q2", write_dot(transformed))
+
+    def test_repeated_names(self):
+        """Test that subsets whose names would collide are named by id."""
+        automaton = AutomataFormat.read("""
+        Automaton:
+        Symbols: ab
+
+        A
+        B
+        C final
+
+        ini A -a-> A
+        A -a-> B
+        A -b-> A
+        B -b-> C
+        """)
+        transformed = automaton.to_deterministic()
+
+        names = [state.name for state in transformed.states]
+        self.assertEqual(len(set(names)), len(names))
+        self.assertIn("empty", names)
+        dot = write_dot(transformed)
+        for name in names:
+            self.assertIn(f"{name}[shape=", dot)
+
+    def test_minimized_names(self):
+        """Test that blocks are named as the merged states."""
+        automaton = AutomataFormat.read(self.automaton_str)
+        minimized = automaton.to_deterministic().minimize(method="hopcroft")
+
+        for state in minimized.states:
+            self.assertIsNone(state._name)
+        self.assertEqual(
+            {state.name for state in minimized.states},
+            {"q0", "q0q1", "q0q2"},
+        )
+
+    def test_equality(self):
+        """Test that derived states compare by provenance."""
+        q0, q1 = State("q0"), State("q1")
+        state = DerivedState(0, [q0, q1])
+        same = DerivedState(5, [q1, q0])
+
+        self.assertEqual(state, same)
+        self.assertEqual(hash(state), hash(same))
+        self.assertNotEqual(state, DerivedState(0, [q0]))
+        self.assertNotEqual(state, DerivedState(0, [q0, q1], is_final=True))
+        self.assertEqual(same.name, "q5")
+
+        state.name = "A"
+        self.assertEqual(state.name, "A")
+        self.assertNotEqual(state, State("A"))
+        self.assertNotEqual(State("A"), state)
+        self.assertEqual(len({state, same, State("A")}), 2)
+
+
 if __name__ == '__main__':
     unittest.main()